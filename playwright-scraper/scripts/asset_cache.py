@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Asset Cache - 実行をまたいで静的リソースを再利用するディスクキャッシュ
+
+`new_context()` は毎回空のキャッシュで始まるため、定期的な再クロールでも同じ JS・CSS・画像を
+毎回ダウンロードする（さらに `context.route` を使うとブラウザの HTTP キャッシュ自体が無効になる）。
+`context.route` のハンドラとして静的リソースをローカルストアから応答し、
+期限切れのものは ETag / Last-Modified で再検証（304 なら本文を転送しない）する。
+キャッシュは実行・コンテキストをまたいで共有されるため、`Cache-Control: private` のレスポンスと
+Cookie / Authorization 付きリクエストへのレスポンス（`public` を除く）は保存しない。
+
+保存レイアウト:
+    <cache_dir>/
+    ├── index.sqlite             # URL → ヘッダー・検証子・有効期限・最終アクセス
+    └── objects/ab/abcdef...     # 本文（URL の SHA-256 をファイル名にする）
+
+使用方法:
+    cache = AssetCache("./.asset_cache", max_bytes=512 * 1024 * 1024)
+    scraper = PlaywrightScraper(asset_cache=cache)
+    ...
+    logger.info(cache.stats)
+
+依存:
+    - playwright
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    from playwright.sync_api import APIResponse, BrowserContext, Request, Route
+    from playwright.sync_api import Error as PlaywrightError
+except ImportError:
+    print("Error: playwright not installed. Run: pip install playwright")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+# キャッシュ対象のリソース種別（ドキュメント・XHR は内容が変わりやすいため対象外）
+DEFAULT_CACHED_RESOURCE_TYPES = frozenset({"script", "stylesheet", "image", "font"})
+
+# 保存時に除外するヘッダー（本文は展開済みで保存するため、圧縮・長さの情報は応答時に合わなくなる）
+_DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"})
+
+# Last-Modified からの推定有効期限の上限（RFC 9111 のヒューリスティック: 経過時間の 10%）
+_MAX_HEURISTIC_TTL_S = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+@dataclass
+class CacheStats:
+    """キャッシュの統計"""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stored: int = 0
+    evicted: int = 0
+    bypassed: int = 0
+    bytes_served: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率（再検証で 304 になったものを含む）"""
+        lookups = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / lookups if lookups else 0.0
+
+
+def _parse_cache_control(value: str) -> dict[str, str]:
+    """Cache-Control ヘッダーをディレクティブ辞書に分解（内部用）"""
+    directives: dict[str, str] = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"')
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    """HTTP 日付を UNIX 時刻に変換（不正な値は None）（内部用）"""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: dict[str, str], now: float, default_ttl_s: float = 0.0) -> float | None:
+    """
+    レスポンスヘッダーから有効期間（秒）を求める。
+
+    Args:
+        headers: レスポンスヘッダー（小文字キー）
+        now: 現在時刻（UNIX 時刻）
+        default_ttl_s: 期限を示すヘッダーがない場合の有効期間
+
+    Returns:
+        有効期間（秒。0 は毎回再検証）。保存してはいけない場合は None
+    """
+    directives = _parse_cache_control(headers.get("cache-control", ""))
+    # Accept-Encoding 以外で変化する（Cookie 等）レスポンスは URL だけをキーにできないため保存しない
+    vary = {name.strip().lower() for name in headers.get("vary", "").split(",") if name.strip()}
+    # private は共有キャッシュに保存してはいけない（このキャッシュは実行・コンテキストをまたいで共有される）
+    if "no-store" in directives or "private" in directives or vary - {"accept-encoding"}:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return max(float(directives["max-age"]), 0.0)
+        except ValueError:
+            return 0.0
+
+    date = _http_date(headers.get("date")) or now
+    expires = _http_date(headers.get("expires"))
+    if expires is not None:
+        return max(expires - date, 0.0)
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        return min(max(date - last_modified, 0.0) * 0.1, _MAX_HEURISTIC_TTL_S)
+    return default_ttl_s
+
+
+def _is_credentialed(request: Request) -> bool:
+    """リクエストが Cookie / Authorization 付きか（`route.fetch()` はコンテキストの Cookie を送る）（内部用）"""
+    if "authorization" in request.headers:
+        return True
+    try:
+        return bool(request.frame.page.context.cookies(request.url))
+    except PlaywrightError:
+        return True  # Service Worker のリクエスト等でコンテキストを辿れない場合は保存しない
+
+
+class AssetCache:
+    """`context.route` で静的リソースをディスクから応答する LRU キャッシュ"""
+
+    def __init__(
+        self,
+        cache_dir: str | Path = "./.asset_cache",
+        max_bytes: int = 512 * 1024 * 1024,
+        resource_types: frozenset[str] = DEFAULT_CACHED_RESOURCE_TYPES,
+        default_ttl_s: float = 0.0,
+    ) -> None:
+        """
+        初期化。
+
+        Args:
+            cache_dir: キャッシュディレクトリ（複数プロセスで共有可能）
+            max_bytes: 本文の合計サイズ上限（超えたら最終アクセスの古いものから削除）
+            resource_types: キャッシュ対象のリソース種別（`request.resource_type`）
+            default_ttl_s: 期限を示すヘッダーがないレスポンスの有効期間（0: 検証子があれば毎回再検証）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.resource_types = resource_types
+        self.default_ttl_s = default_ttl_s
+        self.stats = CacheStats()
+
+        # route ハンドラは Playwright のディスパッチスレッド（sync API では呼び出し元スレッド）で動く
+        self._db = sqlite3.connect(self.cache_dir / "index.sqlite", timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def attach(self, context: BrowserContext) -> None:
+        """コンテキストの全リクエストにキャッシュを適用"""
+        context.route("**/*", self.handle)
+
+    def close(self) -> None:
+        """インデックスを閉じる"""
+        self._db.close()
+        logger.info(f"Asset cache closed: {asdict(self.stats)}")
+
+    def handle(self, route: Route) -> None:
+        """
+        route ハンドラ。対象外のリクエストは後続のハンドラへ渡す。
+
+        - 有効期限内: ディスクから応答（ネットワークに出ない）
+        - 期限切れ: 検証子付きで再取得し、304 ならディスクから応答（本文が消えていれば検証子なしで再取得）
+        - 未保存: 取得して応答し、保存可能なら保存（Cookie / Authorization 付きのリクエストは `public` のみ）
+        """
+        request = route.request
+        if (
+            request.method != "GET"
+            or request.resource_type not in self.resource_types
+            or "range" in request.headers
+            or not request.url.startswith(("http://", "https://"))
+        ):
+            route.fallback()
+            return
+
+        try:
+            entry = self._lookup(request.url)
+            now = time.time()
+            # 本文が削除済み（LRU・他プロセス）のエントリは検証子を送らない（304 に返す本文がない）
+            if entry and not self._object_path(entry["key"]).exists():
+                entry = None
+            if entry and entry["expires_at"] > now:
+                self._fulfill_from_disk(route, entry, "hits")
+                return
+
+            headers = dict(request.headers)
+            validated = bool(entry and (entry["etag"] or entry["last_modified"]))
+            if entry and validated:
+                if entry["etag"]:
+                    headers["if-none-match"] = entry["etag"]
+                if entry["last_modified"]:
+                    headers["if-modified-since"] = entry["last_modified"]
+            response = route.fetch(headers=headers)
+
+            if response.status == 304 and entry and validated:
+                if self._object_path(entry["key"]).exists():
+                    lifetime = freshness_lifetime(response.headers, now, self.default_ttl_s) or 0.0
+                    self._touch(request.url, expires_at=now + lifetime)
+                    self._fulfill_from_disk(route, entry, "revalidated")
+                    return
+                # 再検証中に本文が削除された。空の 304 を返さず、検証子なしで取得し直す
+                response = route.fetch(headers=dict(request.headers))
+
+            self.stats.misses += 1
+            body = response.body()
+            self._store(request.url, response, body, now, _is_credentialed(request))
+            route.fulfill(response=response, body=body)
+        except PlaywrightError as e:
+            # ページ遷移でリクエストが取り消された場合など。キャッシュを使わず通常の処理に任せる
+            logger.debug(f"Asset cache bypassed for {request.url}: {e}")
+            self.stats.bypassed += 1
+            try:
+                route.fallback()
+            except PlaywrightError:
+                pass
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        keys = [row[0] for row in self._db.execute("SELECT key FROM entries")]
+        with self._db:
+            self._db.execute("DELETE FROM entries")
+        for key in keys:
+            self._object_path(key).unlink(missing_ok=True)
+
+    def total_bytes(self) -> int:
+        """保存済み本文の合計サイズ"""
+        return int(self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    def _lookup(self, url: str) -> dict[str, Any] | None:
+        """URL のエントリを取得（内部用）"""
+        cursor = self._db.execute(
+            "SELECT key, status, headers, etag, last_modified, expires_at FROM entries WHERE url = ?", (url,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        key, status, headers, etag, last_modified, expires_at = row
+        return {
+            "key": key,
+            "status": status,
+            "headers": json.loads(headers),
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": expires_at,
+        }
+
+    def _fulfill_from_disk(self, route: Route, entry: dict[str, Any], outcome: str) -> None:
+        """保存済みの本文で応答（内部用）"""
+        path = self._object_path(entry["key"])
+        route.fulfill(status=entry["status"], headers=entry["headers"], path=path)
+        setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+        self.stats.bytes_served += path.stat().st_size
+        self._touch(route.request.url)
+
+    def _touch(self, url: str, expires_at: float | None = None) -> None:
+        """最終アクセス（と有効期限）を更新（内部用）"""
+        with self._db:
+            if expires_at is None:
+                self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            else:
+                self._db.execute(
+                    "UPDATE entries SET last_access = ?, expires_at = ? WHERE url = ?", (time.time(), expires_at, url)
+                )
+
+    def _store(self, url: str, response: APIResponse, body: bytes, now: float, credentialed: bool = False) -> None:
+        """
+        保存可能なレスポンスを保存し、上限を超えたら LRU で削除（内部用）。
+
+        credentialed（Cookie / Authorization 付きのリクエスト）のレスポンスは利用者ごとに異なり得るため、
+        `Cache-Control: public` の場合のみ保存する。
+        """
+        if response.status != 200 or len(body) > self.max_bytes:
+            return
+        if credentialed and "public" not in _parse_cache_control(response.headers.get("cache-control", "")):
+            return
+        lifetime = freshness_lifetime(response.headers, now, self.default_ttl_s)
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if lifetime is None or (lifetime == 0 and not etag and not last_modified):
+            return
+
+        key = hashlib.sha256(url.encode()).hexdigest()
+        path = self._object_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 一時ファイル経由で置換（他プロセスが読み込み中でも壊れた本文を返さない）
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        headers = {name: value for name, value in response.headers.items() if name not in _DROPPED_HEADERS}
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, key, status, headers, size, etag, last_modified, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, key, response.status, json.dumps(headers), len(body), etag, last_modified, now + lifetime, now),
+            )
+        self.stats.stored += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        """合計サイズが上限を超えた分を最終アクセスの古い順に削除（内部用）"""
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        victims: list[tuple[str, str]] = []
+        for url, key, size in self._db.execute("SELECT url, key, size FROM entries ORDER BY last_access"):
+            victims.append((url, key))
+            excess -= size
+            if excess <= 0:
+                break
+        with self._db:
+            self._db.executemany("DELETE FROM entries WHERE url = ?", [(url,) for url, _ in victims])
+        for _, key in victims:
+            self._object_path(key).unlink(missing_ok=True)
+        self.stats.evicted += len(victims)
+        logger.debug(f"Evicted {len(victims)} cached assets")
+
+    def _object_path(self, key: str) -> Path:
+        """本文の保存先（内部用）"""
+        return self.objects_dir / key[:2] / key
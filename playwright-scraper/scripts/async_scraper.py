@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Async Playwright Scraper
+
+`playwright.async_api` ベースの非同期スクレイパー。
+`PlaywrightScraper`（sync版）と同じ `login` / `download_file` / `get_text` / `get_attribute`
+を提供し、1つのブラウザプロセス内で複数ターゲットを並列処理する。
+
+使用方法:
+    python async_scraper.py https://example.com/a https://example.com/b --concurrency 5
+
+依存:
+    - playwright
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from collections.abc import Awaitable, Callable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+try:
+    from playwright.async_api import (
+        Browser,
+        BrowserContext,
+        Locator,
+        Page,
+        Playwright,
+        Request,
+        Response,
+        async_playwright,
+    )
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    print("Error: playwright not installed. Run: pip install playwright")
+    sys.exit(1)
+
+from basic_scraper import _move_to_reserved
+
+if TYPE_CHECKING:
+    from typing import Self
+
+    from rate_limiter import HostScheduler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# スケジューラーへ応答結果を返すリソース種別（サブリソースはホストの負荷判定に使わない）
+_SCHEDULED_RESOURCE_TYPES = frozenset({"document", "xhr", "fetch"})
+
+
+class AsyncPageScraper:
+    """1ページ分の非同期操作（Locator中心）"""
+
+    def __init__(self, page: Page, timeout_ms: int = 30000, download_dir: str | Path | None = None) -> None:
+        """
+        初期化。
+
+        Args:
+            page: 操作対象のページ
+            timeout_ms: タイムアウト時間（ミリ秒）
+            download_dir: ダウンロード保存先ディレクトリ
+        """
+        self.page = page
+        self.timeout_ms = timeout_ms
+        self.download_dir = Path(download_dir or "./downloads")
+        self.download_dir.mkdir(exist_ok=True, parents=True)
+
+    async def login(
+        self,
+        url: str,
+        email_locator: str | None = None,
+        password_locator: str | None = None,
+        login_button_locator: str | None = None,
+        email: str = "",
+        password: str = "",  # nosec B107:空文字列デフォルト値は実際のセキュリティリスクではない
+        success_locator: str | None = None,
+    ) -> bool:
+        """
+        ログイン処理（`PlaywrightScraper.login()` の非同期版）。
+
+        Args:
+            url: ログインページURL
+            email_locator: メールアドレス入力フィールドのCSSセレクタ（省略時: get_by_label("メールアドレス")使用）
+            password_locator: パスワード入力フィールドのCSSセレクタ（省略時: get_by_label("パスワード")使用）
+            login_button_locator: ログインボタンのCSSセレクタ（省略時: get_by_role("button", name="ログイン")使用）
+            email: ログインメールアドレス
+            password: ログインパスワード
+            success_locator: ログイン完了を検証するCSSセレクタ（省略可）
+
+        Returns:
+            ログイン成功時 True
+
+        Raises:
+            ValueError: タイムアウト
+        """
+        try:
+            logger.info(f"Navigating to {url}")
+            await self.page.goto(url)
+            await self.page.wait_for_load_state("domcontentloaded")
+
+            email_loc: Locator = (
+                self.page.locator(email_locator) if email_locator else self.page.get_by_label("メールアドレス")
+            )
+            await email_loc.fill(email)
+
+            password_loc: Locator = (
+                self.page.locator(password_locator) if password_locator else self.page.get_by_label("パスワード")
+            )
+            await password_loc.fill(password)
+
+            login_btn: Locator = (
+                self.page.locator(login_button_locator)
+                if login_button_locator
+                else self.page.get_by_role("button", name="ログイン")
+            )
+            logger.info("Clicking login button")
+            await login_btn.click()
+
+            await self.page.wait_for_load_state("networkidle")
+
+            if success_locator:
+                await self.page.locator(success_locator).wait_for(state="visible", timeout=self.timeout_ms)
+                logger.info(f"Login verification locator found: {success_locator}")
+
+            logger.info("Login successful")
+            return True
+
+        except PlaywrightTimeoutError as e:
+            logger.error(f"Login timeout (success locator: {success_locator})", exc_info=True)
+            raise ValueError(
+                f"ログイン処理がタイムアウト。パスワード確認、ロケーターを確認してください。"
+                f" (URL: {url}, success_locator: {success_locator})"
+            ) from e
+        except Exception:
+            logger.error("Login failed", exc_info=True)
+            raise
+
+    async def download_file(
+        self,
+        link_locator: str | None = None,
+        link_name: str | None = None,
+        expected_filename_pattern: str | None = None,
+    ) -> Path | None:
+        """
+        ファイルダウンロード処理（`PlaywrightScraper.download_file()` の非同期版）。
+
+        Args:
+            link_locator: ダウンロードリンク/ボタンのCSSセレクタ（link_nameより優先）
+            link_name: ダウンロードリンクのアクセシブル名（get_by_role使用）
+            expected_filename_pattern: 期待するファイル名パターン（チェック用、オプション）
+
+        Returns:
+            ダウンロードディレクトリ内のファイルパス
+
+        Raises:
+            RuntimeError: ダウンロード失敗
+        """
+        try:
+            if link_locator:
+                loc: Locator = self.page.locator(link_locator)
+            elif link_name:
+                loc = self.page.get_by_role("link", name=link_name)
+            else:
+                raise ValueError("link_locator または link_name を指定してください")
+
+            logger.info(f"Clicking download link (locator: {link_locator or link_name!r})")
+
+            async with self.page.expect_download() as download_info:
+                await loc.click()
+
+            download = await download_info.value
+            temp_file_path = Path(await download.path())
+
+            # ダウンロードディレクトリに保存（同名ファイルがあれば連番を付ける）。
+            # ファイル操作（別ファイルシステムならコピー）でイベントループを止めないよう、スレッドで実行
+            target_path = await asyncio.to_thread(
+                _move_to_reserved, temp_file_path, self.download_dir, download.suggested_filename
+            )
+
+            logger.info(f"Download completed: {download.suggested_filename} -> {target_path}")
+            return target_path
+
+        except Exception as e:
+            logger.error(f"Download failed: {e!s}", exc_info=True)
+            raise RuntimeError(
+                f"Download completion wait failed. Expected file: {expected_filename_pattern or 'unknown'}. Error: {e}"
+            ) from e
+
+    async def get_text(self, css_selector: str) -> str:
+        """
+        Locator経由でテキストを取得。
+
+        Args:
+            css_selector: CSSセレクタ
+
+        Returns:
+            テキスト内容
+
+        Raises:
+            ValueError: テキストが取得できない
+        """
+        try:
+            loc = self.page.locator(css_selector)
+            await loc.wait_for(state="visible", timeout=self.timeout_ms)
+            text = await loc.text_content()
+            if text is None:
+                raise ValueError(f"Element text is None. Locator: {css_selector!r}, URL: {self.page.url}")
+            return text.strip()
+        except PlaywrightTimeoutError:
+            logger.error(f"Locator not found: {css_selector!r}", exc_info=True)
+            raise
+        except Exception:
+            logger.error(f"Failed to get text from {css_selector!r}", exc_info=True)
+            raise
+
+    async def get_attribute(self, css_selector: str, attr: str) -> str | None:
+        """
+        Locator経由で属性値を取得。
+
+        Args:
+            css_selector: CSSセレクタ
+            attr: 属性名
+
+        Returns:
+            属性値（存在しない場合 None）
+        """
+        try:
+            return await self.page.locator(css_selector).get_attribute(attr)
+        except Exception:
+            logger.warning(f"Failed to get attribute {attr!r} from {css_selector!r}", exc_info=True)
+            return None
+
+
+class AsyncPlaywrightScraper(AsyncPageScraper):
+    """
+    非同期スクレイパー（1ブラウザ・1コンテキストを共有）
+
+    `launch()` 後は `self.page` に対して sync版と同じ操作ができる。
+    `run_concurrent()` はターゲットごとに新しいページを開き、
+    セマフォで同時オープンページ数を制限しながら並列処理する。
+    """
+
+    def __init__(self, headless: bool = True, timeout_ms: int = 30000, download_dir: str | None = None) -> None:
+        """
+        初期化。
+
+        Args:
+            headless: ヘッドレスモード（GUI非表示）
+            timeout_ms: タイムアウト時間（ミリ秒）
+            download_dir: ダウンロード保存先ディレクトリ
+        """
+        super().__init__(page=None, timeout_ms=timeout_ms, download_dir=download_dir)  # type: ignore[arg-type]  # launch() で設定
+        self.headless = headless
+
+        self.playwright: Playwright | None = None
+        self.browser: Browser | None = None
+        self.context: BrowserContext | None = None
+
+    async def launch(self) -> None:
+        """ブラウザ起動"""
+        try:
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+            self.context = await self.browser.new_context(accept_downloads=True)
+            self.context.set_default_timeout(self.timeout_ms)
+            self.page = await self.context.new_page()
+            logger.info("Browser launched successfully")
+        except Exception as e:
+            logger.error(f"Failed to launch browser: {e}", exc_info=True)
+            raise
+
+    async def close(self) -> None:
+        """ブラウザ終了"""
+        if self.context:
+            await self.context.close()
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        logger.info("Browser closed")
+
+    async def __aenter__(self) -> "Self":
+        await self.launch()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def run_concurrent(
+        self,
+        targets: Sequence[T],
+        task: Callable[[AsyncPageScraper, T], Awaitable[R]],
+        concurrency: int = 5,
+        scheduler: "HostScheduler | None" = None,
+        host_key: Callable[[T], str] | None = None,
+    ) -> list[R | BaseException]:
+        """
+        ターゲットを並列処理する（同時オープンページ数を `concurrency` に制限）。
+
+        各ターゲットには専用ページを割り当てた `AsyncPageScraper` が渡される。
+        コンテキストは共有されるため、事前に `login()` したセッション（Cookie）を引き継ぐ。
+        scheduler 指定時は、ターゲットのホストごとにレート制限・同時実行数制御を行い、
+        ページのレスポンス（document / xhr / fetch）のステータスと応答時間をスケジューラーへ返す。
+
+        Args:
+            targets: 処理対象（URL・アカウント情報など）
+            task: `async def task(scraper, target) -> result`
+            concurrency: 同時に開くページ数の上限（全ホスト合計）
+            scheduler: ホストごとの流量制御（rate_limiter.HostScheduler。レートはタスクの開始数/秒）
+            host_key: ターゲットからURLまたはホスト名を返す関数（省略時: ターゲット自体をURLとみなす）
+
+        Returns:
+            targets と同じ順序の結果リスト（失敗したターゲットは例外オブジェクト）
+        """
+        if self.context is None:
+            raise RuntimeError("launch() を先に呼び出してください")
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be >= 1: {concurrency}")
+
+        context = self.context
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_page(target: T) -> R:
+            async with semaphore:
+                page = await context.new_page()
+                if scheduler:
+                    self._report_responses(page, scheduler)
+                try:
+                    return await task(AsyncPageScraper(page, self.timeout_ms, self.download_dir), target)
+                except Exception:
+                    logger.error(f"Task failed for target: {target!r}", exc_info=True)
+                    raise
+                finally:
+                    await page.close()
+
+        async def run_one(target: T) -> R:
+            if scheduler is None:
+                return await run_page(target)
+            # ホストの枠を先に確保する（絞られているホストの待機で全体の枠を占有しないように）
+            async with scheduler.slot(host_key(target) if host_key else str(target)):
+                return await run_page(target)
+
+        results = await asyncio.gather(*(run_one(target) for target in targets), return_exceptions=True)
+        failed = sum(isinstance(result, BaseException) for result in results)
+        logger.info(f"Concurrent run finished: {len(results) - failed} succeeded, {failed} failed")
+        if scheduler:
+            logger.info(f"Scheduler report: {scheduler.report()}")
+        return results
+
+    @staticmethod
+    def _report_responses(page: Page, scheduler: "HostScheduler") -> None:
+        """ページのレスポンス結果をスケジューラーへ返すリスナーを登録（内部用）"""
+
+        def on_response(response: Response) -> None:
+            request = response.request
+            if request.resource_type not in _SCHEDULED_RESOURCE_TYPES:
+                return
+            # timing は startTime からの相対ミリ秒（取得できない場合 -1）
+            response_start = request.timing.get("responseStart", -1)
+            scheduler.feedback(
+                response.url,
+                response.status,
+                latency_s=response_start / 1000 if response_start >= 0 else None,
+                retry_after=response.headers.get("retry-after"),
+            )
+
+        def on_request_failed(request: Request) -> None:
+            if request.resource_type in _SCHEDULED_RESOURCE_TYPES:
+                scheduler.feedback(request.url, 0)
+
+        page.on("response", on_response)
+        page.on("requestfailed", on_request_failed)
+
+
+async def _fetch_title(scraper: AsyncPageScraper, url: str) -> dict[str, Any]:
+    """サンプルタスク: ページタイトルを取得"""
+    await scraper.page.goto(url)
+    return {"url": url, "title": await scraper.page.title()}
+
+
+async def _main(urls: list[str], concurrency: int, rate_per_host: float | None) -> None:
+    scheduler = None
+    if rate_per_host:
+        from rate_limiter import HostPolicy, HostScheduler
+
+        scheduler = HostScheduler(default_policy=HostPolicy(rate_per_s=rate_per_host))
+    async with AsyncPlaywrightScraper(headless=True) as scraper:
+        results = await scraper.run_concurrent(urls, _fetch_title, concurrency=concurrency, scheduler=scheduler)
+    for url, result in zip(urls, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.error(f"{url}: {result}")
+        else:
+            logger.info(f"{url}: {result['title']}")
+
+
+# 使用例
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="複数URLを並列にスクレイピング")
+    parser.add_argument("urls", nargs="+", help="対象URL")
+    parser.add_argument("--concurrency", "-c", type=int, default=5, help="同時オープンページ数（デフォルト: 5）")
+    parser.add_argument(
+        "--rate-per-host", type=float, default=None, help="ホストごとの毎秒タスク開始数の上限（省略時: 制限なし）"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(_main(args.urls, args.concurrency, args.rate_per_host))
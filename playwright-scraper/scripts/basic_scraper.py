@@ -13,31 +13,345 @@ Basic Playwright Scraper Example
     - python-dotenv
 """
 
+from __future__ import annotations
+
 import logging
 import os
 import shutil
 import sys
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+from urllib.parse import unquote, urljoin, urlsplit
+
+from change_tracker import ChangeTracker, Fingerprint, hash_content
+from scrape_metrics import ScrapeMetrics, timed
+from wait_strategies import LoadStateWait, NetworkIdleWait, WaitStrategy
 
-from dotenv import load_dotenv
+# Playwright・dotenv は使用時に読み込む（import のみのコマンドや --help を速くするため）
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Locator, Page, Response, Route
 
-# Playwright インポート
-try:
-    from playwright.sync_api import Locator, sync_playwright
-    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
-except ImportError:
-    print("Error: playwright not installed. Run: pip install playwright")
-    sys.exit(1)
+    from asset_cache import AssetCache
+    from browser_pool import BrowserPool
+    from job_journal import JobJournal
 
-# ロギング設定
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
+def is_storage_state_stale(path: Path, *, days: int) -> bool:
+    """ファイルが days 日より古い（または存在しない）場合 True を返す。"""
+    if not path.exists():
+        return True
+    try:
+        mtime = datetime.fromtimestamp(path.stat().st_mtime)
+    except OSError:
+        return True
+    return datetime.now() - mtime > timedelta(days=days)
+
+
+# 次ページロケーターのデフォルト候補（上から順に or_() で結合）
+DEFAULT_NEXT_PAGE_LOCATORS = ("a[rel='next']", "a.pagination-next", "button[aria-label='Next page']")
+
+# 一括抽出用 JavaScript（1回の evaluate で全行・全フィールドを取得）
+_EXTRACT_ROWS_JS = """
+(rows, fields) => rows.map((row) => {
+    const record = {};
+    for (const [name, selector, attr] of fields) {
+        const el = selector ? row.querySelector(selector) : row;
+        if (!el) {
+            record[name] = null;
+        } else if (attr) {
+            record[name] = el.getAttribute(attr);
+        } else {
+            record[name] = (el.textContent || "").trim();
+        }
+    }
+    return record;
+})
+"""
+
+_EXTRACT_TABLE_JS = """
+(table) => Array.from(table.rows, (row) => Array.from(row.cells, (cell) => (cell.textContent || "").trim()))
+"""
+
+# 高速モードでデフォルト遮断するリソース種別・ホスト（計測/広告系）
+DEFAULT_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+DEFAULT_BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.io",
+)
+
+
+@dataclass
+class FastModeConfig:
+    """
+    高速モード（リクエスト遮断）の設定。
+
+    Attributes:
+        blocked_resource_types: 中断するリソース種別（`request.resource_type`）
+        blocked_hosts: 遮断するホスト（サフィックス一致。サードパーティの計測・広告等）
+        allowed_hosts: 常に通すホスト（サフィックス一致。blocked_* より優先）
+        stub_blocked_hosts: True の場合、遮断ホストは中断ではなく空の 204 応答を返す
+            （読み込み失敗でページ側スクリプトがエラーになるのを防ぐ）
+    """
+
+    blocked_resource_types: frozenset[str] = DEFAULT_BLOCKED_RESOURCE_TYPES
+    blocked_hosts: tuple[str, ...] = DEFAULT_BLOCKED_HOSTS
+    allowed_hosts: tuple[str, ...] = ()
+    stub_blocked_hosts: bool = True
+
+
+@dataclass
+class RouteStats:
+    """高速モードのリクエスト統計"""
+
+    passed: int = 0
+    aborted: int = 0
+    stubbed: int = 0
+    blocked_by_type: Counter[str] = field(default_factory=Counter)
+    blocked_by_host: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def blocked(self) -> int:
+        """遮断したリクエスト数（中断 + スタブ応答）"""
+        return self.aborted + self.stubbed
+
+
+@dataclass
+class MemoryGovernorConfig:
+    """
+    メモリガバナー（ページ/コンテキストの定期的な作り直し）の設定。
+
+    Chromium のレンダラーは同じページで遷移を繰り返すとメモリが増え続けるため、
+    遷移回数または JS ヒープ使用量が上限に達したら作り直して使用量を一定に保つ。
+
+    Attributes:
+        max_navigations: この回数の遷移ごとに作り直す（None: 回数では作り直さない）
+        max_js_heap_mb: JS ヒープ使用量（CDP `Performance.getMetrics` の JSHeapUsedSize）の上限（MB）。
+            Chromium 以外では計測できないため無視される（None: 計測しない）
+        check_interval: JS ヒープを計測する遷移間隔（計測自体のコストを抑える）
+        scope: "context" でコンテキストごと（Cookie・localStorage は引き継ぐ）、"page" でタブのみ作り直す
+    """
+
+    max_navigations: int | None = 200
+    max_js_heap_mb: float | None = 512.0
+    check_interval: int = 20
+    scope: Literal["page", "context"] = "context"
+
+
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+# 直接取得に引き継ぐコンテキストのオプション（proxy の bypass・SOCKS、クライアント証明書等は未対応）
+DIRECT_FETCH_OPTIONS = ("proxy", "http_credentials", "ignore_https_errors")
+
+
+def _origin(url: str) -> tuple[str, str, int | None]:
+    """(スキーム, ホスト, ポート)（内部用）"""
+    parts = urlsplit(url)
+    return parts.scheme, (parts.hostname or "").lower(), parts.port
+
+
+def _build_opener(url: str, options: dict[str, Any]) -> Any:
+    """
+    直接取得用の urllib オープナーを作成（内部用）。
+
+    - 別オリジンへのリダイレクトでは Cookie・Authorization を送らない
+      （urllib の既定ではリダイレクト先にもそのまま送られ、CDN 等にセッションが漏れる）
+    - コンテキストの proxy（http/https のみ）・http_credentials（Basic / Digest）・ignore_https_errors を適用
+
+    Raises:
+        ValueError: 直接取得で使えない proxy（SOCKS 等）
+    """
+    import ssl
+    import urllib.request
+    from urllib.parse import quote
+
+    class CrossOriginRedirectHandler(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, req, fp, code, msg, headers, newurl):  # type: ignore[no-untyped-def]
+            new_request = super().redirect_request(req, fp, code, msg, headers, newurl)
+            if new_request is not None and _origin(newurl) != _origin(req.full_url):
+                for name in ("Cookie", "Authorization"):
+                    new_request.remove_header(name)
+            return new_request
+
+    handlers: list[Any] = [CrossOriginRedirectHandler()]
+    proxy = options.get("proxy")
+    if proxy:
+        server = proxy["server"] if "://" in proxy["server"] else f"http://{proxy['server']}"
+        parts = urlsplit(server)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Proxy is not supported for direct fetch: {proxy['server']}")
+        if proxy.get("username"):
+            userinfo = quote(proxy["username"], safe="") + ":" + quote(proxy.get("password", ""), safe="")
+            server = parts._replace(netloc=f"{userinfo}@{parts.netloc}").geturl()
+        handlers.append(urllib.request.ProxyHandler({"http": server, "https": server}))
+    if options.get("ignore_https_errors"):
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        handlers.append(urllib.request.HTTPSHandler(context=context))
+    credentials = options.get("http_credentials")
+    if credentials:
+        # origin の指定がなければ取得先のオリジンにのみ送る
+        password_manager = urllib.request.HTTPPasswordMgrWithDefaultRealm()
+        password_manager.add_password(
+            None, credentials.get("origin") or url, credentials["username"], credentials["password"]
+        )
+        handlers.append(urllib.request.HTTPBasicAuthHandler(password_manager))
+        handlers.append(urllib.request.HTTPDigestAuthHandler(password_manager))
+    return urllib.request.build_opener(*handlers)
+
+
+def _stream_to_file(
+    url: str,
+    headers: dict[str, str],
+    download_dir: Path,
+    timeout_s: float,
+    options: dict[str, Any] | None = None,
+) -> tuple[Path | None, dict[str, str | None]]:
+    """
+    URL をチャンク単位でファイルへストリーム保存（ブラウザを介さない直接取得）。
+
+    Args:
+        url: 取得URL（http/https のみ）
+        headers: リクエストヘッダー（Cookie、条件付き GET の If-None-Match 等）
+        download_dir: 保存先ディレクトリ
+        timeout_s: タイムアウト（秒）
+        options: コンテキストのオプション（DIRECT_FETCH_OPTIONS のみ使用）
+
+    Returns:
+        (保存したファイルパス, {"etag", "last_modified"})。304 Not Modified の場合パスは None。
+        同名のファイルがある場合は "name-1.ext" のように番号を付けて保存する（既存のファイルは上書きしない）
+
+    Raises:
+        RuntimeError: ファイル以外（ログイン画面等のHTML）が返された
+    """
+    import urllib.error
+    import urllib.request
+    from email.message import Message
+
+    if urlsplit(url).scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL scheme: {url}")
+
+    opener = _build_opener(url, options or {})
+    request = urllib.request.Request(url, headers=headers)  # nosec B310 - スキームは上で検証済み
+    try:
+        response = opener.open(request, timeout=timeout_s)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, {"etag": e.headers.get("ETag"), "last_modified": e.headers.get("Last-Modified")}
+        raise
+    with response:
+        validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        content_type = response.headers.get_content_type()
+        if content_type == "text/html":
+            # セッション切れでログイン画面にリダイレクトされた場合など
+            raise RuntimeError(f"Expected a file but got HTML (URL: {response.url})")
+
+        message = Message()
+        message["Content-Disposition"] = response.headers.get("Content-Disposition", "")
+        filename = message.get_filename() or unquote(Path(urlsplit(response.url).path).name) or "download"
+
+        # 並列取得で同じファイル名になっても衝突しないよう、転送はリクエストごとの一時ファイルへ書き込む
+        with tempfile.NamedTemporaryFile(dir=download_dir, prefix=".", suffix=".part", delete=False) as f:
+            partial_path = Path(f.name)
+            try:
+                shutil.copyfileobj(response, f, _DOWNLOAD_CHUNK_SIZE)
+                expected = response.headers.get("Content-Length")
+                if expected and expected.isdigit() and f.tell() != int(expected):
+                    raise RuntimeError(f"Incomplete download: {f.tell()}/{expected} bytes (URL: {response.url})")
+            except BaseException:
+                f.close()
+                partial_path.unlink(missing_ok=True)
+                raise
+    target_path: Path | None = None
+    try:
+        target_path = _reserve_path(download_dir, Path(filename).name)
+        os.replace(partial_path, target_path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        if target_path is not None:
+            target_path.unlink(missing_ok=True)
+        raise
+    return target_path, validators
+
+
+def _reserve_path(directory: Path, filename: str) -> Path:
+    """
+    directory 内で未使用のファイル名を確保（既存なら "name-1.ext", "name-2.ext", ...）。
+
+    O_EXCL で空ファイルを作成して確保するため、並列に呼び出しても同じパスを返さない。
+    """
+    stem, suffix = Path(filename).stem, Path(filename).suffix
+    path = directory / filename
+    counter = 0
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+            return path
+        except FileExistsError:
+            counter += 1
+            path = directory / f"{stem}-{counter}{suffix}"
+
+
+def _move_to_reserved(source: Path, directory: Path, filename: str) -> Path:
+    """
+    source を directory 内で確保した未使用のファイル名へ移動（同名のファイルを上書きしない）。
+
+    同一ファイルシステムなら rename のみ。別ファイルシステムならコピー＋削除になる。
+
+    Returns:
+        移動先のパス
+    """
+    target_path = _reserve_path(directory, Path(filename).name)
+    try:
+        shutil.move(source, target_path)
+    except BaseException:
+        target_path.unlink(missing_ok=True)
+        raise
+    return target_path
+
+
+def _host_matches(host: str, patterns: tuple[str, ...]) -> bool:
+    """host が patterns のいずれかと一致またはそのサブドメインなら True"""
+    return any(host == p or host.endswith("." + p) for p in patterns)
+
+
 class PlaywrightScraper:
     """Playwrightベースのスクレイパー基底クラス（Locator中心）"""
 
-    def __init__(self, headless: bool = True, timeout_ms: int = 30000, download_dir: str | None = None) -> None:
+    def __init__(
+        self,
+        headless: bool = True,
+        timeout_ms: int = 30000,
+        download_dir: str | None = None,
+        pool: BrowserPool | None = None,
+        storage_state_path: str | None = None,
+        storage_state_max_age_days: int = 7,
+        fast_mode: FastModeConfig | bool = False,
+        metrics: ScrapeMetrics | None = None,
+        wait_strategy: WaitStrategy | None = None,
+        har_path: str | None = None,
+        har_mode: Literal["record", "replay"] | None = None,
+        memory_governor: MemoryGovernorConfig | bool = False,
+        asset_cache: AssetCache | None = None,
+        change_tracker: ChangeTracker | None = None,
+        browser_endpoint: str | None = None,
+        downloads_path: str | None = None,
+    ) -> None:
         """
         初期化。
 
@@ -45,32 +359,129 @@ class PlaywrightScraper:
             headless: ヘッドレスモード（GUI非表示）
             timeout_ms: タイムアウト時間（ミリ秒）
             download_dir: ダウンロード保存先ディレクトリ
+            pool: 起動済みブラウザを共有する BrowserPool（指定時はブラウザを起動せずコンテキストを借りる）
+            storage_state_path: セッションキャッシュ（storage_state.json）のパス。
+                指定時は鮮度内のファイルをコンテキストに読み込み、`ensure_login()` でログインを省略する
+            storage_state_max_age_days: セッションキャッシュを使用する最大経過日数
+            fast_mode: 高速モード。True でデフォルト設定、FastModeConfig でサイト別の遮断/許可リストを指定。
+                画像・フォント・計測ビーコン等を遮断し、ページロードと networkidle 待機を短縮する
+            metrics: 処理時間の計測先（省略時は新規作成。`self.metrics.report()` / `export_json()` で出力）
+            wait_strategy: 遷移後のデフォルト待機条件（省略時: NetworkIdleWait()。各メソッドの wait 引数で上書き可）
+            har_path: HAR ファイルのパス（har_mode と併用）
+            har_mode: "record" で全通信を har_path に記録（close() 時に保存）、
+                "replay" で har_path から応答し実サイトへアクセスしない（HAR にない通信は中断）
+                ※ fetch_file() の直接取得はブラウザを経由しないため記録・再生の対象外
+            memory_governor: メモリガバナー。True でデフォルト設定、MemoryGovernorConfig で上限を指定。
+                長時間のクロールで遷移回数・JS ヒープが上限に達したらページ/コンテキストを作り直す
+            asset_cache: 静的リソース（JS・CSS・画像・フォント）のディスクキャッシュ。
+                実行をまたいで再利用し、再クロール時の転送量とページロード時間を削減する（HAR 再生時は無効）
+            change_tracker: 差分スクレイピング用のフィンガープリント保存先。
+                指定時は `goto_if_changed()` と `fetch_file()` / `fetch_files()` が
+                前回から変更のないページ・ファイルを省略する
+            browser_endpoint: 起動済みブラウザの CDP エンドポイント（例: "http://127.0.0.1:9222"）。
+                "auto" で `browser_server.py start` の常駐ブラウザが起動していれば接続し、なければ通常起動する
+            downloads_path: ブラウザのダウンロード一時ファイルの保存先（省略時: OS の一時ディレクトリ）。
+                保存先と同じファイルシステムを指定すると、ダウンロードの移動がコピーでなく rename になる
         """
         self.headless = headless
         self.timeout_ms = timeout_ms
+        self.pool = pool
         self.download_dir = Path(download_dir or "./downloads")
         self.download_dir.mkdir(exist_ok=True, parents=True)
+        self.storage_state_path = Path(storage_state_path) if storage_state_path else None
+        self.storage_state_max_age_days = storage_state_max_age_days
+        self.session_restored = False
+        self.fast_mode = FastModeConfig() if fast_mode is True else fast_mode or None
+        self.route_stats = RouteStats()
+        self.metrics = metrics or ScrapeMetrics()
+        self.wait_strategy: WaitStrategy = wait_strategy or NetworkIdleWait()
+        if har_mode and not har_path:
+            raise ValueError("har_mode を指定する場合は har_path も指定してください")
+        self.har_path = Path(har_path) if har_path else None
+        self.har_mode = har_mode
+        self.memory_governor = MemoryGovernorConfig() if memory_governor is True else memory_governor or None
+        self._navigations = 0  # 直近の作り直し以降の遷移回数
+        self.asset_cache = asset_cache
+        self.change_tracker = change_tracker
+        self.browser_endpoint = browser_endpoint
+        self.downloads_path = downloads_path
 
         self.browser = None
         self.context = None
         self.page = None
         self.playwright = None
 
+    @timed("launch")
     def launch(self) -> None:
-        """ブラウザ起動"""
+        """ブラウザ起動（pool 指定時はプールからコンテキストを取得）"""
+        try:
+            from playwright.sync_api import sync_playwright
+        except ImportError:
+            print("Error: playwright not installed. Run: pip install playwright")
+            sys.exit(1)
+
         try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(headless=self.headless)
-            self.context = self.browser.new_context()
-            self.page = self.context.new_page()
+            endpoint = None
+            if not self.pool:
+                endpoint = self._resolve_browser_endpoint()
+                self.playwright = sync_playwright().start()
+                if endpoint:
+                    # 常駐ブラウザへ接続（Chromium の起動を省略）。close() は接続を切るだけでブラウザは残る
+                    self.browser = self.playwright.chromium.connect_over_cdp(endpoint, timeout=self.timeout_ms)
+                else:
+                    self.browser = self.playwright.chromium.launch(
+                        headless=self.headless, downloads_path=self.downloads_path
+                    )
+            self.context = self._new_context()
+            self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
             self.page.set_default_timeout(self.timeout_ms)
-            logger.info("Browser launched successfully")
+            if self.pool:
+                logger.info("Browser context checked out from pool")
+            elif endpoint:
+                logger.info(f"Connected to browser server: {endpoint}")
+            else:
+                logger.info("Browser launched successfully")
         except Exception as e:
             logger.error(f"Failed to launch browser: {e}", exc_info=True)
             raise
 
+    def _resolve_browser_endpoint(self) -> str | None:
+        """browser_endpoint を解決（"auto" は常駐ブラウザが起動中の場合のみ）（内部用）"""
+        if self.browser_endpoint != "auto":
+            return self.browser_endpoint
+        from browser_server import server_endpoint
+
+        endpoint = server_endpoint()
+        if not endpoint:
+            logger.info("Browser server not running; launching a new browser")
+        return endpoint
+
+    @timed("close")
     def close(self) -> None:
-        """ブラウザ終了"""
+        """ブラウザ終了（pool 指定時はコンテキストをプールへ返却）"""
+        if self.fast_mode:
+            stats = self.route_stats
+            logger.info(f"Fast mode: blocked {stats.blocked} requests, passed {stats.passed}")
+            self.metrics.counters.update({"fast_mode.blocked": stats.blocked, "fast_mode.passed": stats.passed})
+        if self.asset_cache:
+            cache_stats = self.asset_cache.stats
+            logger.info(
+                f"Asset cache: {cache_stats.hits} hits, {cache_stats.revalidated} revalidated, "
+                f"{cache_stats.misses} misses ({cache_stats.bytes_served} bytes served from disk)"
+            )
+            self.metrics.counters.update(
+                {
+                    "asset_cache.hits": cache_stats.hits,
+                    "asset_cache.revalidated": cache_stats.revalidated,
+                    "asset_cache.misses": cache_stats.misses,
+                }
+            )
+        if self.pool:
+            if self.context:
+                self.pool.release(self.context)
+                self.context = None
+            logger.info("Browser context returned to pool")
+            return
         if self.context:
             self.context.close()
         if self.browser:
@@ -79,6 +490,296 @@ class PlaywrightScraper:
             self.playwright.stop()
         logger.info("Browser closed")
 
+    def _context_options(self) -> dict[str, Any]:
+        """`new_context()` に渡すオプションを組み立てる（内部用）"""
+        options: dict[str, Any] = {}
+        self.session_restored = False
+        if self.storage_state_path:
+            if is_storage_state_stale(self.storage_state_path, days=self.storage_state_max_age_days):
+                logger.info(f"Session cache is stale or missing: {self.storage_state_path}")
+            else:
+                options["storage_state"] = str(self.storage_state_path)
+                self.session_restored = True
+                logger.info(f"Loading session cache: {self.storage_state_path}")
+        if self.har_mode == "record" and self.har_path:
+            self.har_path.parent.mkdir(parents=True, exist_ok=True)
+            options["record_har_path"] = str(self.har_path)
+            logger.info(f"Recording HAR: {self.har_path}")
+        return options
+
+    def _new_context(self, storage_state: dict[str, Any] | None = None) -> BrowserContext:
+        """コンテキストを作成（pool 指定時はプールから取得。storage_state 指定時はそれを読み込む）（内部用）"""
+        options = self._context_options()
+        if storage_state is not None:
+            options["storage_state"] = storage_state
+        context = self.pool.acquire(**options) if self.pool else self.browser.new_context(**options)
+        # ルートは後から登録したものが先に評価されるため、HAR 再生 → アセットキャッシュ → 高速モードの順で登録
+        # （遮断するリクエストはキャッシュに届く前に中断する）
+        if self.har_mode == "replay" and self.har_path:
+            context.route_from_har(self.har_path, not_found="abort")
+            logger.info(f"Replaying HAR: {self.har_path}")
+        elif self.asset_cache:
+            # キャッシュの取得は route.fetch() で実ネットワークに出るため、HAR 再生時は登録しない
+            self.asset_cache.attach(context)
+        if self.fast_mode:
+            context.route("**/*", self._route_fast_mode)
+        return context
+
+    def _route_fast_mode(self, route: Route) -> None:
+        """高速モードのルートハンドラ。不要なリクエストを中断/スタブし、それ以外は後続へ渡す（内部用）"""
+        config = self.fast_mode
+        assert config is not None
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+
+        if not _host_matches(host, config.allowed_hosts) and not request.is_navigation_request():
+            if _host_matches(host, config.blocked_hosts):
+                self.route_stats.blocked_by_host[host] += 1
+                if config.stub_blocked_hosts:
+                    self.route_stats.stubbed += 1
+                    route.fulfill(status=204, body="")
+                else:
+                    self.route_stats.aborted += 1
+                    route.abort("blockedbyclient")
+                return
+            if request.resource_type in config.blocked_resource_types:
+                self.route_stats.blocked_by_type[request.resource_type] += 1
+                self.route_stats.aborted += 1
+                route.abort("blockedbyclient")
+                return
+
+        self.route_stats.passed += 1
+        route.fallback()
+
+    def _wait(self, page: Page, action: Callable[[], object] | None, wait: WaitStrategy | None = None) -> bool:
+        """待機戦略で action 後の完了を待ち、戦略ごとの待機時間を記録（内部用）"""
+        strategy = wait or self.wait_strategy
+        with self.metrics.span(f"wait.{strategy.name}") as attrs:
+            settled = strategy.run(page, action, self.timeout_ms)
+            attrs["settled"] = settled
+        if not settled:
+            self.metrics.increment("wait.capped")
+        return settled
+
+    def js_heap_mb(self, page: Page | None = None) -> float | None:
+        """
+        ページの JS ヒープ使用量（MB）を CDP `Performance.getMetrics` で取得。
+
+        Args:
+            page: 対象ページ（省略時: self.page）
+
+        Returns:
+            JS ヒープ使用量（MB）。CDP が使えない場合（Chromium 以外・リモート接続等）は None
+        """
+        from playwright.sync_api import Error as PlaywrightError
+
+        page = page or self.page
+        try:
+            cdp = self.context.new_cdp_session(page)
+        except PlaywrightError as e:
+            logger.debug(f"CDP session unavailable: {e}")
+            return None
+        try:
+            cdp.send("Performance.enable")
+            metrics = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+        finally:
+            cdp.detach()
+        heap = metrics.get("JSHeapUsedSize")
+        return heap / (1024 * 1024) if heap is not None else None
+
+    def _recycle_reason(self) -> str | None:
+        """メモリガバナーの上限に達していれば作り直しの理由を返す（内部用）"""
+        config = self.memory_governor
+        if not config or not self.page:
+            return None
+        if config.max_navigations and self._navigations >= config.max_navigations:
+            return "navigations"
+        if config.max_js_heap_mb and self._navigations and self._navigations % max(config.check_interval, 1) == 0:
+            heap_mb = self.js_heap_mb()
+            if heap_mb is not None and heap_mb >= config.max_js_heap_mb:
+                logger.info(f"JS heap {heap_mb:.0f} MB exceeds limit of {config.max_js_heap_mb:.0f} MB")
+                return "js_heap"
+        return None
+
+    def recycle(self, reason: str = "manual", restore_url: bool = False) -> None:
+        """
+        ページ（またはコンテキスト）を作り直してレンダラーのメモリを解放。
+
+        コンテキストを作り直す場合は Cookie・localStorage を引き継ぎ、ルート（高速モード・HAR 再生）も
+        再登録する。sessionStorage とページ上の入力状態は引き継がれない。
+        HAR 記録中はコンテキストを閉じると HAR が確定してしまうため、ページのみ作り直す。
+
+        Args:
+            reason: 作り直しの理由（メトリクス・ログ用）
+            restore_url: 作り直し後に元の URL を開き直す
+        """
+        scope = self.memory_governor.scope if self.memory_governor else "context"
+        if scope == "context" and self.har_mode == "record":
+            scope = "page"
+        url = self.page.url if restore_url and self.page else None
+
+        with self.metrics.span("memory.recycle", reason=reason, scope=scope, navigations=self._navigations):
+            old_page, old_context = self.page, self.context
+            if scope == "context":
+                # storage_state() は Cookie・localStorage を辞書で返す（ファイルに書かず引き継ぐ）
+                session_restored = self.session_restored
+                self.context = self._new_context(storage_state=old_context.storage_state())
+                self.session_restored = session_restored
+                self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
+                if self.pool:
+                    self.pool.release(old_context)
+                else:
+                    old_context.close()
+            else:
+                self.page = self.context.new_page()
+                old_page.close()
+            self.page.set_default_timeout(self.timeout_ms)
+            self._navigations = 0
+
+            if url and url != "about:blank":
+                self._wait(self.page, lambda: self.page.goto(url, wait_until="commit"))
+
+        self.metrics.increment("memory.recycled")
+        logger.info(f"Recycled browser {scope} ({reason})")
+
+    @timed("goto")
+    def goto(self, url: str, wait: WaitStrategy | None = None) -> Response | None:
+        """
+        ページ遷移し、待機戦略の完了条件まで待機。
+
+        メモリガバナーの上限に達している場合は、遷移前にページ/コンテキストを作り直す。
+
+        Args:
+            url: 遷移先URL
+            wait: 待機条件（省略時: self.wait_strategy）
+
+        Returns:
+            メインリソースのレスポンス
+        """
+        response: Response | None = None
+
+        def navigate() -> None:
+            nonlocal response
+            response = self.page.goto(url, wait_until="commit")
+
+        if reason := self._recycle_reason():
+            self.recycle(reason)
+
+        logger.info(f"Navigating to {url}")
+        self._navigations += 1
+        self._wait(self.page, navigate, wait)
+        return response
+
+    @timed("goto_if_changed")
+    def goto_if_changed(self, url: str, region_selector: str = "body", wait: WaitStrategy | None = None) -> bool:
+        """
+        前回実行から変更がある場合のみ抽出対象として遷移（差分スクレイピング）。
+
+        前回のレスポンスに ETag / Last-Modified があれば、まずログイン済みコンテキストで条件付き GET を送り、
+        304 なら遷移せずに False を返す。それ以外は遷移して region_selector のテキストのハッシュを前回と比較する
+        （検証子を返さないサイトでも、広告・日時などの変動部分を含まない領域を指定すれば判定できる）。
+        change_tracker 未指定時は常に遷移して True を返す。
+
+        抽出に失敗した場合は `self.change_tracker.forget(url)` で記録を削除すること（次回省略されないように）。
+
+        Args:
+            url: 遷移先URL
+            region_selector: 変更判定に使う領域のCSSセレクタ（デフォルト: ページ全体のテキスト）
+            wait: 待機条件（省略時: self.wait_strategy）
+
+        Returns:
+            新規または変更あり（抽出が必要）: True、変更なし: False
+        """
+        if not self.change_tracker:
+            self.goto(url, wait=wait)
+            return True
+
+        url = urljoin(self.page.url, url)
+        previous = self.change_tracker.get(url)
+        if previous and previous.conditional_headers():
+            with self.metrics.span("incremental.probe") as attrs:
+                probe = self.context.request.get(url, headers=previous.conditional_headers(), fail_on_status_code=False)
+                attrs["status"] = probe.status
+                probe.dispose()
+            if probe.status == 304:
+                self.change_tracker.record(url, unchanged=True)
+                self.metrics.increment("incremental.skipped")
+                logger.info(f"Page not modified (304), skipped: {url}")
+                return False
+
+        response = self.goto(url, wait=wait)
+        headers = response.headers if response else {}
+        changed = self.change_tracker.record(
+            url,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            content_hash=hash_content(self.page.locator(region_selector).first.inner_text()),
+        )
+        if not changed:
+            self.metrics.increment("incremental.skipped")
+            logger.info(f"Page content unchanged, skipped: {url}")
+            return False
+        self.metrics.increment("incremental.changed")
+        return True
+
+    def save_storage_state(self) -> Path | None:
+        """
+        現在のセッション（Cookie + localStorage）をセッションキャッシュへ保存。
+
+        Returns:
+            保存先パス（storage_state_path 未指定時は None）
+        """
+        if not self.storage_state_path:
+            return None
+        self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.context.storage_state(path=self.storage_state_path)
+        logger.info(f"Session cache saved: {self.storage_state_path}")
+        return self.storage_state_path
+
+    @timed("ensure_login")
+    def ensure_login(
+        self,
+        url: str,
+        success_locator: str,
+        verify_url: str | None = None,
+        verify_timeout_ms: int = 5000,
+        **login_kwargs: Any,
+    ) -> bool:
+        """
+        セッションキャッシュが有効ならログインを省略し、無効なら `login()` して再保存。
+
+        キャッシュ読込済みの場合は verify_url（省略時 url）を開いて success_locator の
+        表示を短いタイムアウトで確認するだけで済むため、最も遅いログイン処理を回避できる。
+
+        Args:
+            url: ログインページURL
+            success_locator: ログイン済みを判定するCSSセレクタ
+            verify_url: セッション検証に開くURL（ログイン後のページ等、省略時: url）
+            verify_timeout_ms: セッション検証のタイムアウト（ミリ秒）
+            **login_kwargs: `login()` に渡す引数（email_locator, email, password 等）
+
+        Returns:
+            ログイン済み状態になった場合 True
+        """
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        if self.session_restored:
+            try:
+                with self.metrics.span("wait.session_verify"):
+                    self.page.goto(verify_url or url)
+                    self.page.locator(success_locator).wait_for(state="visible", timeout=verify_timeout_ms)
+                logger.info("Session restored from cache; skipping login")
+                self.metrics.increment("session.reused")
+                return True
+            except PlaywrightTimeoutError:
+                logger.info("Cached session is no longer valid; logging in again")
+                self.metrics.increment("retries")
+
+        self.login(url, success_locator=success_locator, **login_kwargs)
+        self.save_storage_state()
+        return True
+
+    @timed("login")
     def login(
         self,
         url: str,
@@ -88,6 +789,7 @@ class PlaywrightScraper:
         email: str = "",
         password: str = "",  # nosec B107:空文字列デフォルト値は実際のセキュリティリスクではない
         success_locator: str | None = None,
+        wait: WaitStrategy | None = None,
     ) -> bool:
         """
         ログイン処理（汎用・Locatorベース）。
@@ -108,6 +810,8 @@ class PlaywrightScraper:
             email: ログインメールアドレス（環境変数や引数から）
             password: ログインパスワード（環境変数や引数から）
             success_locator: ログイン完了を検証するCSSセレクタ（省略可）
+            wait: ログインボタンクリック後の待機条件（省略時: self.wait_strategy）。
+                success_locator があるなら LocatorWait(success_locator) が最も速い
 
         Returns:
             ログイン成功時 True
@@ -115,10 +819,10 @@ class PlaywrightScraper:
         Raises:
             PlaywrightTimeoutError: タイムアウト
         """
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
         try:
-            logger.info(f"Navigating to {url}")
-            self.page.goto(url)
-            self.page.wait_for_load_state("domcontentloaded")
+            self.goto(url, wait=LoadStateWait("domcontentloaded"))
 
             # メールアドレス入力（Locatorが自動待機）
             # 注意: フォールバック値「メールアドレス」はWebサイト固有。サイトに合わせて email_locator を指定してください
@@ -144,21 +848,21 @@ class PlaywrightScraper:
                 else self.page.get_by_role("button", name="ログイン")
             )
             logger.info("Clicking login button")
-            login_btn.click()
-
-            # ページロード完了を待機
-            self.page.wait_for_load_state("networkidle")
+            # クリック後、待機戦略の完了条件まで待機
+            self._wait(self.page, login_btn.click, wait)
             logger.info("Login page loaded after click")
 
             # ログイン完了を検証（オプション）
             if success_locator:
-                self.page.locator(success_locator).wait_for(state="visible", timeout=self.timeout_ms)
+                with self.metrics.span("wait.locator", selector=success_locator):
+                    self.page.locator(success_locator).wait_for(state="visible", timeout=self.timeout_ms)
                 logger.info(f"Login verification locator found: {success_locator}")
 
             logger.info("Login successful")
             return True
 
         except PlaywrightTimeoutError as e:
+            self.metrics.increment("timeouts")
             logger.error(f"Login timeout (success locator: {success_locator})", exc_info=True)
             raise ValueError(
                 f"ログイン処理がタイムアウト。パスワード確認、ロケーターを確認してください。"
@@ -168,6 +872,7 @@ class PlaywrightScraper:
             logger.error("Login failed", exc_info=True)
             raise
 
+    @timed("download_file")
     def download_file(
         self,
         link_locator: str | None = None,
@@ -205,7 +910,7 @@ class PlaywrightScraper:
 
             # expect_download()コンテキストマネージャーでダウンロードを待機
             # イベント購読の寿命管理がwithブロック内で明確
-            with self.page.expect_download() as download_info:
+            with self.metrics.span("wait.download_start"), self.page.expect_download() as download_info:
                 loc.click()
 
             # ダウンロードオブジェクトを取得
@@ -214,11 +919,13 @@ class PlaywrightScraper:
 
             # ダウンロード完了を待機（Playwright標準パターン）
             # download.path() はダウンロードが完全に完了するまでブロック
-            temp_file_path = Path(download.path())
+            with self.metrics.span("wait.download_complete"):
+                temp_file_path = Path(download.path())
 
-            # ダウンロードディレクトリに保存
-            target_path = self.download_dir / download.suggested_filename
-            shutil.copy2(temp_file_path, target_path)
+            # ダウンロードディレクトリに保存（同名ファイルがあれば連番を付ける。
+            # Playwright の一時ディレクトリは通常 /tmp 側のため、downloads_path 未指定ならコピー＋削除になる）
+            with self.metrics.span("download.move"):
+                target_path = _move_to_reserved(temp_file_path, self.download_dir, download.suggested_filename)
 
             logger.info(f"Download completed: {download.suggested_filename} -> {target_path}")
             return target_path
@@ -229,6 +936,159 @@ class PlaywrightScraper:
                 f"Download completion wait failed. Expected file: {expected_filename_pattern or 'unknown'}. Error: {e}"
             ) from e
 
+    def _file_fingerprint(self, url: str) -> Fingerprint | None:
+        """前回取得したファイルが残っていればそのフィンガープリント（条件付き GET 用）（内部用）"""
+        if not self.change_tracker:
+            return None
+        previous = self.change_tracker.get(url)
+        if previous and previous.path and Path(previous.path).exists() and previous.conditional_headers():
+            return previous
+        return None
+
+    def _record_fetch(
+        self, url: str, path: Path | None, validators: dict[str, str | None], previous: Fingerprint | None
+    ) -> Path:
+        """直接取得の結果を change_tracker に記録し、ファイルパスを返す（304 なら前回のファイル）（内部用）"""
+        if path is None:
+            assert previous is not None and previous.path is not None  # 304 は条件付き GET を送った場合のみ
+            if self.change_tracker:
+                self.change_tracker.record(
+                    url, etag=validators["etag"], last_modified=validators["last_modified"], unchanged=True
+                )
+            self.metrics.increment("incremental.skipped")
+            logger.info(f"File not modified (304), skipped download: {url}")
+            return Path(previous.path)
+        if self.change_tracker:
+            self.change_tracker.record(
+                url, etag=validators["etag"], last_modified=validators["last_modified"], path=path
+            )
+            self.metrics.increment("incremental.changed")
+        return path
+
+    def _direct_fetch_options(self) -> dict[str, Any]:
+        """直接取得に引き継ぐオプション（BrowserPool の context_options のうち DIRECT_FETCH_OPTIONS）（内部用）"""
+        options = self.pool.context_options if self.pool else {}
+        return {key: options[key] for key in DIRECT_FETCH_OPTIONS if options.get(key)}
+
+    def _direct_request_headers(self, url: str) -> dict[str, str]:
+        """
+        ログイン済みコンテキストの Cookie・User-Agent を引き継ぐヘッダー（内部用）。
+
+        Cookie は url のオリジン向けのもの。別オリジンへリダイレクトされた場合は送らない（`_build_opener()`）。
+        """
+        headers = {"User-Agent": self.page.evaluate("() => navigator.userAgent")}
+        cookies = self.context.cookies(url)
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in cookies)
+        if self.page.url.startswith("http"):
+            headers["Referer"] = self.page.url
+        return headers
+
+    @timed("fetch_file")
+    def fetch_file(self, url: str, link_locator: str | None = None) -> Path:
+        """
+        ダウンロードURLを直接 HTTP GET で取得（UIクリック不要の高速パス）。
+
+        `login()` 後のコンテキストの Cookie を引き継いでチャンク単位でディスクへ書き込む
+        （別オリジンへのリダイレクト先には Cookie を送らない）。pool の context_options の proxy（http/https）・
+        http_credentials・ignore_https_errors も適用する（SOCKS プロキシ等は未対応で、直接取得の失敗として扱う）。
+        直接取得に失敗した場合、link_locator があれば `download_file()`（クリック）にフォールバックする。
+        change_tracker 指定時は前回の ETag / Last-Modified で条件付き GET を送り、304 ならダウンロードを省略する。
+
+        Args:
+            url: ダウンロードURL（相対URLは現在ページ基準で解決）
+            link_locator: フォールバック時にクリックするリンクのCSSセレクタ（省略可）
+
+        Returns:
+            ダウンロードディレクトリ内のファイルパス（変更なしの場合は前回のファイル）
+
+        Raises:
+            RuntimeError: 直接取得に失敗し、フォールバックもない
+        """
+        url = urljoin(self.page.url, url)
+        previous = self._file_fingerprint(url)
+        try:
+            logger.info(f"Fetching file directly: {url}")
+            headers = self._direct_request_headers(url)
+            if previous:
+                headers.update(previous.conditional_headers())
+            target_path, validators = _stream_to_file(
+                url, headers, self.download_dir, self.timeout_ms / 1000, self._direct_fetch_options()
+            )
+            if target_path:
+                logger.info(f"Download completed: {url} -> {target_path}")
+            return self._record_fetch(url, target_path, validators, previous)
+        except Exception as e:
+            if link_locator:
+                logger.warning(f"Direct fetch failed ({e}); falling back to click download")
+                self.metrics.increment("retries")
+                path = self.download_file(link_locator=link_locator)
+                assert path is not None
+                return path
+            logger.error(f"Direct fetch failed: {url}", exc_info=True)
+            raise RuntimeError(f"Direct download failed. URL: {url}. Error: {e}") from e
+
+    @timed("fetch_files")
+    def fetch_files(
+        self,
+        urls: Sequence[str],
+        max_workers: int = 4,
+        fallback_locators: dict[str, str] | None = None,
+    ) -> dict[str, Path | None]:
+        """
+        複数URLを並列に直接取得。
+
+        Cookie 等のヘッダーはメインスレッドで組み立て、HTTP転送のみスレッドプールで並列実行する。
+        （sync API はスレッドセーフではないため、Playwright の呼び出しはスレッドから行わない）
+
+        Args:
+            urls: ダウンロードURLのリスト
+            max_workers: 並列数
+            fallback_locators: {URL: クリックするリンクのCSSセレクタ}。直接取得に失敗したURLはクリックで再取得
+
+        Returns:
+            {URL: ファイルパス}（失敗したURLは None。変更なしの場合は前回のファイル。
+            同名になるファイルは "name-1.ext" のように番号を付けて別々に保存する）
+        """
+        fallback_locators = fallback_locators or {}
+        resolved = {url: urljoin(self.page.url, url) for url in urls}
+        headers = {url: self._direct_request_headers(absolute_url) for url, absolute_url in resolved.items()}
+        previous = {url: self._file_fingerprint(absolute_url) for url, absolute_url in resolved.items()}
+        for url, fingerprint in previous.items():
+            if fingerprint:
+                headers[url].update(fingerprint.conditional_headers())
+        timeout_s = self.timeout_ms / 1000
+        options = self._direct_fetch_options()
+        results: dict[str, Path | None] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                url: executor.submit(_stream_to_file, absolute_url, headers[url], self.download_dir, timeout_s, options)
+                for url, absolute_url in resolved.items()
+            }
+            for url, future in futures.items():
+                try:
+                    # change_tracker への記録は sqlite 接続を共有するメインスレッドで行う
+                    path, validators = future.result()
+                    results[url] = self._record_fetch(resolved[url], path, validators, previous[url])
+                except Exception as e:
+                    logger.warning(f"Direct fetch failed: {url} ({e})")
+                    results[url] = None
+
+        # 失敗分はメインスレッドでクリック経由のダウンロードにフォールバック
+        for url, path in results.items():
+            if path is None and url in fallback_locators:
+                self.metrics.increment("retries")
+                try:
+                    results[url] = self.download_file(link_locator=fallback_locators[url])
+                except RuntimeError:
+                    logger.error(f"Fallback download failed: {url}", exc_info=True)
+
+        failed = sum(path is None for path in results.values())
+        logger.info(f"Fetched {len(results) - failed}/{len(results)} files directly")
+        return results
+
+    @timed("get_text")
     def get_text(self, css_selector: str) -> str:
         """
         Locator経由でテキストを取得。
@@ -242,20 +1102,25 @@ class PlaywrightScraper:
         Raises:
             ValueError: ロケーターが見つからず
         """
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
         try:
             loc = self.page.locator(css_selector)
-            loc.wait_for(state="visible", timeout=self.timeout_ms)
+            with self.metrics.span("wait.locator", selector=css_selector):
+                loc.wait_for(state="visible", timeout=self.timeout_ms)
             text = loc.text_content()
             if text is None:
                 raise ValueError(f"Element text is None. Locator: {css_selector!r}, URL: {self.page.url}")
             return text.strip()
         except PlaywrightTimeoutError:
+            self.metrics.increment("timeouts")
             logger.error(f"Locator not found: {css_selector!r}", exc_info=True)
             raise
         except Exception:
             logger.error(f"Failed to get text from {css_selector!r}", exc_info=True)
             raise
 
+    @timed("get_attribute")
     def get_attribute(self, css_selector: str, attr: str) -> str | None:
         """
         Locator経由で属性値を取得。
@@ -273,10 +1138,201 @@ class PlaywrightScraper:
             logger.warning(f"Failed to get attribute {attr!r} from {css_selector!r}", exc_info=True)
             return None
 
+    @timed("extract_rows")
+    def extract_rows(
+        self,
+        row_selector: str,
+        fields: dict[str, str | tuple[str, str]],
+        wait_for_rows: bool = False,
+    ) -> list[dict[str, str | None]]:
+        """
+        行要素ごとに複数フィールドを一括抽出（`evaluate_all` 1回のラウンドトリップ）。
+
+        `get_text()` / `get_attribute()` を値ごとに呼ぶと行数 × フィールド数回の
+        ブラウザ往復が発生するため、一覧・テーブルの抽出にはこちらを使う。
+
+        Args:
+            row_selector: 行要素のCSSセレクタ（例: "table#data tbody tr"）
+            fields: {フィールド名: 行からの相対CSSセレクタ}。属性値は (セレクタ, 属性名) のタプル、
+                行要素自身は空文字列 "" で指定
+            wait_for_rows: True の場合、最初の行が DOM に現れるまで待機（省略時は待機せず 0件なら空リスト）
+
+        Returns:
+            [{フィールド名: テキストまたは属性値（要素がない場合 None）}, ...]
+        """
+        spec = [[name, *(field if isinstance(field, tuple) else (field, None))] for name, field in fields.items()]
+        rows = self.page.locator(row_selector)
+        if wait_for_rows:
+            rows.first.wait_for(state="attached", timeout=self.timeout_ms)
+        records: list[dict[str, str | None]] = rows.evaluate_all(_EXTRACT_ROWS_JS, spec)
+        logger.debug(f"Extracted {len(records)} rows from {row_selector!r}")
+        return records
+
+    @timed("extract_table")
+    def extract_table(self, table_selector: str, header: bool = True) -> list[dict[str, str]] | list[list[str]]:
+        """
+        `<table>` 全体を一括抽出（`evaluate` 1回のラウンドトリップ）。
+
+        Args:
+            table_selector: table 要素のCSSセレクタ
+            header: True の場合、1行目を見出しとして {見出し: セル} の辞書リストを返す
+
+        Returns:
+            header=True: [{見出し: セル値}, ...] / header=False: [[セル値, ...], ...]
+        """
+        loc = self.page.locator(table_selector).first
+        loc.wait_for(state="attached", timeout=self.timeout_ms)
+        rows: list[list[str]] = loc.evaluate(_EXTRACT_TABLE_JS)
+        if not header or not rows:
+            return rows
+        columns = rows[0]
+        return [dict(zip(columns, row, strict=False)) for row in rows[1:]]
+
+    def _next_page_locator(self, page: Page, next_locators: Sequence[str] | None) -> Locator:
+        """次ページリンクの Locator（候補を or_() で結合）（内部用）"""
+        loc = page.get_by_role("link", name="次へ")
+        for css_selector in next_locators or DEFAULT_NEXT_PAGE_LOCATORS:
+            loc = loc.or_(page.locator(css_selector))
+        return loc.first
+
+    def iter_pages(
+        self,
+        start_url: str | None = None,
+        next_locators: Sequence[str] | None = None,
+        max_pages: int | None = None,
+        prefetch: bool = False,
+        wait: WaitStrategy | None = None,
+        journal: JobJournal | None = None,
+        cursor_name: str | None = None,
+    ) -> Iterator[Page]:
+        """
+        次ページリンクを辿りながらページを1枚ずつ yield するジェネレーター。
+
+        yield されたページの処理が終わってから次ページへ遷移する。
+        prefetch=True の場合、次ページリンクに href があれば2つ目のタブで先に読み込みを開始し、
+        呼び出し側が現在ページを解析している間に次ページの読み込みを並行させる。
+        （href がないボタン型の次ページはクリックで遷移）
+        メモリガバナーの上限に達した場合は、ページ送りの時点でページ/コンテキストを作り直す。
+
+        journal 指定時は、ページの処理が終わって次ページへ進むたびに次ページのURLをカーソルとして記録し、
+        再実行時はカーソルのページから再開する（最終ページまで処理済みなら何も yield しない）。
+        再開はURLで行うため、ページ番号がURLに現れないボタン型のページネーションには使えない。
+
+        Args:
+            start_url: 開始URL（省略時: 現在のページから開始）
+            next_locators: 次ページリンクのCSSセレクタ候補（get_by_role("link", name="次へ") と or_() で結合）
+            max_pages: 最大ページ数（省略時: 次ページがなくなるまで）
+            prefetch: 次ページを2つ目のタブで先読みする
+            wait: 各ページ遷移後の待機条件（省略時: self.wait_strategy）
+            journal: 途中位置を記録するジャーナル（job_journal.JobJournal）
+            cursor_name: カーソル名（省略時: start_url）
+
+        Yields:
+            現在のページ（`self.page` も同じページを指す）
+        """
+        page_count = 0
+        cursor_name = cursor_name or start_url or "pages"
+        cursor = journal.cursor(cursor_name) if journal else None
+        if cursor and cursor.finished:
+            logger.info(f"Pagination {cursor_name!r} already finished ({cursor.pages_done} pages); skipping")
+            return
+        if cursor:
+            logger.info(f"Resuming pagination {cursor_name!r} at page {cursor.pages_done + 1}: {cursor.url}")
+            start_url, page_count = cursor.url, cursor.pages_done
+        resumed_from = page_count
+
+        if start_url:
+            self.goto(start_url, wait=wait)
+
+        spare: Page | None = None
+        try:
+            while True:
+                page_count += 1
+                logger.debug(f"Page {page_count}: {self.page.url}")
+                next_btn = self._next_page_locator(self.page, next_locators)
+                has_next = (max_pages is None or page_count < max_pages) and next_btn.is_visible()
+                recycle_reason = self._recycle_reason() if has_next else None
+
+                next_url: str | None = None
+                if has_next and (prefetch or recycle_reason):
+                    href = next_btn.get_attribute("href")
+                    if href and not href.startswith(("#", "javascript:")):
+                        next_url = urljoin(self.page.url, href)
+
+                prefetched = False
+                if next_url and prefetch and not recycle_reason:
+                    if spare is None:
+                        spare = self.context.new_page()
+                        spare.set_default_timeout(self.timeout_ms)
+                    # レスポンス受信（commit）までで戻り、本文の読み込みは解析と並行させる
+                    with self.metrics.span("wait.prefetch_commit"):
+                        spare.goto(next_url, wait_until="commit")
+                    prefetched = True
+
+                yield self.page
+
+                if not has_next:
+                    if journal:
+                        journal.save_cursor(cursor_name, self.page.url, page_count, finished=True)
+                    break
+                with self.metrics.span("pagination.next", prefetched=prefetched):
+                    if recycle_reason:
+                        if spare is not None:
+                            spare.close()
+                            spare = None
+                        if next_url:
+                            # 作り直した新しいページで次ページを開く（元ページの再読み込みは不要）
+                            self.recycle(recycle_reason)
+                            self.goto(next_url, wait=wait)
+                        else:
+                            # ボタン型は現在ページでしか遷移できないため、遷移後に URL を引き継いで作り直す
+                            self._wait(self.page, next_btn.click, wait)
+                            self.recycle(recycle_reason, restore_url=True)
+                    elif prefetched and spare is not None:
+                        self._wait(spare, None, wait)
+                        self.page, spare = spare, self.page
+                        self._navigations += 1
+                    else:
+                        self._wait(self.page, next_btn.click, wait)
+                        self._navigations += 1
+                if journal:
+                    # 処理済みページ数と、次に処理するページ（遷移後の現在ページ）を記録
+                    journal.save_cursor(cursor_name, self.page.url, page_count)
+        finally:
+            if spare is not None:
+                spare.close()
+            self.metrics.increment("pages", page_count - resumed_from)
+            logger.info(f"Pagination finished after {page_count} pages")
+
+    def iter_items(
+        self,
+        item_selector: str,
+        fields: dict[str, str | tuple[str, str]] | None = None,
+        **page_kwargs: Any,
+    ) -> Iterator[dict[str, str | None]]:
+        """
+        全ページの行要素を1件ずつ yield するジェネレーター（リストに溜めない）。
+
+        Args:
+            item_selector: 行要素のCSSセレクタ（例: ".item", "table#data tbody tr"）
+            fields: `extract_rows()` と同形式のフィールド定義（省略時: {"text": 行全体のテキスト}）
+            **page_kwargs: `iter_pages()` に渡す引数（start_url, next_locators, max_pages, prefetch, wait,
+                journal, cursor_name）
+
+        Yields:
+            {フィールド名: テキストまたは属性値}（要素がない場合 None）
+        """
+        for _page in self.iter_pages(**page_kwargs):
+            # ページ単位で一括抽出（1ページ1ラウンドトリップ）し、1件ずつ yield
+            yield from self.extract_rows(item_selector, fields or {"text": ""})
+
 
 # 使用例
 if __name__ == "__main__":
-    # 環境変数読み込み
+    from dotenv import load_dotenv
+
+    # ロギング設定・環境変数読み込み
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     load_dotenv()
 
     EMAIL = os.environ.get("EMAIL", "your_email@example.com")
@@ -284,11 +1340,16 @@ if __name__ == "__main__":
 
     scraper = None
     try:
-        scraper = PlaywrightScraper(headless=True, download_dir="./downloads")
+        scraper = PlaywrightScraper(
+            headless=True,
+            download_dir="./downloads",
+            storage_state_path="./.auth/storage_state.json",
+            browser_endpoint="auto",  # `browser_server.py start` 済みなら常駐ブラウザへ接続
+        )
         scraper.launch()
 
-        # ログイン（Locatorベース）
-        scraper.login(
+        # ログイン（Locatorベース・セッションキャッシュが有効なら省略）
+        scraper.ensure_login(
             url="https://example.com/login",  # 実際のURLに置き換えてください
             email_locator='input[name="email"]',
             password_locator='input[name="password"]',  # noqa: S106 # nosec B106 - CSSセレクタであり実パスワードではない
@@ -315,5 +1376,7 @@ if __name__ == "__main__":
     finally:
         if scraper:
             scraper.close()
+            # 処理時間レポート（ホットスポットの特定用）
+            scraper.metrics.export_json("scrape_log.json")
 
     logger.info("Script completed successfully")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Batch Detector - 複数のHTMLファイルからセレクタ候補をまとめて抽出
+
+ディレクトリ（配下の *.html / *.htm）または glob パターンに一致するファイルを
+プロセスプールで並列に `SelectorDetector.detect_all()` し、1ファイル1行の JSONL として逐次書き出す。
+前回の出力 JSONL に同じ内容ハッシュ（SHA-256）・同じパーサーの結果があるファイルは解析を省略し、前回の結果を引き継ぐ。
+
+出力の各行（追加キーワードがある場合は "keywords" も記録し、キーワードが変わったファイルは検出し直す）:
+    {"file": "snapshots/a.html", "sha256": "...", "parser": "lxml-native", "selectors": {...}}
+    {"file": "snapshots/b.html", "sha256": "...", "parser": "lxml-native", "error": "..."}  # 失敗（次回は再実行）
+
+使用方法:
+    python selector_detector.py snapshots/ --output selectors.jsonl --parser lxml-native
+    python selector_detector.py "snapshots/**/*.html" --workers 8
+
+    from batch_detector import detect_batch
+    result = detect_batch("snapshots/", "selectors.jsonl", parser="lxml-native")
+
+依存:
+    - beautifulsoup4
+    - lxml（--parser lxml / lxml-native の場合）
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from result_sink import ResultSink
+from selector_detector import DEFAULT_KEYWORDS, SelectorDetector
+
+logger = logging.getLogger(__name__)
+
+# ディレクトリ指定時の対象拡張子
+HTML_SUFFIXES = (".html", ".htm")
+
+# 1ワーカーあたりの処理待ちファイル数（全ファイルを一度に投入せず、メモリ使用量を抑える）
+_PENDING_PER_WORKER = 4
+
+# 内容ハッシュの読み込み単位（ファイル全体を読み込まずにハッシュする）
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class BatchResult:
+    """一括検出の集計結果"""
+
+    output: Path
+    detected: int = 0
+    skipped: int = 0  # 内容ハッシュが前回と同じため前回の結果を引き継いだファイル数
+    failed: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """対象ファイル数"""
+        return self.detected + self.skipped + self.failed
+
+
+def is_batch_target(target: str) -> bool:
+    """ディレクトリまたは glob パターンか（単一ファイルでない）"""
+    return Path(target).is_dir() or glob.has_magic(target)
+
+
+def iter_html_files(target: str) -> Iterator[Path]:
+    """
+    対象のHTMLファイルをパス順に列挙。
+
+    Args:
+        target: ディレクトリ（配下の *.html / *.htm を再帰的に対象とする）または glob パターン（** 可）
+    """
+    root = Path(target)
+    if root.is_dir():
+        paths = (path for path in root.rglob("*") if path.suffix.lower() in HTML_SUFFIXES)
+    else:
+        paths = (Path(path) for path in glob.iglob(target, recursive=True))
+    yield from sorted(path for path in paths if path.is_file())
+
+
+def load_previous(output: str | Path) -> dict[str, dict[str, Any]]:
+    """
+    前回の出力 JSONL から、検出に成功したファイルの行を読み込む。
+
+    Returns:
+        ファイルパス -> 出力行（出力がなければ空）
+    """
+    output = Path(output)
+    previous: dict[str, dict[str, Any]] = {}
+    if not output.exists():
+        return previous
+    with output.open("r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring malformed line {line_number} in {output}")
+                continue
+            if "selectors" in record:
+                previous[record["file"]] = record
+    return previous
+
+
+def hash_file(path: str | Path) -> str:
+    """ファイル内容の SHA-256（16進）をチャンク単位で計算（`change_tracker.hash_content()` と同じ値）"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _detect_file(
+    path: str, parser: str, stream: bool, extra: dict[str, list[str]], previous_hash: str | None
+) -> dict[str, Any]:
+    """
+    ワーカープロセスで1ファイルを検出（内部用）。
+
+    内容ハッシュが previous_hash と一致する場合は解析せず、{"unchanged": True} を返す。
+    """
+    digest = hash_file(path)
+    if digest == previous_hash:
+        return {"unchanged": True}
+    record: dict[str, Any] = {"file": path, "sha256": digest, "parser": "stream" if stream else parser}
+    keywords = DEFAULT_KEYWORDS
+    if extra:
+        record["keywords"] = extra
+        keywords = DEFAULT_KEYWORDS.extended(extra)
+    if stream:
+        from streaming_detector import detect_stream
+
+        record["selectors"] = detect_stream(path, keywords=keywords)  # ファイル全体は読み込まない
+    else:
+        html = Path(path).read_bytes().decode("utf-8")
+        record["selectors"] = SelectorDetector(html, parser=parser, keywords=keywords).detect_all()
+    return record
+
+
+def detect_batch(
+    target: str,
+    output: str | Path,
+    parser: str = "html.parser",
+    workers: int | None = None,
+    stream: bool = False,
+    force: bool = False,
+    keywords: Mapping[str, Iterable[str]] | None = None,
+) -> BatchResult:
+    """
+    複数のHTMLファイルからセレクタ候補を並列に検出し、JSONL に書き出す。
+
+    出力は一時ファイルに書き、完了後に置き換える（途中で失敗しても前回の出力は残る）。
+
+    Args:
+        target: ディレクトリまたは glob パターン
+        output: 出力 JSONL（前回の出力があれば、内容の変わっていないファイルの結果を引き継ぐ）
+        parser: パーサー（`SelectorDetector` と同じ）
+        workers: ワーカープロセス数（省略時: CPU コア数）
+        stream: `detect_stream()` で逐次検出（巨大なファイル向け、parser は無視）
+        force: 前回の結果を使わず、全ファイルを検出し直す
+        keywords: 追加キーワード（カテゴリ -> キーワード。`DetectionKeywords.extended()` と同じ）
+
+    Returns:
+        集計結果
+
+    Raises:
+        ValueError: 未知のキーワードカテゴリ
+    """
+    started = time.perf_counter()
+    output = Path(output)
+    result = BatchResult(output=output)
+    previous = {} if force else load_previous(output)
+    mode = "stream" if stream else parser
+    # 追加キーワードは各ワーカーで照合器を作る（出力の記録・前回との比較にも使うため、素の辞書で渡す）
+    extra = {category: list(words) for category, words in sorted((keywords or {}).items()) if words}
+    DEFAULT_KEYWORDS.extended(extra)  # カテゴリを事前に検証
+    workers = workers or os.cpu_count() or 1
+
+    tmp_output = output.with_name(output.name + ".tmp")
+    with ResultSink(tmp_output, format="jsonl") as sink, ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: dict[Future[dict[str, Any]], str] = {}
+
+        def collect(done: set[Future[dict[str, Any]]]) -> None:
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    record = future.result()
+                except Exception as e:
+                    logger.error(f"Selector detection failed: {path}. Error: {e}")
+                    sink.write({"file": path, "parser": mode, "error": str(e)})
+                    result.failed += 1
+                    continue
+                if record.get("unchanged"):
+                    sink.write(previous[path])
+                    result.skipped += 1
+                else:
+                    sink.write(record)
+                    result.detected += 1
+
+        for path in map(str, iter_html_files(target)):
+            if len(pending) >= workers * _PENDING_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            last = previous.get(path)
+            previous_hash = None
+            if last and last.get("parser") == mode and last.get("keywords", {}) == extra:
+                previous_hash = last["sha256"]
+            pending[executor.submit(_detect_file, path, parser, stream, extra, previous_hash)] = path
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    os.replace(tmp_output, output)
+    result.elapsed_s = time.perf_counter() - started
+    logger.info(
+        f"Batch detection finished: {result.total} files ({result.detected} detected, "
+        f"{result.skipped} unchanged, {result.failed} failed) in {result.elapsed_s:.1f}s"
+    )
+    return result
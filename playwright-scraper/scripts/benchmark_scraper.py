@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmark - PlaywrightScraper の処理時間を計測
+
+extract: 値ごとの `get_text()` 呼び出しと、`extract_rows()` / `extract_table()` による
+         一括抽出のブラウザ往復回数・処理時間を比較する。
+flow:    `login` → `get_text` → `download_file` の一連の処理をステップごとに計測する。
+         ローカルのフィクスチャサーバー、または記録済み HAR の再生に対して実行するため、
+         実サイトにアクセスせず再現性のある計測ができる。
+
+使用方法:
+    python benchmark_scraper.py extract --rows 500 --cols 5
+
+    # フィクスチャサーバーに対して計測（--har-mode record で通信を HAR に記録）
+    python benchmark_scraper.py flow --iterations 5 --har flow.har --har-mode record
+    # 記録した HAR を再生して計測（サーバーは起動しない）
+    python benchmark_scraper.py flow --iterations 5 --har flow.har --har-mode replay
+
+依存:
+    - playwright
+    - python-dotenv
+"""
+
+import argparse
+import logging
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Literal
+
+from basic_scraper import PlaywrightScraper
+
+logger = logging.getLogger(__name__)
+
+
+def _build_table_html(rows: int, cols: int) -> str:
+    """rows × cols のテーブルを持つHTMLを生成"""
+    header = "".join(f"<th>col{c}</th>" for c in range(cols))
+    body = "".join(
+        "<tr>" + "".join(f"<td class='c{c}'>r{r}c{c}</td>" for c in range(cols)) + "</tr>" for r in range(rows)
+    )
+    return f"<html><body><table id='data'><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table></body></html>"
+
+
+def _timed(func: Callable[[], Any]) -> tuple[float, Any]:
+    """func の実行時間（秒）と戻り値を返す"""
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def bench_extract(rows: int, cols: int) -> None:
+    """値ごとの取得と一括抽出を比較"""
+    scraper = PlaywrightScraper(headless=True)
+    scraper.launch()
+    try:
+        scraper.page.set_content(_build_table_html(rows, cols))
+
+        def per_call() -> list[list[str]]:
+            # get_text() は wait_for + text_content で値ごとに2往復
+            return [
+                [scraper.get_text(f"#data tbody tr:nth-child({r + 1}) td.c{c}") for c in range(cols)]
+                for r in range(rows)
+            ]
+
+        fields: dict[str, str | tuple[str, str]] = {f"col{c}": f"td.c{c}" for c in range(cols)}
+        results = [
+            ("get_text() per cell", rows * cols * 2, *_timed(per_call)),
+            ("extract_rows()", 1, *_timed(lambda: scraper.extract_rows("#data tbody tr", fields))),
+            ("extract_table()", 2, *_timed(lambda: scraper.extract_table("#data"))),
+        ]
+    finally:
+        scraper.close()
+
+    baseline = results[0][2]
+    print(f"\nTable: {rows} rows x {cols} cols ({rows * cols} cells)")
+    print(f"{'method':<22}{'round trips':>12}{'time (ms)':>12}{'speedup':>10}")
+    for name, round_trips, elapsed, records in results:
+        assert len(records) == rows, f"{name}: unexpected row count {len(records)}"
+        print(f"{name:<22}{round_trips:>12}{elapsed * 1000:>12.1f}{baseline / elapsed:>9.1f}x")
+
+
+_FIXTURE_PAGES: dict[str, tuple[str, bytes, dict[str, str]]] = {
+    "/login": (
+        "text/html; charset=utf-8",
+        """<html><body><form action="/home" method="get">
+<label>メールアドレス <input name="email" type="email"></label>
+<label>パスワード <input name="password" type="password"></label>
+<button type="submit">ログイン</button>
+</form></body></html>""".encode(),
+        {},
+    ),
+    "/home": (
+        "text/html; charset=utf-8",
+        """<html><body><h1 class="welcome-message">ようこそ</h1>
+<a id="download" href="/files/data.csv" download>データダウンロード</a>
+</body></html>""".encode(),
+        {},
+    ),
+    "/files/data.csv": (
+        "text/csv",
+        b"date,value\n" + b"".join(f"2024-01-{d:02d},{d * 10}\n".encode() for d in range(1, 29)),
+        {"Content-Disposition": "attachment; filename=data.csv"},
+    ),
+}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """ログイン → トップ → ダウンロードのフィクスチャサイト"""
+
+    def do_GET(self) -> None:
+        page = _FIXTURE_PAGES.get(self.path.split("?", 1)[0])
+        if page is None:
+            self.send_error(404)
+            return
+        content_type, body, headers = page
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def fixture_server(port: int) -> Iterator[str]:
+    """フィクスチャサーバーを別スレッドで起動し、ベースURLを返す"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_flow(
+    iterations: int,
+    port: int,
+    har_path: str | None,
+    har_mode: Literal["record", "replay"] | None,
+) -> None:
+    """login → get_text → download_file をステップごとに計測"""
+    base_url = f"http://127.0.0.1:{port}"
+    steps = ["login", "get_text", "download_file"]
+
+    def run_flow() -> None:
+        with tempfile.TemporaryDirectory() as download_dir:
+            scraper = PlaywrightScraper(headless=True, download_dir=download_dir, har_path=har_path, har_mode=har_mode)
+            scraper.launch()
+            try:
+                for _ in range(iterations):
+                    scraper.login(
+                        url=f"{base_url}/login",
+                        email="bench@example.com",
+                        password="bench",  # nosec B106 - フィクスチャ用のダミー値
+                        success_locator=".welcome-message",
+                    )
+                    scraper.get_text("h1")
+                    scraper.download_file(link_locator="a#download")
+            finally:
+                scraper.close()
+            report = scraper.metrics.report()
+
+        print(f"\nFlow: {iterations} iterations ({'HAR ' + har_mode if har_mode else 'fixture server'})")
+        print(f"{'step':<16}{'count':>8}{'mean (ms)':>12}{'p95 (ms)':>12}{'max (ms)':>12}")
+        for name in [*steps, *(name for name in report["spans"] if name.startswith("wait."))]:
+            stats = report["spans"].get(name)
+            if stats:
+                print(
+                    f"{name:<16}{stats['count']:>8}{stats['mean_s'] * 1000:>12.1f}"
+                    f"{stats['p95_s'] * 1000:>12.1f}{stats['max_s'] * 1000:>12.1f}"
+                )
+
+    if har_mode == "replay":
+        # 再生時はサーバーを起動せず、HAR の応答だけで実行できることを確認する
+        run_flow()
+    else:
+        with fixture_server(port):
+            run_flow()
+
+
+def main() -> None:
+    """コマンドラインインターフェース"""
+    parser = argparse.ArgumentParser(description="PlaywrightScraper のベンチマーク")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract = subparsers.add_parser("extract", help="値ごとの取得と一括抽出を比較")
+    extract.add_argument("--rows", type=int, default=500, help="行数（デフォルト: 500）")
+    extract.add_argument("--cols", type=int, default=5, help="列数（デフォルト: 5）")
+
+    flow = subparsers.add_parser("flow", help="login → get_text → download_file をステップごとに計測")
+    flow.add_argument("--iterations", type=int, default=5, help="繰り返し回数（デフォルト: 5）")
+    flow.add_argument("--port", type=int, default=8765, help="フィクスチャサーバーのポート（デフォルト: 8765）")
+    flow.add_argument("--har", help="HAR ファイルのパス")
+    flow.add_argument("--har-mode", choices=["record", "replay"], help="HAR の記録/再生")
+
+    args = parser.parse_args()
+    logging.getLogger("basic_scraper").setLevel(logging.WARNING)
+
+    if args.command == "extract":
+        bench_extract(args.rows, args.cols)
+    elif args.command == "flow":
+        if args.har_mode and not args.har:
+            parser.error("--har-mode requires --har")
+        bench_flow(args.iterations, args.port, args.har, args.har_mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Selector Detector Benchmark - SelectorDetector の処理時間とツリー走査回数を計測
+
+数 MB の合成ページ（フォーム・リンク・テーブル・入力欄の繰り返し）に対して、
+HTML 解析・インデックス作成・`detect_all()` の時間と、部分木の走査（`find_all()` / `get_text()`）の回数を出力する。
+`detect_all()` はインデックス作成時の1回の走査だけで完了し、検出中の走査は 0 回になる（テキストも走査時に作成済み）。
+
+--compare-parsers: パーサー（html.parser / lxml / lxml-native）ごとに新しいプロセスで解析〜検出を実行し、
+                   処理時間とピークメモリ（最大常駐メモリの増分）を比較する。
+
+使用方法:
+    python benchmark_selector_detector.py --size-mb 5 --iterations 3
+    python benchmark_selector_detector.py --html page.html   # 実際のページで計測
+    python benchmark_selector_detector.py --size-mb 20 --compare-parsers
+
+依存:
+    - beautifulsoup4
+    - lxml（lxml / lxml-native を計測する場合）
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from selector_detector import PARSERS, SelectorDetector
+
+_BLOCK = """<section class="card item-{i}">
+<h2 class="title">Item {i}</h2>
+<a class="detail" href="/items/{i}">詳細 {i}</a>
+<a href="/export/{i}.csv">CSV export {i}</a>
+<form class="filter"><input type="text" name="q{i}" placeholder="検索"><input type="checkbox" name="f{i}">
+<button type="button">絞り込み</button></form>
+<table class="data"><tr><th>Date</th><th>Value</th><th>Status</th></tr>
+<tr><td>2024-01-{d:02d}</td><td>{i}</td><td>ok</td></tr><tr><td>2024-02-{d:02d}</td><td>{i}</td><td>ng</td></tr></table>
+</section>
+"""
+
+_LOGIN = """<form id="loginForm"><input type="email" id="email" name="email">
+<input type="password" id="password" name="password"><button type="submit">Log in</button></form>
+<a class="pager" href="?page=2">Next</a>
+"""
+
+
+def build_page(size_mb: float, nest_every: int = 100) -> str:
+    """
+    size_mb 程度の合成ページを生成。
+
+    ASP.NET 等で見られる全体を囲む form と、入れ子のレイアウト用テーブル（nest_every ブロックごとに1段）を含む。
+    ログインフォームは末尾に置き、検出に全体の探索を要する。
+    """
+    target = int(size_mb * 1024 * 1024)
+    blocks: list[str] = []
+    size = 0
+    depth = 0
+    i = 0
+    while size < target:
+        if i % nest_every == 0:
+            blocks.append('<table class="layout"><tr><td>')
+            depth += 1
+        block = _BLOCK.format(i=i, d=i % 28 + 1)
+        blocks.append(block)
+        size += len(block.encode())
+        i += 1
+    blocks.append("</td></tr></table>" * depth)
+    return f'<html><body><form id="aspnetForm">{"".join(blocks)}</form>{_LOGIN}</body></html>'
+
+
+@contextmanager
+def count_traversals() -> Iterator[list[int]]:
+    """この範囲内の部分木の走査（`find_all()` や `get_text()` が内部で使う `Tag.descendants`）を数える"""
+    counter = [0]
+    original = Tag.descendants
+
+    def counting(self: Tag) -> Any:
+        counter[0] += 1
+        return original.fget(self)  # type: ignore[attr-defined]
+
+    Tag.descendants = property(counting)  # type: ignore[assignment,method-assign]
+    try:
+        yield counter
+    finally:
+        Tag.descendants = original  # type: ignore[method-assign]
+
+
+def _timed(func: Callable[[], Any]) -> tuple[float, Any]:
+    """func の実行時間（秒）と戻り値を返す"""
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def bench(html: str, iterations: int, parser: str = "html.parser") -> None:
+    """解析・インデックス作成・detect_all() の処理時間と走査回数を計測"""
+    parse_s: list[float] = []
+    index_s: list[float] = []
+    detect_s: list[float] = []
+    index_traversals = detect_traversals = 0
+    result: dict[str, Any] = {}
+    for _ in range(iterations):
+        with count_traversals() as counter:
+            if parser == "lxml-native":
+                # BeautifulSoup のツリーを作らず、解析しながらインデックスを作成する
+                elapsed, detector = _timed(lambda: SelectorDetector(html, parser=parser))
+            else:
+                elapsed, soup = _timed(lambda: BeautifulSoup(html, parser))
+                parse_s.append(elapsed)
+                elapsed, detector = _timed(lambda: SelectorDetector(soup))  # noqa: B023 - 直後に呼び出す
+        index_s.append(elapsed)
+        # lxml-native は BeautifulSoup の走査を使わないため、インデックス自身の走査回数を使う
+        index_traversals = detector.index.traversals if parser == "lxml-native" else counter[0]
+
+        with count_traversals() as counter:
+            elapsed, result = _timed(detector.detect_all)
+        detect_s.append(elapsed)
+        detect_traversals = counter[0]
+
+    elements = sum(len(elements) for elements in detector.index.by_tag.values())
+    print(f"\nPage: {len(html.encode()) / 1024 / 1024:.1f} MB, {elements} elements, {iterations} iterations ({parser})")
+    print(f"{'phase':<14}{'median (ms)':>14}{'traversals':>12}")
+    parse_ms = f"{statistics.median(parse_s) * 1000:.1f}" if parse_s else "-"
+    print(f"{'parse':<14}{parse_ms:>14}{'-':>12}")
+    print(f"{'index':<14}{statistics.median(index_s) * 1000:>14.1f}{index_traversals:>12}")
+    print(f"{'detect_all':<14}{statistics.median(detect_s) * 1000:>14.1f}{detect_traversals:>12}")
+    print("Detected: " + ", ".join(f"{key}={len(value)}" for key, value in result.items()))
+
+
+def _measure_parser(html_path: str, parser: str, iterations: int) -> dict[str, Any]:
+    """
+    新しいプロセスで解析〜検出を実行し、処理時間とピークメモリを計測（内部用）。
+
+    ピークメモリは HTML の読み込み後を基準とした最大常駐メモリ（ru_maxrss）の増分。
+    """
+    with contextlib.suppress(ImportError):
+        import lxml.html  # noqa: F401 - import 自体のメモリを計測から除く
+
+    html = Path(html_path).read_text(encoding="utf-8")
+    # ru_maxrss の単位は Linux: KB、macOS: バイト
+    scale = 1 if sys.platform == "darwin" else 1024
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    build_s: list[float] = []
+    detect_s: list[float] = []
+    result: dict[str, Any] = {}
+    for _ in range(iterations):
+        elapsed, detector = _timed(lambda: SelectorDetector(html, parser=parser))
+        build_s.append(elapsed)
+        elapsed, result = _timed(detector.detect_all)
+        detect_s.append(elapsed)
+        del detector
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return {
+        "build_s": statistics.median(build_s),
+        "detect_s": statistics.median(detect_s),
+        "peak_mb": (peak - baseline) / 1024 / 1024,
+        "digest": hashlib.sha256(json.dumps(result, sort_keys=True).encode()).hexdigest(),
+    }
+
+
+def compare_parsers(html: str, iterations: int, parsers: Sequence[str] = PARSERS) -> None:
+    """パーサーごとの処理時間とピークメモリを比較（パーサーごとに新しいプロセスで計測）"""
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        html_path = Path(tmp) / "page.html"
+        html_path.write_text(html, encoding="utf-8")
+        results: dict[str, dict[str, Any]] = {}
+        for parser in parsers:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results[parser] = executor.submit(_measure_parser, str(html_path), parser, iterations).result()
+
+    baseline = results[parsers[0]]["build_s"] + results[parsers[0]]["detect_s"]
+    print(f"\nPage: {len(html.encode()) / 1024 / 1024:.1f} MB, {iterations} iterations (median)")
+    print(f"{'parser':<14}{'parse+index (ms)':>18}{'detect (ms)':>13}{'peak RSS (MB)':>15}{'speedup':>10}")
+    for parser, result in results.items():
+        total = result["build_s"] + result["detect_s"]
+        print(
+            f"{parser:<14}{result['build_s'] * 1000:>18.1f}{result['detect_s'] * 1000:>13.1f}"
+            f"{result['peak_mb']:>15.1f}{baseline / total:>9.1f}x"
+        )
+    identical = len({result["digest"] for result in results.values()}) == 1
+    # 不正な HTML の補正方法はパーサーごとに異なるため、結果が一致しない場合がある
+    print(f"Results identical across parsers: {'yes' if identical else 'no'}")
+
+
+def main() -> None:
+    """コマンドラインインターフェース"""
+    parser = argparse.ArgumentParser(description="SelectorDetector のベンチマーク")
+    parser.add_argument("--size-mb", type=float, default=5.0, help="合成ページのサイズ（MB、デフォルト: 5）")
+    parser.add_argument("--html", help="計測に使うHTMLファイル（指定時は合成ページを使わない）")
+    parser.add_argument("--iterations", type=int, default=3, help="繰り返し回数（デフォルト: 3）")
+    parser.add_argument("--parser", choices=PARSERS, default="html.parser", help="パーサー（デフォルト: html.parser）")
+    parser.add_argument(
+        "--compare-parsers", action="store_true", help="全パーサーの処理時間・ピークメモリを別プロセスで計測して比較"
+    )
+    args = parser.parse_args()
+
+    html = Path(args.html).read_text(encoding="utf-8") if args.html else build_page(args.size_mb)
+    if args.compare_parsers:
+        compare_parsers(html, args.iterations)
+    else:
+        bench(html, args.iterations, args.parser)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - ブラウザを起動したまま BrowserContext を貸し出す
+
+Playwright ドライバー・Chromium の起動は1回だけ行い、ジョブごとに
+隔離された `BrowserContext` をチェックアウトする。短いジョブを大量に
+処理するバッチで起動コストを償却するために使用。
+
+使用方法:
+    with BrowserPool(size=2) as pool:
+        for job in jobs:
+            with pool.checkout() as context:
+                page = context.pages[0] if context.pages else context.new_page()
+                ...
+        logger.info(pool.stats())
+
+注意:
+    sync API はスレッドセーフではないため、プールは作成したスレッドからのみ使用すること。
+
+依存:
+    - playwright
+"""
+
+import logging
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+try:
+    from playwright.sync_api import Browser, BrowserContext, Playwright, sync_playwright
+except ImportError:
+    print("Error: playwright not installed. Run: pip install playwright")
+    sys.exit(1)
+
+if TYPE_CHECKING:
+    from typing import Self
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """
+    プール統計。
+
+    チェックアウト数に上限はなく `acquire()` は空きを待たないため、
+    `*_checkout_s` はコンテキストの作成（再利用時は取り出し）にかかった時間を表す。
+    """
+
+    browsers: int
+    idle_contexts: int
+    in_use: int
+    checkouts: int
+    browser_launches: int
+    contexts_created: int
+    contexts_reused: int
+    total_checkout_s: float
+    max_checkout_s: float
+
+    @property
+    def avg_checkout_s(self) -> float:
+        """チェックアウト1回あたりの平均所要時間（秒）"""
+        return self.total_checkout_s / self.checkouts if self.checkouts else 0.0
+
+
+class BrowserPool:
+    """起動済みブラウザから BrowserContext を払い出すプール"""
+
+    def __init__(
+        self,
+        size: int = 1,
+        headless: bool = True,
+        timeout_ms: int = 30000,
+        reuse_contexts: bool = False,
+        max_idle_contexts: int = 4,
+        context_options: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        初期化。
+
+        Args:
+            size: 起動しておくブラウザ数（コンテキストはラウンドロビンで割り当て）
+            headless: ヘッドレスモード（GUI非表示）
+            timeout_ms: コンテキストのデフォルトタイムアウト（ミリ秒）
+            reuse_contexts: 返却されたコンテキストをリセットして再利用する。
+                Cookie・権限・ページはリセットされるが localStorage 等は残るため、
+                同一サイト・同一アカウントのジョブ間でのみ有効にすること
+            max_idle_contexts: 再利用のために保持するコンテキスト数の上限
+            context_options: `new_context()` に渡すデフォルトオプション
+        """
+        if size < 1:
+            raise ValueError(f"size must be >= 1: {size}")
+
+        self.size = size
+        self.headless = headless
+        self.timeout_ms = timeout_ms
+        self.reuse_contexts = reuse_contexts
+        self.max_idle_contexts = max_idle_contexts
+        self.context_options = context_options or {}
+
+        self.playwright: Playwright | None = None
+        self.browsers: list[Browser] = []
+        self._idle: list[BrowserContext] = []
+        self._in_use: set[BrowserContext] = set()
+        self._custom: set[BrowserContext] = set()
+        self._next_browser = 0
+
+        self._checkouts = 0
+        self._browser_launches = 0
+        self._contexts_created = 0
+        self._contexts_reused = 0
+        self._total_checkout_s = 0.0
+        self._max_checkout_s = 0.0
+
+    def start(self) -> None:
+        """Playwright を起動し、ブラウザを `size` 個ウォームアップ"""
+        if self.playwright is not None:
+            return
+        self.playwright = sync_playwright().start()
+        self.browsers = [self._launch_browser() for _ in range(self.size)]
+        logger.info(f"Browser pool started (browsers: {self.size})")
+
+    def close(self) -> None:
+        """全コンテキスト・ブラウザを終了"""
+        for context in [*self._idle, *self._in_use]:
+            try:
+                context.close()
+            except Exception:
+                logger.debug("Failed to close pooled context", exc_info=True)
+        self._idle.clear()
+        self._in_use.clear()
+        self._custom.clear()
+        for browser in self.browsers:
+            if browser.is_connected():
+                browser.close()
+        self.browsers = []
+        if self.playwright:
+            self.playwright.stop()
+            self.playwright = None
+        logger.info(f"Browser pool closed: {self.stats()}")
+
+    def __enter__(self) -> "Self":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def acquire(self, **context_options: Any) -> BrowserContext:
+        """
+        コンテキストを取得。
+
+        オプション指定なしかつ再利用可能なコンテキストがあればそれを返し、
+        なければ起動済みブラウザに新しいコンテキストを作成する。
+
+        Args:
+            **context_options: `new_context()` への追加オプション（storage_state 等）
+
+        Returns:
+            BrowserContext（使用後は `release()` で返却）
+        """
+        self.start()
+        started = time.perf_counter()
+
+        if self._idle and not context_options:
+            context = self._idle.pop()
+            self._contexts_reused += 1
+        else:
+            options = {**self.context_options, **context_options}
+            context = self._pick_browser().new_context(**options)
+            context.set_default_timeout(self.timeout_ms)
+            self._contexts_created += 1
+            if context_options:
+                # 個別オプション（storage_state 等）付きのコンテキストは他ジョブへ使い回さない
+                self._custom.add(context)
+
+        checkout_s = time.perf_counter() - started
+        self._checkouts += 1
+        self._total_checkout_s += checkout_s
+        self._max_checkout_s = max(self._max_checkout_s, checkout_s)
+        self._in_use.add(context)
+        logger.debug(f"Context checked out in {checkout_s * 1000:.1f} ms")
+        return context
+
+    def release(self, context: BrowserContext) -> None:
+        """
+        コンテキストを返却。
+
+        再利用が有効かつ空きがあればリセットして保持し、それ以外は閉じる。
+
+        Args:
+            context: `acquire()` で取得したコンテキスト
+        """
+        self._in_use.discard(context)
+        custom = context in self._custom
+        self._custom.discard(context)
+        if self.reuse_contexts and not custom and len(self._idle) < self.max_idle_contexts:
+            try:
+                self._reset(context)
+                self._idle.append(context)
+                return
+            except Exception:
+                logger.warning("Failed to reset context; discarding it", exc_info=True)
+        try:
+            context.close()
+        except Exception:
+            logger.debug("Failed to close context", exc_info=True)
+
+    @contextmanager
+    def checkout(self, **context_options: Any) -> Iterator[BrowserContext]:
+        """
+        `acquire()` / `release()` を with ブロックで管理。
+
+        Args:
+            **context_options: `new_context()` への追加オプション
+
+        Yields:
+            BrowserContext
+        """
+        context = self.acquire(**context_options)
+        try:
+            yield context
+        finally:
+            self.release(context)
+
+    def stats(self) -> PoolStats:
+        """現在のプール統計を返す"""
+        return PoolStats(
+            browsers=len(self.browsers),
+            idle_contexts=len(self._idle),
+            in_use=len(self._in_use),
+            checkouts=self._checkouts,
+            browser_launches=self._browser_launches,
+            contexts_created=self._contexts_created,
+            contexts_reused=self._contexts_reused,
+            total_checkout_s=self._total_checkout_s,
+            max_checkout_s=self._max_checkout_s,
+        )
+
+    def _launch_browser(self) -> Browser:
+        """ブラウザを1つ起動（内部用）"""
+        assert self.playwright is not None
+        browser = self.playwright.chromium.launch(headless=self.headless)
+        self._browser_launches += 1
+        return browser
+
+    def _pick_browser(self) -> Browser:
+        """ラウンドロビンでブラウザを選択。切断済みなら再起動（内部用）"""
+        index = self._next_browser % len(self.browsers)
+        self._next_browser += 1
+        if not self.browsers[index].is_connected():
+            logger.warning(f"Pooled browser #{index} disconnected; relaunching")
+            self.browsers[index] = self._launch_browser()
+        return self.browsers[index]
+
+    def _reset(self, context: BrowserContext) -> None:
+        """再利用前にコンテキストをリセット（ページは1枚だけ about:blank で残す）"""
+        context.unroute_all(behavior="ignoreErrors")
+        context.clear_cookies()
+        context.clear_permissions()
+        pages = context.pages
+        for page in pages[1:]:
+            page.close()
+        if pages:
+            pages[0].goto("about:blank")
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Browser Server - 常駐ブラウザによる CLI 起動の高速化
+
+cron やエージェントから短いスクレイピングを繰り返し実行すると、毎回 Chromium の起動に数秒かかる。
+Chromium をリモートデバッグポート付きで常駐させ、`PlaywrightScraper(browser_endpoint="auto")` が
+起動済みのブラウザへ CDP で接続（`connect_over_cdp`）して新しいコンテキストだけを作るようにする。
+
+Python 版 Playwright には `launch_server()` がなく、`playwright run-server` は接続ごとにブラウザを
+起動するため、ブラウザ自体を常駐させる CDP 接続を使う（Chromium のみ）。
+コンテキストは実行ごとに作成・破棄されるため、Cookie 等は実行間で共有されない。
+
+使用方法:
+    python browser_server.py start --port 9222   # 常駐ブラウザを起動
+    python browser_server.py status
+    python basic_scraper.py                       # 起動済みなら接続（なければ通常起動）
+    python browser_server.py stop
+
+依存:
+    - playwright
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 起動中のサーバー情報（接続先・PID）の保存先
+DEFAULT_STATE_PATH = Path.home() / ".cache" / "playwright-scraper" / "browser_server.json"
+
+
+def _probe(endpoint: str, timeout_s: float) -> bool:
+    """CDP エンドポイントが応答するか確認（内部用）"""
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout_s) as response:  # nosec B310 - ローカルの http のみ
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def server_endpoint(state_path: str | Path = DEFAULT_STATE_PATH, timeout_s: float = 0.5) -> str | None:
+    """
+    起動中の常駐ブラウザの接続先を返す。
+
+    Args:
+        state_path: サーバー情報の保存先
+        timeout_s: 応答確認のタイムアウト（秒）
+
+    Returns:
+        CDP エンドポイント（例: "http://127.0.0.1:9222"）。起動していなければ None
+    """
+    path = Path(state_path)
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    endpoint = state.get("endpoint")
+    if endpoint and _probe(endpoint, timeout_s):
+        return str(endpoint)
+    return None
+
+
+def start_server(
+    port: int = 9222,
+    headless: bool = True,
+    state_path: str | Path = DEFAULT_STATE_PATH,
+    startup_timeout_s: float = 30.0,
+) -> str:
+    """
+    常駐ブラウザを起動（起動済みならその接続先を返す）。
+
+    Args:
+        port: リモートデバッグポート（127.0.0.1 のみで待ち受け）
+        headless: ヘッドレスで起動
+        state_path: サーバー情報の保存先
+        startup_timeout_s: 起動待ちのタイムアウト（秒）
+
+    Returns:
+        CDP エンドポイント
+
+    Raises:
+        RuntimeError: タイムアウトまでに応答しない
+    """
+    state_path = Path(state_path)
+    existing = server_endpoint(state_path)
+    if existing:
+        logger.info(f"Browser server already running: {existing}")
+        return existing
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print("Error: playwright not installed. Run: pip install playwright")
+        sys.exit(1)
+    with sync_playwright() as p:
+        executable = p.chromium.executable_path
+
+    user_data_dir = state_path.parent / f"profile-{port}"
+    user_data_dir.mkdir(parents=True, exist_ok=True)
+    args = [
+        executable,
+        f"--remote-debugging-port={port}",
+        "--remote-debugging-address=127.0.0.1",
+        f"--user-data-dir={user_data_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ]
+    if headless:
+        args.append("--headless=new")
+    args.append("about:blank")
+
+    # 呼び出し元の終了後も動き続けるよう、別セッションで起動
+    process = subprocess.Popen(  # nosec B603 - Playwright 管理下の Chromium を固定引数で起動
+        args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    endpoint = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + startup_timeout_s
+    while not _probe(endpoint, 0.5):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError(f"Browser server did not start on port {port} (exit code: {process.poll()})")
+        time.sleep(0.1)
+
+    state = {
+        "endpoint": endpoint,
+        "pid": process.pid,
+        "user_data_dir": str(user_data_dir),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    state_path.write_text(json.dumps(state), encoding="utf-8")
+    logger.info(f"Browser server started: {endpoint} (pid {process.pid})")
+    return endpoint
+
+
+def _command_line(pid: int) -> list[str] | None:
+    """プロセスのコマンドライン（取得できなければ None）（内部用）"""
+    try:
+        return Path(f"/proc/{pid}/cmdline").read_bytes().decode(errors="replace").split("\0")
+    except OSError:
+        pass
+    try:
+        # /proc のない macOS 等
+        completed = subprocess.run(  # nosec B603 B607 - 固定引数の ps
+            ["ps", "-o", "command=", "-p", str(pid)], capture_output=True, text=True, timeout=5, check=False
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.split() if completed.returncode == 0 else None
+
+
+def _is_server_process(pid: int, user_data_dir: str) -> bool:
+    """
+    PID が start_server() で起動した Chromium か確認（内部用）。
+
+    状態ファイルが古いと PID が別のプロセスに再利用されている場合があるため、
+    専用プロファイル（--user-data-dir）で起動されたプロセスかをコマンドラインで確かめる。
+    """
+    command_line = _command_line(pid)
+    return command_line is not None and f"--user-data-dir={user_data_dir}" in command_line
+
+
+def stop_server(state_path: str | Path = DEFAULT_STATE_PATH) -> bool:
+    """
+    常駐ブラウザを停止。
+
+    記録された PID が常駐ブラウザのプロセスでない場合（再起動後に PID が再利用された等）は停止せず、
+    古いサーバー情報を削除する。
+
+    Args:
+        state_path: サーバー情報の保存先
+
+    Returns:
+        停止した場合 True（起動していない、または PID を確認できなければ False）
+    """
+    path = Path(state_path)
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+        pid = int(state["pid"])
+        port = int(state["endpoint"].rsplit(":", 1)[1])
+    except (OSError, ValueError, KeyError, IndexError, AttributeError):
+        return False
+    user_data_dir = state.get("user_data_dir") or str(path.parent / f"profile-{port}")
+    path.unlink(missing_ok=True)
+    if not _is_server_process(pid, user_data_dir):
+        logger.warning(f"Process {pid} is not the browser server; removed stale state without stopping it")
+        return False
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return False
+    logger.info(f"Browser server stopped (pid {pid})")
+    return True
+
+
+def main() -> None:
+    """コマンドラインインターフェース"""
+    parser = argparse.ArgumentParser(description="常駐ブラウザの起動・停止")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("--port", type=int, default=9222, help="リモートデバッグポート（デフォルト: 9222）")
+    parser.add_argument("--headed", action="store_true", help="GUI を表示して起動")
+    parser.add_argument("--state", default=str(DEFAULT_STATE_PATH), help="サーバー情報の保存先")
+    args = parser.parse_args()
+
+    if args.command == "start":
+        print(start_server(port=args.port, headless=not args.headed, state_path=args.state))
+    elif args.command == "stop":
+        if not stop_server(args.state):
+            print("Browser server is not running")
+    else:
+        endpoint = server_endpoint(args.state)
+        print(endpoint or "Browser server is not running")
+        sys.exit(0 if endpoint else 1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    main()
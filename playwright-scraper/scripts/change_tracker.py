@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Change Tracker - 前回実行からの変更検出（差分スクレイピング）
+
+URL ごとに前回取得時のフィンガープリント（ETag / Last-Modified と、抽出対象領域のテキストハッシュ）を
+保存し、次回実行で変更のないページの抽出・ファイルの再ダウンロードを省略する。
+
+    | 対象 | 判定方法 | 省略できる処理 |
+    |---|---|---|
+    | ページ（検証子あり） | 条件付き GET が 304 | 遷移・描画・抽出 |
+    | ページ（検証子なし） | 領域テキストのハッシュが一致 | 抽出 |
+    | ファイル（fetch_file） | 条件付き GET が 304 | ダウンロード |
+
+使用方法:
+    tracker = ChangeTracker("./.scrape_state/changes.sqlite")
+    scraper = PlaywrightScraper(change_tracker=tracker)
+    for url in urls:
+        if not scraper.goto_if_changed(url, region_selector="#main"):
+            continue  # 前回から変更なし
+        rows = scraper.extract_rows(...)
+    logger.info(tracker.stats)
+"""
+
+import hashlib
+import logging
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    path TEXT,
+    checked_at TEXT NOT NULL,
+    changed_at TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class Fingerprint:
+    """URL 1件の前回取得時の状態"""
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    path: str | None = None  # ファイルの保存先（fetch_file のみ）
+    checked_at: str = ""
+    changed_at: str = ""
+
+    def conditional_headers(self) -> dict[str, str]:
+        """条件付き GET 用のリクエストヘッダー（検証子がなければ空）"""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class ChangeStats:
+    """変更検出の集計"""
+
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+
+    @property
+    def skipped(self) -> int:
+        """変更がなく処理を省略した件数"""
+        return self.unchanged
+
+
+def hash_content(content: str | bytes) -> str:
+    """内容の SHA-256（16進）"""
+    return hashlib.sha256(content.encode() if isinstance(content, str) else content).hexdigest()
+
+
+class ChangeTracker:
+    """URL ごとのフィンガープリントを SQLite に保存し、前回からの変更を判定"""
+
+    def __init__(self, path: str | Path = "./.scrape_state/changes.sqlite") -> None:
+        """
+        初期化。
+
+        Args:
+            path: フィンガープリントの保存先（複数プロセスで共有可能）
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats = ChangeStats()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """保存先を閉じる"""
+        self._db.close()
+
+    def get(self, url: str) -> Fingerprint | None:
+        """前回のフィンガープリント（未取得なら None）"""
+        row = self._db.execute(
+            "SELECT url, etag, last_modified, content_hash, path, checked_at, changed_at "
+            "FROM fingerprints WHERE url = ?",
+            (url,),
+        ).fetchone()
+        return Fingerprint(*row) if row else None
+
+    def record(
+        self,
+        url: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        content_hash: str | None = None,
+        path: str | Path | None = None,
+        unchanged: bool | None = None,
+    ) -> bool:
+        """
+        今回の取得結果を記録し、前回から変更があったかを返す。
+
+        Args:
+            url: 対象URL
+            etag: レスポンスの ETag
+            last_modified: レスポンスの Last-Modified
+            content_hash: 抽出対象領域（またはファイル）のハッシュ
+            path: ファイルの保存先
+            unchanged: 変更なしが確定している場合 True（304 応答等）。省略時はハッシュ・検証子で判定
+
+        Returns:
+            新規または変更あり: True、変更なし: False
+        """
+        previous = self.get(url)
+        if unchanged is None:
+            unchanged = previous is not None and self._same(previous, etag, last_modified, content_hash)
+
+        now = datetime.now().isoformat(timespec="seconds")
+        if previous is None:
+            self.stats.new += 1
+        elif unchanged:
+            self.stats.unchanged += 1
+        else:
+            self.stats.changed += 1
+
+        # 304 応答では検証子が省略されることがあるため、前回値を引き継ぐ
+        if previous is not None:
+            etag = etag or previous.etag
+            last_modified = last_modified or previous.last_modified
+            content_hash = content_hash or previous.content_hash
+            path = path or previous.path
+        changed_at = previous.changed_at if previous is not None and unchanged else now
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO fingerprints "
+                "(url, etag, last_modified, content_hash, path, checked_at, changed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, content_hash, str(path) if path else None, now, changed_at),
+            )
+        return not unchanged
+
+    def forget(self, url: str) -> None:
+        """
+        URL の記録を削除（次回は必ず変更ありとして扱う）。
+
+        抽出・保存に失敗したページは、次回実行で省略されないよう記録を削除すること。
+        """
+        with self._db:
+            self._db.execute("DELETE FROM fingerprints WHERE url = ?", (url,))
+
+    @staticmethod
+    def _same(previous: Fingerprint, etag: str | None, last_modified: str | None, content_hash: str | None) -> bool:
+        """前回と同一か（ハッシュがあればハッシュ、なければ検証子で比較）（内部用）"""
+        if content_hash and previous.content_hash:
+            return content_hash == previous.content_hash
+        if etag and previous.etag:
+            return etag == previous.etag
+        if last_modified and previous.last_modified:
+            return last_modified == previous.last_modified
+        return False
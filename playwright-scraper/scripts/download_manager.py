@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Download Manager - 複数ダウンロードの並行取得とコンテンツアドレス型の重複排除
+
+複数のダウンロードリンクを続けてクリックして転送をブラウザ内で並行させ、
+完了したファイルはストアへ移動する。ブラウザを `downloads_path=manager.incoming_dir` で起動すれば
+ダウンロードは最初からストアと同じファイルシステムに書かれ、格納は rename のみでコピーしない。
+SHA-256 をキーに保存するため、既に取得済みの内容は二重に保存しない。
+取得結果は JSON マニフェストに記録する。
+
+保存レイアウト:
+    <download_dir>/
+    ├── .store/ab/abcdef...      # 実体（SHA-256 をファイル名にしたコンテンツアドレス型ストア）
+    ├── .store/tmp/              # ブラウザのダウンロード先・格納前の一時ファイル
+    ├── data_2024.zip            # 実体へのハードリンク（suggested_filename）
+    ├── data_2024-1.zip          # 同名で内容が異なるファイルは連番を付ける
+    └── manifest.json            # 取得記録
+
+使用方法:
+    manager = DownloadManager("./downloads")
+    scraper = PlaywrightScraper(downloads_path=str(manager.incoming_dir))
+    records = manager.download_many(scraper.page, ["a.export-csv", "a.export-zip"])
+
+依存:
+    - playwright
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from playwright.sync_api import Download, Locator, Page
+    from playwright.sync_api import Error as PlaywrightError
+except ImportError:
+    print("Error: playwright not installed. Run: pip install playwright")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class DownloadRecord:
+    """ダウンロード1件の記録（マニフェストの1エントリ）"""
+
+    filename: str
+    url: str
+    sha256: str
+    size: int
+    path: str
+    duplicate: bool
+    fetched_at: str
+
+
+def _hash_file(path: Path) -> tuple[str, int]:
+    """ファイルの SHA-256 とサイズをチャンク単位で計算"""
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class DownloadManager:
+    """並行ダウンロード・重複排除・マニフェスト記録"""
+
+    def __init__(self, download_dir: str | Path = "./downloads", manifest_path: str | Path | None = None) -> None:
+        """
+        初期化。
+
+        Args:
+            download_dir: ダウンロード保存先ディレクトリ
+            manifest_path: マニフェストJSONのパス（省略時: download_dir/manifest.json）
+        """
+        self.download_dir = Path(download_dir)
+        self.store_dir = self.download_dir / ".store"
+        self.incoming_dir = self.store_dir / "tmp"
+        self.incoming_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.download_dir / "manifest.json"
+        self.records: list[DownloadRecord] = self._load_manifest()
+        self._lock = threading.Lock()
+
+    def download_many(
+        self,
+        page: Page,
+        locators: Sequence[str | Locator],
+        timeout_ms: float | None = None,
+        max_workers: int = 4,
+    ) -> list[DownloadRecord]:
+        """
+        複数のダウンロードリンクをクリックし、並行して取得。
+
+        クリックは順に行うが、`expect_download()` はダウンロード開始までしか待たないため
+        転送はブラウザ内で並行する。完了したものから別スレッドでハッシュ計算・格納を行う。
+
+        Args:
+            page: ダウンロードリンクのあるページ
+            locators: ダウンロードリンクのCSSセレクタまたは Locator
+            timeout_ms: ダウンロード開始待ちのタイムアウト（ミリ秒、省略時: ページのデフォルト）
+            max_workers: ハッシュ計算・格納を行うスレッド数
+
+        Returns:
+            locators と同じ順序の DownloadRecord リスト
+
+        Raises:
+            RuntimeError: いずれかのダウンロードが失敗
+        """
+        try:
+            downloads: list[Download] = []
+            for locator in locators:
+                loc = page.locator(locator) if isinstance(locator, str) else locator
+                with page.expect_download(timeout=timeout_ms) as download_info:
+                    loc.click()
+                downloads.append(download_info.value)
+                logger.info(f"Download started: {downloads[-1].suggested_filename}")
+
+            # Playwright の呼び出し（path()）はこのスレッドで行い、ファイル処理のみスレッドへ渡す
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures: list[Future[DownloadRecord]] = []
+                for download in downloads:
+                    source = self._completed_path(download)
+                    futures.append(executor.submit(self.store_file, source, download.suggested_filename, download.url))
+                records = [future.result() for future in futures]
+        except Exception as e:
+            logger.error(f"Download failed: {e!s}", exc_info=True)
+            raise RuntimeError(f"Download failed ({len(locators)} requested). Error: {e}") from e
+
+        self.save_manifest()
+        duplicates = sum(record.duplicate for record in records)
+        logger.info(f"Downloaded {len(records)} files ({duplicates} duplicates skipped)")
+        return records
+
+    def download(self, page: Page, locator: str | Locator, timeout_ms: float | None = None) -> DownloadRecord:
+        """
+        ダウンロード1件を取得（`download_many()` の単数版）。
+
+        Args:
+            page: ダウンロードリンクのあるページ
+            locator: ダウンロードリンクのCSSセレクタまたは Locator
+            timeout_ms: ダウンロード開始待ちのタイムアウト（ミリ秒）
+
+        Returns:
+            DownloadRecord
+        """
+        return self.download_many(page, [locator], timeout_ms=timeout_ms, max_workers=1)[0]
+
+    def store_file(self, source: Path, filename: str, url: str = "") -> DownloadRecord:
+        """
+        ファイルをストアへ移動してハッシュ計算し、filename でハードリンクを作成。
+
+        同じ内容が既にストアにある場合は取り込んだファイルを削除し、既存の実体を参照する。
+        filename が内容の異なる別ファイルで使用済みの場合は `name-1.ext` のように連番を付ける。
+
+        Args:
+            source: 取得済みファイル（移動されるため呼び出し後は存在しない）
+            filename: 保存ファイル名（suggested_filename）
+            url: 取得元URL（マニフェスト記録用）
+
+        Returns:
+            DownloadRecord
+        """
+        # 取り込みとハッシュ計算はロック外で行い、ロック中は存在確認と rename・リンク作成のみ
+        temp_path, sha256, size = self._ingest(source)
+        object_path = self.store_dir / sha256[:2] / sha256
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        target_path = self.download_dir / Path(filename).name
+        with self._lock:
+            duplicate = object_path.exists()
+            if not duplicate:
+                os.replace(temp_path, object_path)  # 同じ .store 配下のため rename のみ
+            target_path = self._link(object_path, target_path)
+        if duplicate:
+            temp_path.unlink(missing_ok=True)
+            logger.info(f"Duplicate content skipped: {filename} (sha256: {sha256[:12]})")
+
+        record = DownloadRecord(
+            filename=filename,
+            url=url,
+            sha256=sha256,
+            size=size,
+            path=str(target_path),
+            duplicate=duplicate,
+            fetched_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        with self._lock:
+            self.records.append(record)
+        return record
+
+    def save_manifest(self) -> None:
+        """マニフェストを書き出す（一時ファイル経由で置換）"""
+        data = {"files": [asdict(record) for record in self.records]}
+        fd, tmp_path = tempfile.mkstemp(dir=self.manifest_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _load_manifest(self) -> list[DownloadRecord]:
+        """既存マニフェストを読み込む（内部用）"""
+        if not self.manifest_path.exists():
+            return []
+        with self.manifest_path.open("r", encoding="utf-8") as f:
+            return [DownloadRecord(**entry) for entry in json.load(f).get("files", [])]
+
+    def _completed_path(self, download: Download) -> Path:
+        """ダウンロード完了を待ってローカルパスを返す（内部用）"""
+        try:
+            # path() はダウンロード完了までブロック
+            return Path(download.path())
+        except PlaywrightError:
+            # リモートブラウザ（connect）では path() が使えないため、ストア内へ直接保存
+            fd, partial = tempfile.mkstemp(dir=self.incoming_dir, prefix=".partial-")
+            os.close(fd)
+            download.save_as(partial)
+            return Path(partial)
+
+    def _ingest(self, source: Path) -> tuple[Path, str, int]:
+        """
+        source をストア内の一意な一時ファイルへ移し、SHA-256 とサイズを返す（内部用）。
+
+        同一ファイルシステムなら rename してから1回読むだけで済ませ、
+        別ファイルシステムならコピーしながらハッシュを計算する（いずれも読み書きは1パス）。
+
+        Returns:
+            (一時ファイルのパス, SHA-256, サイズ)
+        """
+        same_filesystem = source.stat().st_dev == self.incoming_dir.stat().st_dev
+        fd, temp_name = tempfile.mkstemp(dir=self.incoming_dir, prefix=".ingest-")
+        temp_path = Path(temp_name)
+        try:
+            if same_filesystem:
+                os.close(fd)
+                os.replace(source, temp_path)
+                sha256, size = _hash_file(temp_path)
+                return temp_path, sha256, size
+
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as dst, source.open("rb") as src:
+                while chunk := src.read(_CHUNK_SIZE):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+            source.unlink(missing_ok=True)
+            return temp_path, digest.hexdigest(), size
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _link(object_path: Path, target_path: Path) -> Path:
+        """
+        ストアの実体へのハードリンクを作成（不可ならシンボリックリンク）（内部用）。
+
+        target_path が別の内容で使用済みなら連番を付けた名前にする（既存のリンクは置き換えない）。
+
+        Returns:
+            作成した（または既に同じ実体を指していた）リンクのパス
+        """
+        candidate = target_path
+        counter = 0
+        while True:
+            if candidate.exists() and candidate.samefile(object_path):
+                return candidate
+            try:
+                os.link(object_path, candidate)
+                return candidate
+            except FileExistsError:
+                pass
+            except OSError:
+                try:
+                    candidate.symlink_to(object_path.resolve())
+                    return candidate
+                except FileExistsError:
+                    pass
+            counter += 1
+            candidate = target_path.with_name(f"{target_path.stem}-{counter}{target_path.suffix}")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Job Journal - 中断したクロールを途中から再開するためのジャーナル
+
+完了した作業単位（URL・ダウンロード・アカウント等）と、ページネーションの途中位置（カーソル）を
+SQLite に逐次記録する。タイムアウト・OOM・デプロイで途中終了しても、再実行時は
+未完了の単位とカーソル位置から再開するため、やり直しは失われた分だけで済む。
+
+使用方法:
+    journal = JobJournal("./.scrape_state/journal.sqlite", job_id="daily-export")
+    for url in journal.pending(urls):          # 完了済みを除外
+        path = scraper.fetch_file(url)
+        journal.mark_done(url, result=str(path))
+
+    # ページネーションはカーソルで再開（ページ処理後に次ページのURLを記録）
+    for page in scraper.iter_pages(start_url, journal=journal, cursor_name="list"):
+        ...
+
+    # 最初からやり直す場合
+    journal.reset()
+"""
+
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    job_id TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (job_id, unit)
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    job_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    pages_done INTEGER NOT NULL,
+    finished INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (job_id, name)
+);
+"""
+
+
+@dataclass
+class Cursor:
+    """ページネーションの途中位置"""
+
+    url: str  # 次に処理するページのURL
+    pages_done: int  # 処理済みページ数
+    finished: bool = False
+
+
+class JobJournal:
+    """作業単位の完了記録とページネーションカーソル（SQLite）"""
+
+    def __init__(self, path: str | Path = "./.scrape_state/journal.sqlite", job_id: str = "default") -> None:
+        """
+        初期化。
+
+        Args:
+            path: ジャーナルの保存先
+            job_id: ジョブ名（同じファイルに複数ジョブを記録できる）
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.job_id = job_id
+        # 1件ごとにコミットする（異常終了時も完了済みの記録は失われない）
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """ジャーナルを閉じる"""
+        self._db.close()
+
+    def is_done(self, unit: str) -> bool:
+        """作業単位が完了済みか"""
+        row = self._db.execute(
+            "SELECT 1 FROM units WHERE job_id = ? AND unit = ? AND status = 'done'", (self.job_id, unit)
+        ).fetchone()
+        return row is not None
+
+    def done_units(self) -> set[str]:
+        """完了済みの作業単位"""
+        rows = self._db.execute("SELECT unit FROM units WHERE job_id = ? AND status = 'done'", (self.job_id,))
+        return {unit for (unit,) in rows}
+
+    def pending(self, units: Iterable[str]) -> list[str]:
+        """
+        未完了の作業単位（順序を保って完了済みを除外）。
+
+        Args:
+            units: 全作業単位
+
+        Returns:
+            未完了の作業単位のリスト
+        """
+        done = self.done_units()
+        units = list(units)
+        remaining = [unit for unit in units if unit not in done]
+        if len(remaining) < len(units):
+            logger.info(f"Resuming job {self.job_id!r}: {len(units) - len(remaining)} done, {len(remaining)} remaining")
+        return remaining
+
+    def mark_done(self, unit: str, result: Any = None) -> None:
+        """
+        作業単位を完了として記録。
+
+        Args:
+            unit: 作業単位（URL 等）
+            result: 結果（JSON 化できる値。再開時に `result()` で取り出せる）
+        """
+        self._upsert(unit, "done", result=json.dumps(result, ensure_ascii=False, default=str))
+
+    def mark_failed(self, unit: str, error: str) -> None:
+        """作業単位を失敗として記録（再開時は再試行の対象）"""
+        self._upsert(unit, "failed", error=error)
+
+    def result(self, unit: str) -> Any:
+        """完了済みの作業単位の結果（未完了なら None）"""
+        row = self._db.execute(
+            "SELECT result FROM units WHERE job_id = ? AND unit = ? AND status = 'done'", (self.job_id, unit)
+        ).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def counts(self) -> dict[str, int]:
+        """状態ごとの件数（{"done": n, "failed": n}）"""
+        rows = self._db.execute("SELECT status, COUNT(*) FROM units WHERE job_id = ? GROUP BY status", (self.job_id,))
+        return dict(rows.fetchall())
+
+    def cursor(self, name: str) -> Cursor | None:
+        """ページネーションカーソル（未記録なら None）"""
+        row = self._db.execute(
+            "SELECT url, pages_done, finished FROM cursors WHERE job_id = ? AND name = ?", (self.job_id, name)
+        ).fetchone()
+        return Cursor(url=row[0], pages_done=row[1], finished=bool(row[2])) if row else None
+
+    def save_cursor(self, name: str, url: str, pages_done: int, finished: bool = False) -> None:
+        """
+        ページネーションカーソルを記録。
+
+        Args:
+            name: カーソル名（ページネーションごとに一意）
+            url: 次に処理するページのURL
+            pages_done: 処理済みページ数
+            finished: 最終ページまで処理済み
+        """
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cursors (job_id, name, url, pages_done, finished, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.job_id, name, url, pages_done, int(finished), _now()),
+            )
+
+    def reset(self) -> None:
+        """このジョブの記録をすべて削除（最初からやり直す）"""
+        with self._db:
+            self._db.execute("DELETE FROM units WHERE job_id = ?", (self.job_id,))
+            self._db.execute("DELETE FROM cursors WHERE job_id = ?", (self.job_id,))
+        logger.info(f"Journal reset for job {self.job_id!r}")
+
+    def _upsert(self, unit: str, status: str, result: str | None = None, error: str | None = None) -> None:
+        """作業単位の状態を更新（試行回数を加算）（内部用）"""
+        with self._db:
+            self._db.execute(
+                "INSERT INTO units (job_id, unit, status, result, error, attempts, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (job_id, unit) DO UPDATE SET "
+                "status = excluded.status, result = excluded.result, error = excluded.error, "
+                "attempts = attempts + 1, updated_at = excluded.updated_at",
+                (self.job_id, unit, status, result, error, _now()),
+            )
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
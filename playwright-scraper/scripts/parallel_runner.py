@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Parallel Runner - ジョブを複数プロセスに分散してスクレイピング
+
+sync API の1プロセスはイベント処理・解析で CPU 1コアを使い切るため、
+ワーカープロセスごとに `PlaywrightScraper` を1つ起動し、メインプロセスが空いたワーカーへジョブを1件ずつ渡す。
+早く終わったワーカーが残りのジョブを引き取るため、ジョブ間の処理時間差があっても偏らない。
+ワーカーの異常終了・ジョブの制限時間超過（job_timeout_s）は処理中のジョブを再投入・失敗として扱い、必ず終了する。
+
+使用方法:
+    python parallel_runner.py https://example.com/a https://example.com/b --processes 4
+
+    # コードから（job_fn はトップレベル関数で定義すること。spawn で pickle されるため）
+    result = run_sharded(urls, fetch_title, processes=4, scraper_kwargs={"fast_mode": True})
+
+依存:
+    - playwright
+    - python-dotenv
+"""
+
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import time
+import traceback
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from typing import Any, Generic, TypeVar
+
+from basic_scraper import PlaywrightScraper
+from job_journal import JobJournal
+
+logger = logging.getLogger(__name__)
+
+J = TypeVar("J")
+R = TypeVar("R")
+
+
+@dataclass
+class JobError:
+    """失敗したジョブの記録"""
+
+    index: int
+    job: Any
+    worker: int
+    error: str
+    traceback: str = ""
+
+
+@dataclass
+class ShardedRunResult(Generic[R]):
+    """分散実行の集計結果"""
+
+    results: list[R | None]
+    errors: list[JobError] = field(default_factory=list)
+    jobs_per_worker: dict[int, int] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+    resumed: int = 0  # ジャーナルで完了済みのため実行しなかったジョブ数
+
+    @property
+    def succeeded(self) -> int:
+        """成功したジョブ数（ジャーナルで完了済みのものを含む）"""
+        return len(self.results) - len(self.errors)
+
+
+def _worker(
+    worker_id: int,
+    job_fn: Callable[[PlaywrightScraper, Any], Any],
+    scraper_cls: type[PlaywrightScraper],
+    scraper_kwargs: dict[str, Any],
+    conn: Connection,
+) -> None:
+    """ワーカープロセス本体。スクレイパーを1つ起動し、メインプロセスから1件ずつ渡されるジョブを処理（内部用）"""
+    scraper = scraper_cls(**scraper_kwargs)
+    try:
+        scraper.launch()
+    except Exception as e:
+        conn.send(("fatal", repr(e), traceback.format_exc()))
+        return
+
+    try:
+        conn.send(("ready",))
+        while (item := conn.recv()) is not None:
+            index, job = item
+            try:
+                value = job_fn(scraper, job)
+            except Exception as e:
+                conn.send(("error", index, repr(e), traceback.format_exc()))
+                continue
+            try:
+                # send() は書き込み前に pickle するため、pickle できない結果はここで失敗として返せる
+                conn.send(("ok", index, value))
+            except Exception as e:
+                conn.send(("error", index, f"result is not picklable: {e!r}", traceback.format_exc()))
+    finally:
+        scraper.close()
+        conn.close()
+
+
+def run_sharded(
+    jobs: Sequence[J],
+    job_fn: Callable[[PlaywrightScraper, J], R],
+    processes: int | None = None,
+    scraper_kwargs: dict[str, Any] | None = None,
+    max_crash_retries: int = 1,
+    journal: JobJournal | None = None,
+    job_key: Callable[[J], str] = str,
+    job_timeout_s: float | None = 600.0,
+    scraper_cls: type[PlaywrightScraper] = PlaywrightScraper,
+) -> ShardedRunResult[R]:
+    """
+    ジョブをプロセスプールに分散して実行。
+
+    各ワーカーは自分の `PlaywrightScraper` を起動したまま複数ジョブを処理する。
+    ジョブはメインプロセスが空いたワーカーへ1件ずつ渡すため、各ワーカーが処理中のジョブを常に把握できる。
+    ワーカープロセスが異常終了した場合、処理中だったジョブは代わりのワーカーへ再投入する。
+    job_timeout_s を超えたジョブ（ワーカーの起動を含む）はワーカーを停止して失敗とし、代わりのワーカーを起動する。
+    journal 指定時は完了したジョブを逐次記録し、再実行時は完了済みのジョブを実行せず前回の結果を返す。
+
+    Args:
+        jobs: ジョブ（URL・アカウント情報など。pickle 可能であること）
+        job_fn: `job_fn(scraper, job) -> result`（トップレベル関数。結果は pickle 可能であること）
+        processes: ワーカープロセス数（省略時: CPUコア数）
+        scraper_kwargs: 各ワーカーの `PlaywrightScraper()` に渡す引数
+        max_crash_retries: ワーカー異常終了時にジョブを再投入する回数
+        journal: 完了記録のジャーナル（job_journal.JobJournal。記録はメインプロセスのみが行う）
+        job_key: ジョブからジャーナルのキーを作る関数（デフォルト: str）
+        job_timeout_s: 1ジョブ（またはワーカーの起動）の制限時間（秒）。None で無制限（ジョブが止まると終了しない）
+        scraper_cls: 各ワーカーで起動するスクレイパー（`PlaywrightScraper` のサブクラス等。トップレベルで定義すること）
+
+    Returns:
+        ShardedRunResult（results は jobs と同じ順序。失敗したジョブは None）
+    """
+    started = time.perf_counter()
+    result = ShardedRunResult[R](results=[None] * len(jobs))
+    finished: set[int] = set()
+    keys = [job_key(job) for job in jobs]
+
+    # ジャーナルで完了済みのジョブは前回の結果を使い、キューに入れない
+    done = journal.done_units() if journal else set()
+    for index, key in enumerate(keys):
+        if journal and key in done:
+            result.results[index] = journal.result(key)
+            finished.add(index)
+    result.resumed = len(finished)
+    backlog = deque(index for index in range(len(jobs)) if index not in finished)
+    if result.resumed:
+        logger.info(f"Resuming: {result.resumed} jobs already done, {len(backlog)} remaining")
+    if not backlog:
+        result.elapsed_s = time.perf_counter() - started
+        return result
+
+    processes = min(processes or os.cpu_count() or 1, len(backlog))
+    ctx = mp.get_context("spawn")  # fork は Playwright のドライバー接続を引き継げないため spawn
+
+    # ワーカーごとに専用のパイプを使う（共有キューは送信中に停止したワーカーがロックを握ったまま壊れるため）
+    workers: dict[int, Any] = {}  # ワーカーID -> Process
+    conns: dict[int, Connection] = {}  # 稼働中のワーカーID -> パイプ
+    assigned: dict[int, int] = {}  # ワーカーID -> 処理中のジョブ
+    deadlines: dict[int, float] = {}  # ワーカーID -> 起動・処理中ジョブの期限
+    stopping: set[int] = set()  # 終了指示（None）を送ったワーカー
+    crash_retries: dict[int, int] = {}
+    next_worker_id = 0
+
+    def spawn() -> None:
+        nonlocal next_worker_id
+        worker_id, next_worker_id = next_worker_id, next_worker_id + 1
+        parent_conn, child_conn = ctx.Pipe()
+        workers[worker_id] = ctx.Process(
+            target=_worker,
+            args=(worker_id, job_fn, scraper_cls, scraper_kwargs or {}, child_conn),
+            name=f"scraper-worker-{worker_id}",
+        )
+        workers[worker_id].start()
+        child_conn.close()  # ワーカー終了時に EOF を受け取れるよう、親側の子エンドは閉じる
+        conns[worker_id] = parent_conn
+        if job_timeout_s is not None:
+            deadlines[worker_id] = time.monotonic() + job_timeout_s
+
+    def fail(index: int, worker_id: int, error: str, tb: str = "") -> None:
+        result.errors.append(JobError(index=index, job=jobs[index], worker=worker_id, error=error, traceback=tb))
+        finished.add(index)
+        if journal:
+            journal.mark_failed(keys[index], error)
+
+    def dispatch(worker_id: int) -> None:
+        # 未着手のジョブがあれば1件渡し、なければ終了を指示する
+        deadlines.pop(worker_id, None)
+        try:
+            if not backlog:
+                stopping.add(worker_id)
+                conns[worker_id].send(None)
+                return
+            index = backlog.popleft()
+            assigned[worker_id] = index
+            if job_timeout_s is not None:
+                deadlines[worker_id] = time.monotonic() + job_timeout_s
+            conns[worker_id].send((index, jobs[index]))
+        except OSError:
+            pass  # ワーカーが既に終了している（EOF として retire で処理する）
+
+    def retire(worker_id: int, reason: str, retry: bool) -> None:
+        # 停止したワーカーの処理中ジョブを再投入（または失敗）し、ジョブを失った場合は代わりを起動する
+        conns.pop(worker_id).close()
+        deadlines.pop(worker_id, None)
+        index = assigned.pop(worker_id, None)
+        if index is None or index in finished:
+            return
+        crash_retries[index] = crash_retries.get(index, 0) + 1
+        if retry and crash_retries[index] <= max_crash_retries:
+            backlog.appendleft(index)
+        else:
+            fail(index, worker_id, reason)
+        if backlog:
+            spawn()
+
+    def receive(worker_id: int) -> None:
+        try:
+            message = conns[worker_id].recv()
+        except (EOFError, OSError):
+            process = workers[worker_id]
+            process.join(timeout=10)
+            if worker_id not in stopping:
+                # 終了指示なしで終了したワーカー = 異常終了（OOM・クラッシュ等）
+                logger.error(f"Worker {worker_id} died (exit code: {process.exitcode})")
+            retire(worker_id, "worker process died", retry=True)
+            return
+
+        kind, *payload = message
+        if kind == "ready":
+            dispatch(worker_id)
+        elif kind == "fatal":
+            error, _ = payload
+            logger.error(f"Worker {worker_id} failed to launch: {error}")
+            stopping.add(worker_id)  # 続けて届く EOF を正常終了として扱う
+            deadlines.pop(worker_id, None)
+        else:
+            index = payload[0]
+            assigned.pop(worker_id, None)
+            result.jobs_per_worker[worker_id] = result.jobs_per_worker.get(worker_id, 0) + 1
+            if kind == "ok":
+                result.results[index] = payload[1]
+                finished.add(index)
+                if journal:
+                    journal.mark_done(keys[index], payload[1])
+            else:
+                error, tb = payload[1:]
+                logger.warning(f"Job {index} failed on worker {worker_id}: {error}")
+                fail(index, worker_id, error, tb)
+            dispatch(worker_id)
+
+    def expire(worker_id: int) -> None:
+        logger.error(f"Worker {worker_id} exceeded job timeout ({job_timeout_s}s); terminating")
+        process = workers[worker_id]
+        process.terminate()
+        process.join(timeout=10)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        retire(worker_id, f"job timed out after {job_timeout_s}s", retry=False)
+
+    for _ in range(processes):
+        spawn()
+    logger.info(f"Started {processes} workers for {len(backlog)} jobs")
+
+    while len(finished) < len(jobs) and conns:
+        timeout = 1.0
+        if deadlines:
+            timeout = min(timeout, max(0.0, min(deadlines.values()) - time.monotonic()))
+        ready = wait(list(conns.values()), timeout=timeout)
+        for worker_id in [worker_id for worker_id, conn in conns.items() if conn in ready]:
+            if worker_id in conns:
+                receive(worker_id)
+        now = time.monotonic()
+        for worker_id in [worker_id for worker_id, deadline in deadlines.items() if now >= deadline]:
+            if worker_id in conns:
+                expire(worker_id)
+
+    # 全ワーカーが停止して残ったジョブは失敗扱い
+    for index in range(len(jobs)):
+        if index not in finished:
+            fail(index, -1, "no worker available")
+
+    for worker_id, conn in conns.items():
+        if worker_id not in stopping:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+    for process in workers.values():
+        process.join(timeout=30)
+        if process.is_alive():
+            process.terminate()
+    for conn in conns.values():
+        conn.close()
+
+    result.errors.sort(key=lambda error: error.index)
+    result.elapsed_s = time.perf_counter() - started
+    logger.info(
+        f"Sharded run finished in {result.elapsed_s:.1f}s: "
+        f"{result.succeeded} succeeded ({result.resumed} resumed), {len(result.errors)} failed, "
+        f"per worker: {result.jobs_per_worker}"
+    )
+    return result
+
+
+def _fetch_title(scraper: PlaywrightScraper, url: str) -> dict[str, str]:
+    """サンプルジョブ: ページタイトルを取得"""
+    scraper.page.goto(url)
+    return {"url": url, "title": scraper.page.title()}
+
+
+# 使用例
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="URLリストを複数プロセスに分散してスクレイピング")
+    parser.add_argument("urls", nargs="+", help="対象URL")
+    parser.add_argument("--processes", "-p", type=int, default=None, help="ワーカープロセス数（デフォルト: CPUコア数）")
+    parser.add_argument("--journal", default=None, help="完了記録のジャーナル（指定時は中断したジョブを再開）")
+    parser.add_argument("--job-timeout", type=float, default=600.0, help="1ジョブの制限時間（秒、デフォルト: 600）")
+    args = parser.parse_args()
+
+    run = run_sharded(
+        args.urls,
+        _fetch_title,
+        processes=args.processes,
+        scraper_kwargs={"fast_mode": True},
+        journal=JobJournal(args.journal, job_id="fetch_title") if args.journal else None,
+        job_timeout_s=args.job_timeout,
+    )
+    for row in run.results:
+        if row:
+            logger.info(f"{row['url']}: {row['title']}")
+    for job_error in run.errors:
+        logger.error(f"{job_error.job}: {job_error.error}")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - ホストごとのレート制限と適応的な同時実行数制御
+
+並列スクレイピングで同じサイトへのリクエストが集中すると 429 / 503 で絞られ、
+バックオフで失う時間の方が大きくなる。ホストごとに次の2段で流量を調整する。
+
+- トークンバケット: 1秒あたりのタスク開始数（rate_per_s）とバースト（burst）を制限
+- AIMD（加算増加・乗算減少）: 成功が続けば同時実行数を1ずつ増やし、429 / 503 で半減して Retry-After の間停止
+
+ホストごとのキュー長・待ち時間・応答時間を集計し、`report()` で出力する。
+
+トークンは `slot()` で確保するタスク（通常は1ページのナビゲーション）ごとに1つ消費する。
+ページ内のサブリソース・XHR などの個々の HTTP リクエスト数は制限しない。
+
+使用方法:
+    scheduler = HostScheduler(default_policy=HostPolicy(rate_per_s=2, max_concurrency=6))
+    results = await scraper.run_concurrent(urls, fetch_title, concurrency=20, scheduler=scheduler)
+    logger.info(scheduler.report())
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+from scrape_metrics import ScrapeMetrics, Span
+
+logger = logging.getLogger(__name__)
+
+# 流量を絞るべきステータス（サーバー側の混雑・レート制限）
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+@dataclass
+class HostPolicy:
+    """
+    ホストごとの流量制限。
+
+    Attributes:
+        rate_per_s: 1秒あたりのタスク（ナビゲーション）開始数の上限（トークン補充速度）
+        burst: 連続で開始できるタスク数（トークンバケットの容量）
+        initial_concurrency: 同時実行数の初期値
+        min_concurrency: 同時実行数の下限
+        max_concurrency: 同時実行数の上限
+        backoff_factor: 429 / 503 を受けたときの同時実行数の倍率
+        backoff_s: Retry-After がない場合の停止時間（秒）
+        max_backoff_s: 停止時間の上限（秒）
+    """
+
+    rate_per_s: float = 2.0
+    burst: int = 4
+    initial_concurrency: int = 2
+    min_concurrency: int = 1
+    max_concurrency: int = 8
+    backoff_factor: float = 0.5
+    backoff_s: float = 5.0
+    max_backoff_s: float = 60.0
+
+
+@dataclass
+class HostStats:
+    """ホストごとの集計"""
+
+    requests: int = 0  # 開始したタスク数（slot() の確保数）
+    throttled: int = 0
+    errors: int = 0
+    max_queue_depth: int = 0
+    queue_waits: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def summary(self) -> dict[str, Any]:
+        """集計値を辞書で返す（待ち時間・応答時間は直近1000件）"""
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_wait_mean_s": _mean(self.queue_waits),
+            "queue_wait_p95_s": _p95(self.queue_waits),
+            "latency_mean_s": _mean(self.latencies),
+            "latency_p95_s": _p95(self.latencies),
+        }
+
+
+def _mean(values: deque[float]) -> float:
+    return round(sum(values) / len(values), 4) if values else 0.0
+
+
+def _p95(values: deque[float]) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4) if ordered else 0.0
+
+
+def _retry_after_s(value: str | None) -> float | None:
+    """Retry-After ヘッダー（秒数または HTTP 日付）を秒数に変換（内部用）"""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def host_of(url_or_host: str) -> str:
+    """URL からホスト名を取り出す（ホスト名はそのまま返す）"""
+    if "://" not in url_or_host:
+        return url_or_host
+    return urlsplit(url_or_host).hostname or url_or_host
+
+
+@dataclass
+class _HostState:
+    """ホストごとの実行状態（内部用）"""
+
+    policy: HostPolicy
+    limit: float
+    tokens: float
+    refilled_at: float
+    in_flight: int = 0
+    waiting: int = 0
+    successes: int = 0
+    paused_until: float = 0.0
+    waiters: deque[asyncio.Future[None]] = field(default_factory=deque)
+    stats: HostStats = field(default_factory=HostStats)
+
+
+class HostScheduler:
+    """ホストごとのトークンバケット + AIMD による同時実行数制御（asyncio 用）"""
+
+    def __init__(
+        self,
+        default_policy: HostPolicy | None = None,
+        policies: dict[str, HostPolicy] | None = None,
+        metrics: ScrapeMetrics | None = None,
+    ) -> None:
+        """
+        初期化。
+
+        Args:
+            default_policy: ホスト別の指定がない場合の制限
+            policies: {ホスト名: 制限}（サイトごとの許容量に合わせて指定）
+            metrics: 待ち時間・スロットリング回数の記録先（省略可）
+        """
+        self.default_policy = default_policy or HostPolicy()
+        self.policies = policies or {}
+        self.metrics = metrics
+        self._hosts: dict[str, _HostState] = {}
+
+    @asynccontextmanager
+    async def slot(self, url_or_host: str) -> AsyncIterator[None]:
+        """
+        ホストの実行枠を確保する（同時実行数の空きとトークンを待つ）。
+
+        トークンは枠ごとに1つ消費する（枠内のタスクが発行する HTTP リクエストの数は問わない）。
+
+        Args:
+            url_or_host: 対象URLまたはホスト名
+        """
+        host = host_of(url_or_host)
+        state = self._state(host)
+        enqueued = time.monotonic()
+        state.waiting += 1
+        state.stats.max_queue_depth = max(state.stats.max_queue_depth, state.waiting)
+        try:
+            await self._acquire(state)
+        finally:
+            state.waiting -= 1
+        try:
+            await self._take_token(state)
+            queue_wait = time.monotonic() - enqueued
+            state.stats.queue_waits.append(queue_wait)
+            state.stats.requests += 1
+            if self.metrics:
+                self.metrics.record(
+                    Span("scheduler.queue_wait", time.time() - queue_wait, queue_wait, ok=True, attrs={"host": host})
+                )
+            yield
+        finally:
+            state.in_flight -= 1
+            self._wake(state)
+
+    def feedback(
+        self, url_or_host: str, status: int, latency_s: float | None = None, retry_after: str | None = None
+    ) -> None:
+        """
+        レスポンス結果を反映して同時実行数を調整（AIMD）。
+
+        Args:
+            url_or_host: 対象URLまたはホスト名
+            status: HTTP ステータス（0: 通信エラー）
+            latency_s: 応答時間（秒）
+            retry_after: Retry-After ヘッダーの値
+        """
+        host = host_of(url_or_host)
+        state = self._state(host)
+        policy = state.policy
+        if latency_s is not None:
+            state.stats.latencies.append(latency_s)
+
+        if status in THROTTLE_STATUSES:
+            state.stats.throttled += 1
+            state.successes = 0
+            state.limit = max(float(policy.min_concurrency), state.limit * policy.backoff_factor)
+            pause_s = min(_retry_after_s(retry_after) or policy.backoff_s, policy.max_backoff_s)
+            state.paused_until = max(state.paused_until, time.monotonic() + pause_s)
+            state.tokens = 0.0
+            if self.metrics:
+                self.metrics.increment("scheduler.throttled")
+            logger.warning(f"{host} throttled ({status}); concurrency -> {int(state.limit)}, pausing {pause_s:.1f}s")
+        elif status == 0 or status >= 500:
+            state.stats.errors += 1
+        elif status < 400:
+            # 現在の同時実行数ぶん成功したら1増やす（1往復あたり +1 の加算増加）
+            state.successes += 1
+            if state.successes >= state.limit and state.limit < policy.max_concurrency:
+                state.successes = 0
+                state.limit += 1
+                logger.debug(f"{host} concurrency -> {int(state.limit)}")
+                self._wake(state)
+
+    def concurrency(self, url_or_host: str) -> int:
+        """ホストの現在の同時実行数上限"""
+        return int(self._state(host_of(url_or_host)).limit)
+
+    def report(self) -> dict[str, dict[str, Any]]:
+        """ホストごとの集計（同時実行数上限・キュー長・待ち時間・応答時間）"""
+        return {
+            host: {"concurrency": int(state.limit), "queued": state.waiting, **state.stats.summary()}
+            for host, state in sorted(self._hosts.items())
+        }
+
+    def _state(self, host: str) -> _HostState:
+        """ホストの実行状態（初回は作成）（内部用）"""
+        state = self._hosts.get(host)
+        if state is None:
+            policy = self.policies.get(host, self.default_policy)
+            state = _HostState(
+                policy=policy,
+                limit=float(max(policy.min_concurrency, min(policy.initial_concurrency, policy.max_concurrency))),
+                tokens=float(policy.burst),
+                refilled_at=time.monotonic(),
+            )
+            self._hosts[host] = state
+        return state
+
+    async def _acquire(self, state: _HostState) -> None:
+        """同時実行数の空きを待って枠を確保（内部用）"""
+        while state.in_flight >= int(state.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            state.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # 起こされた直後にキャンセルされた場合は、空いた枠を次の待機タスクへ回す
+                if waiter.done() and not waiter.cancelled():
+                    self._wake(state)
+                raise
+            finally:
+                if waiter in state.waiters:
+                    state.waiters.remove(waiter)
+        state.in_flight += 1
+
+    def _wake(self, state: _HostState) -> None:
+        """空いた枠の数だけ待機中のタスクを起こす（内部用）"""
+        free = int(state.limit) - state.in_flight
+        while free > 0 and state.waiters:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def _take_token(self, state: _HostState) -> None:
+        """タスク1件分のトークンを消費（停止中・トークン不足なら待機）（内部用）"""
+        policy = state.policy
+        while True:
+            now = time.monotonic()
+            if state.paused_until > now:
+                await asyncio.sleep(state.paused_until - now)
+                continue
+            state.tokens = min(float(policy.burst), state.tokens + (now - state.refilled_at) * policy.rate_per_s)
+            state.refilled_at = now
+            if state.tokens >= 1:
+                state.tokens -= 1
+                return
+            await asyncio.sleep((1 - state.tokens) / policy.rate_per_s)
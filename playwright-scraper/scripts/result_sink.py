@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Result Sink - 抽出結果をバッチ単位でファイルへ逐次書き出す
+
+抽出結果をリストに溜めて最後にまとめて保存すると、件数に比例してメモリを使い、
+途中で失敗すると全件失われる。レコードを batch_size 件ずつバックグラウンドスレッドへ渡して
+JSONL / CSV / Parquet（pyarrow がある場合）に書き出し、未書き込みのバッチ数にも上限を設けて
+メモリ使用量を一定に保つ（書き込みが追いつかない場合は write() が待機する）。
+
+使用方法:
+    with ResultSink("items.jsonl") as sink:
+        sink.write_many(scraper.iter_items(".item", {"title": "h2", "url": ("a", "href")}, start_url=url))
+
+    # CSV（列は最初のレコードのキー、または fieldnames で指定）
+    with ResultSink("items.csv", fieldnames=["title", "url"]) as sink:
+        for record in records:
+            sink.write(record)
+
+    # Parquet（型は最初のバッチから推定。値が None だけの列は文字列。固定するには schema で指定）
+    with ResultSink("items.parquet", schema=pa.schema([("title", pa.string()), ("price", pa.float64())])) as sink:
+        sink.write_many(records)
+
+依存:
+    - pyarrow（Parquet 出力時のみ）
+"""
+
+import csv
+import json
+import logging
+import queue
+import threading
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from typing import Self
+
+logger = logging.getLogger(__name__)
+
+SinkFormat = Literal["jsonl", "csv", "parquet"]
+
+_SUFFIX_FORMATS: dict[str, SinkFormat] = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".parquet": "parquet"}
+
+
+class ResultSink:
+    """抽出結果をバックグラウンドスレッドでバッチ書き込みするライター"""
+
+    def __init__(
+        self,
+        path: str | Path,
+        format: SinkFormat | None = None,
+        batch_size: int = 500,
+        max_pending_batches: int = 4,
+        fieldnames: Sequence[str] | None = None,
+        append: bool = False,
+        schema: Any = None,
+    ) -> None:
+        """
+        初期化（出力ファイルを開き、書き込みスレッドを開始）。
+
+        Args:
+            path: 出力先
+            format: 出力形式（省略時: 拡張子 .jsonl / .ndjson / .csv / .parquet から判定）
+            batch_size: 1回の書き込みにまとめるレコード数
+            max_pending_batches: 未書き込みバッチ数の上限（メモリ使用量 ≒ batch_size × この値 のレコード）
+            fieldnames: CSV / Parquet の列（省略時: 最初のレコードのキー。以降の余分なキーは無視）
+            append: 既存ファイルへ追記（JSONL / CSV のみ）
+            schema: Parquet の列と型（`pyarrow.Schema`。省略時: 最初のバッチから推定し、以降のバッチはその型へ変換）
+
+        Raises:
+            ValueError: 出力形式を判定できない、または Parquet に追記しようとした
+            ImportError: Parquet 出力で pyarrow がインストールされていない
+        """
+        self.path = Path(path)
+        resolved = format or _SUFFIX_FORMATS.get(self.path.suffix.lower())
+        if resolved is None:
+            raise ValueError(f"Cannot infer output format from {self.path.name!r}; specify format=")
+        if resolved == "parquet" and append:
+            raise ValueError("Parquet does not support append=True")
+        self.format: SinkFormat = resolved
+        self.batch_size = batch_size
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.schema = schema
+        if schema is not None and self.fieldnames is None:
+            self.fieldnames = list(schema.names)
+        self.records_written = 0
+        self.batches_written = 0
+
+        self._buffer: list[dict[str, Any]] = []
+        self._queue: queue.Queue[list[dict[str, Any]] | None] = queue.Queue(maxsize=max_pending_batches)
+        self._error: BaseException | None = None
+        self._closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] | None = None
+        self._csv_writer: csv.DictWriter[str] | None = None
+        self._parquet_writer: Any = None
+        if self.format == "parquet":
+            self._pa, self._pq = _import_pyarrow()
+        else:
+            write_header = not (append and self.path.exists() and self.path.stat().st_size > 0)
+            if self.format == "csv" and not write_header and self.fieldnames is None:
+                # 追記時は既存ヘッダーの列順に合わせる（最初のレコードのキー順とは限らない）
+                with self.path.open("r", encoding="utf-8", newline="") as f:
+                    self.fieldnames = next(csv.reader(f), None)
+            self._file = self.path.open("a" if append else "w", encoding="utf-8", newline="")
+            self._write_header = write_header
+
+        self._thread = threading.Thread(target=self._run, name=f"result-sink-{self.path.name}", daemon=True)
+        self._thread.start()
+
+    def write(self, record: dict[str, Any]) -> None:
+        """
+        レコードを1件追加（batch_size 件たまったら書き込みスレッドへ渡す）。
+
+        Raises:
+            RuntimeError: 書き込みスレッドでエラーが発生した、またはクローズ済み
+        """
+        self._check()
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self._submit()
+
+    def write_many(self, records: Iterable[dict[str, Any]]) -> int:
+        """
+        複数レコードを追加（ジェネレーターを渡せばリストに溜めずに書き出せる）。
+
+        Returns:
+            追加したレコード数
+        """
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        """バッファ中のレコードを書き込み、ディスクへの反映まで待機"""
+        self._check()
+        self._submit()
+        self._queue.join()
+        self._check()
+
+    def close(self) -> None:
+        """
+        残りのレコードを書き込んでファイルを閉じる。
+
+        Raises:
+            RuntimeError: 書き込みスレッドでエラーが発生した
+        """
+        if self._closed:
+            return
+        try:
+            if self._error is None:
+                self._submit()
+        finally:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise RuntimeError(f"Result sink failed: {self.path}. Error: {self._error}") from self._error
+        logger.info(f"Wrote {self.records_written} records to {self.path} ({self.batches_written} batches)")
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _check(self) -> None:
+        """書き込みスレッドのエラー・クローズ済みを確認（内部用）"""
+        if self._closed:
+            raise RuntimeError(f"Result sink is closed: {self.path}")
+        if self._error is not None:
+            raise RuntimeError(f"Result sink failed: {self.path}. Error: {self._error}") from self._error
+
+    def _submit(self) -> None:
+        """バッファを書き込みキューへ渡す（キューが満杯なら待機）（内部用）"""
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._queue.put(batch)
+
+    def _run(self) -> None:
+        """書き込みスレッド本体（内部用）"""
+        try:
+            while (batch := self._queue.get()) is not None:
+                try:
+                    if self._error is None:
+                        self._write_batch(batch)
+                        self.records_written += len(batch)
+                        self.batches_written += 1
+                except Exception as e:
+                    logger.error(f"Failed to write batch to {self.path}", exc_info=True)
+                    self._error = e
+                finally:
+                    self._queue.task_done()
+            self._queue.task_done()
+        finally:
+            self._close_files()
+
+    def _write_batch(self, batch: list[dict[str, Any]]) -> None:
+        """1バッチを書き込む（内部用）"""
+        if self.format == "jsonl":
+            assert self._file is not None
+            self._file.write("".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch))
+            self._file.flush()
+        elif self.format == "csv":
+            assert self._file is not None
+            if self._csv_writer is None:
+                self.fieldnames = self.fieldnames or list(batch[0])
+                self._csv_writer = csv.DictWriter(self._file, self.fieldnames, restval="", extrasaction="ignore")
+                if self._write_header:
+                    self._csv_writer.writeheader()
+            self._csv_writer.writerows(batch)
+            self._file.flush()
+        else:
+            self.fieldnames = self.fieldnames or list(batch[0])
+            columns = {name: self._column([record.get(name) for record in batch]) for name in self.fieldnames}
+            if self._parquet_writer is None:
+                self.schema = self.schema or self._infer_schema(columns)
+                self._parquet_writer = self._pq.ParquetWriter(self.path, self.schema)
+            self._parquet_writer.write_table(self._conform(columns))
+
+    def _column(self, values: list[Any]) -> Any:
+        """1列分の値を配列に変換（型が混在する列は文字列にする）（内部用）"""
+        pa = self._pa
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+    def _infer_schema(self, columns: dict[str, Any]) -> Any:
+        """最初のバッチの型から Parquet のスキーマを決める（値が None だけの列は文字列）（内部用）"""
+        pa = self._pa
+        return pa.schema(
+            [(name, pa.string() if pa.types.is_null(array.type) else array.type) for name, array in columns.items()]
+        )
+
+    def _conform(self, columns: dict[str, Any]) -> Any:
+        """
+        バッチをファイルのスキーマへ変換（int → float、数値 → 文字列など）（内部用）。
+
+        Raises:
+            ValueError: 変換できない値がある（schema で型を指定する）
+        """
+        arrays = []
+        for field in self.schema:
+            column = columns[field.name]
+            if column.type != field.type:
+                try:
+                    column = column.cast(field.type)
+                except (self._pa.ArrowInvalid, self._pa.ArrowNotImplementedError) as e:
+                    raise ValueError(
+                        f"Column {field.name!r} has type {column.type} but the Parquet schema has {field.type}; "
+                        f"pass schema= to fix the column types. Error: {e}"
+                    ) from e
+            arrays.append(column)
+        return self._pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def _close_files(self) -> None:
+        """出力ファイルを閉じる（内部用）"""
+        if self._file is not None:
+            self._file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _import_pyarrow() -> tuple[Any, Any]:
+    """
+    pyarrow を読み込む（Parquet 出力時のみ必要）（内部用）。
+
+    Raises:
+        ImportError: pyarrow がインストールされていない
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow not installed. Run: pip install pyarrow") from e
+    return pa, pq
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Scrape Metrics - スクレイパーの処理時間計測
+
+公開メソッド・内部待機ごとの所要時間（スパン）と、リトライ・タイムアウト等のカウンターを集計し、
+実行単位のレポートを JSON で出力する。スパン完了ごとにフック関数を呼び出せるため、
+外部の監視基盤へ送ることもできる。
+
+使用方法:
+    metrics = ScrapeMetrics(hook=lambda span: print(span.name, span.duration_s))
+    with metrics.span("goto", url=url):
+        page.goto(url)
+    metrics.increment("retries")
+    metrics.export_json("scrape_log.json")
+"""
+
+import functools
+import json
+import logging
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Concatenate, ParamSpec, Protocol, TypeVar
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class Span:
+    """計測区間1件"""
+
+    name: str
+    started_at: float
+    duration_s: float
+    ok: bool
+    error: str | None = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SpanStats:
+    """スパン名ごとの集計"""
+
+    count: int = 0
+    errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    durations: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def add(self, span: Span) -> None:
+        """スパンを集計に加える"""
+        self.count += 1
+        self.errors += not span.ok
+        self.total_s += span.duration_s
+        self.max_s = max(self.max_s, span.duration_s)
+        self.durations.append(span.duration_s)
+
+    def summary(self) -> dict[str, Any]:
+        """集計値を辞書で返す（p95 は直近1000件から算出）"""
+        ordered = sorted(self.durations)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_s": round(self.total_s, 4),
+            "mean_s": round(self.total_s / self.count, 4) if self.count else 0.0,
+            "p95_s": round(p95, 4),
+            "max_s": round(self.max_s, 4),
+        }
+
+
+class ScrapeMetrics:
+    """スパン・カウンターの収集とレポート出力"""
+
+    def __init__(self, hook: Callable[[Span], None] | None = None, max_spans: int = 10000) -> None:
+        """
+        初期化。
+
+        Args:
+            hook: スパン完了ごとに呼び出す関数（例外はログ出力して無視）
+            max_spans: レポートに含める生スパンの最大件数（古いものから破棄。集計値は全件）
+        """
+        self.hook = hook
+        self.started_at = time.time()
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+        self.stats: dict[str, SpanStats] = {}
+        self.counters: Counter[str] = Counter()
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+        """
+        with ブロックの所要時間をスパンとして記録。
+
+        Args:
+            name: スパン名（例: "login", "wait.networkidle"）
+            **attrs: スパンに付与する属性（URL・セレクタ等）
+
+        Yields:
+            属性辞書（ブロック内で結果の件数などを追加できる）
+        """
+        started_at = time.time()
+        started = time.perf_counter()
+        error: str | None = None
+        try:
+            yield attrs
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.record(
+                Span(
+                    name=name,
+                    started_at=started_at,
+                    duration_s=time.perf_counter() - started,
+                    ok=error is None,
+                    error=error,
+                    attrs=attrs,
+                )
+            )
+
+    def record(self, span: Span) -> None:
+        """完了したスパンを記録してフックを呼び出す"""
+        self.spans.append(span)
+        self.stats.setdefault(span.name, SpanStats()).add(span)
+        if span.error:
+            self.counters[f"errors.{span.error}"] += 1
+        if self.hook:
+            try:
+                self.hook(span)
+            except Exception:
+                logger.warning(f"Metrics hook failed for span {span.name!r}", exc_info=True)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """カウンターを加算（例: "retries", "timeouts"）"""
+        self.counters[name] += value
+
+    def report(self, include_spans: bool = False) -> dict[str, Any]:
+        """
+        実行レポートを作成。
+
+        Args:
+            include_spans: 生スパンの一覧を含める
+
+        Returns:
+            {"started_at", "elapsed_s", "spans": {名前: 集計}, "counters": {...}, ("timeline": [...])}
+        """
+        report: dict[str, Any] = {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+            "elapsed_s": round(time.time() - self.started_at, 4),
+            # 合計時間の大きい順（ホットスポットが先頭）
+            "spans": {
+                name: stats.summary()
+                for name, stats in sorted(self.stats.items(), key=lambda item: item[1].total_s, reverse=True)
+            },
+            "counters": dict(self.counters),
+        }
+        if include_spans:
+            report["timeline"] = [asdict(span) for span in self.spans]
+        return report
+
+    def export_json(self, path: str | Path, include_spans: bool = True) -> Path:
+        """
+        レポートを JSON ファイルへ出力。
+
+        Args:
+            path: 出力先
+            include_spans: 生スパンの一覧を含める
+
+        Returns:
+            出力先パス
+        """
+        output_path = Path(path)
+        with output_path.open("w", encoding="utf-8") as f:
+            json.dump(self.report(include_spans=include_spans), f, ensure_ascii=False, indent=2, default=str)
+        return output_path
+
+
+class _HasMetrics(Protocol):
+    metrics: ScrapeMetrics
+
+
+S = TypeVar("S", bound=_HasMetrics)
+
+
+def timed(name: str) -> Callable[[Callable[Concatenate[S, P], R]], Callable[Concatenate[S, P], R]]:
+    """
+    メソッド全体を `self.metrics.span(name)` で計測するデコレーター。
+
+    Args:
+        name: スパン名
+    """
+
+    def decorator(func: Callable[Concatenate[S, P], R]) -> Callable[Concatenate[S, P], R]:
+        @functools.wraps(func)
+        def wrapper(self: S, *args: P.args, **kwargs: P.kwargs) -> R:
+            with self.metrics.span(name):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -5,35 +5,589 @@ Selector Detector - HTMLからセレクタ候補を自動抽出
 ページソース（HTML）から、ログインフォーム・リンク等のセレクタを自動判定。
 出力は JSON 形式で、ユーザーが確認・修正可能。
 
+パーサー（--parser）:
+    html.parser:  標準ライブラリ（追加の依存なし・最も遅い）
+    lxml:         BeautifulSoup + lxml
+    lxml-native:  BeautifulSoup を介さず lxml で直接解析（最速・最小メモリ。大量のページを処理する場合に推奨）
+
+メモリに載らない巨大なファイル（数百 MB の保存ページ等）は --stream でツリーを作らずに逐次検出する
+（streaming_detector.py。--parser は無視され、結果は html.parser と同じ）。
+
 使用方法:
     python selector_detector.py page.html --output selectors.json
-    python selector_detector.py page.html --keywords login,password,download
+    python selector_detector.py page.html --parser lxml-native
+    python selector_detector.py huge.html --stream
+
+ディレクトリ・glob パターンを指定すると一括検出（batch_detector.py）になり、
+全ファイルをプロセスプールで並列に検出して1ファイル1行の JSONL に書き出す（内容の変わっていないファイルは省略）:
+    python selector_detector.py snapshots/ --output selectors.jsonl --parser lxml-native
+    python selector_detector.py "snapshots/**/*.html" --workers 8
+    python selector_detector.py page.html --keywords next_page:weiter,submit_button:anmelden,会員登録
+    python selector_detector.py page.html --keywords-file keywords.json
+
+キーワード（--keywords / --keywords-file）:
+    カテゴリ（form / email_input / password_input / submit_button / download / next_page）を付けると
+    既存の検出に追加する。カテゴリなし（または custom）のキーワードは、id / name / type（a・button はテキストも）に
+    含む要素を keyword_matches に出力する。
+    キーワードはカテゴリごとに1つの正規表現にまとめてコンパイルするため、キーワード数が増えても照合回数は増えない。
 """
 
 import argparse
 import json
+import re
 import sys
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, replace
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, CData, FeatureNotFound, NavigableString, Tag
 except ImportError:
     print("Error: beautifulsoup4 not installed. Run: pip install beautifulsoup4")
     sys.exit(1)
 
+# 属性インデックスの対象（値は小文字化して保持）
+INDEXED_ATTRS = ("id", "name", "type", "class")
+
+# 選択できるパーサー
+PARSERS = ("html.parser", "lxml", "lxml-native")
+
+# `get_text()` が対象とする文字列の型（コメント・script・style 等は含まない）
+_TEXT_STRING_TYPES = {NavigableString, CData}
+
+# 配下の文字列が独自の型になる要素（BeautifulSoup と同じく、周囲の要素のテキストに含めない）
+RAW_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+class KeywordMatcher:
+    """
+    複数キーワードの部分一致（大文字小文字を区別しない）を1つの正規表現で照合。
+
+    キーワードごとに `in` で比較すると照合回数がキーワード数に比例するため、
+    作成時に全キーワードを1つの選択パターンにまとめてコンパイルし、1回の検索で判定する。
+    照合対象は小文字化済みの文字列（インデックスの属性値・テキスト）とする。
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """
+        初期化（正規表現のコンパイル）。
+
+        Args:
+            keywords: キーワード（空文字列は無視）
+        """
+        self.keywords: dict[str, str] = {}  # 小文字 -> 元のキーワード
+        for keyword in keywords:
+            if keyword:
+                self.keywords.setdefault(keyword.lower(), keyword)
+        # 同じ位置で複数一致する場合は長いキーワードを返す
+        alternatives = sorted(self.keywords, key=len, reverse=True)
+        self._regex = re.compile("|".join(map(re.escape, alternatives))) if alternatives else None
+        self.max_length = len(alternatives[0]) if alternatives else 0
+
+    def __bool__(self) -> bool:
+        return self._regex is not None
+
+    def search(self, lowered: str, start: int = 0, end: int | None = None) -> str | None:
+        """
+        lowered[start:end] に最初に現れるキーワード。
+
+        Args:
+            lowered: 小文字化済みの文字列
+            start: 検索開始位置
+            end: 検索終了位置（省略時: 末尾）
+
+        Returns:
+            一致したキーワード（元の表記）。一致しなければ None
+        """
+        found = self.find(lowered, start, end)
+        return found[1] if found else None
+
+    def find(self, lowered: str, start: int = 0, end: int | None = None) -> tuple[int, str] | None:
+        """
+        `search()` と同じ照合で、一致した位置も返す。
+
+        Returns:
+            (一致した位置, キーワード)。一致しなければ None
+        """
+        if self._regex is None:
+            return None
+        match = self._regex.search(lowered, start, len(lowered) if end is None else end)
+        return (match.start(), self.keywords[match.group()]) if match else None
+
+
+@dataclass(frozen=True)
+class LoginQuery:
+    """ログインフォームの構成要素を探す条件（tags の順に、文書順で最初に条件を満たす要素）"""
+
+    key: str
+    tags: tuple[str, ...]
+    id_pattern: tuple[str, ...] = ()  # 部分一致
+    name_pattern: tuple[str, ...] = ()  # 部分一致
+    type_pattern: tuple[str, ...] = ()  # 完全一致
+    text_pattern: tuple[str, ...] = ()  # 部分一致
+
+    @cached_property
+    def id_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.id_pattern)
+
+    @cached_property
+    def name_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.name_pattern)
+
+    @cached_property
+    def text_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.text_pattern)
+
+    @cached_property
+    def type_values(self) -> frozenset[str]:
+        """type_pattern（小文字）"""
+        return frozenset(pattern.lower() for pattern in self.type_pattern)
+
+    def extended(self, keywords: Iterable[str]) -> "LoginQuery":
+        """
+        キーワードを追加した条件（この条件が使う id / name / テキストの部分一致すべてに追加）。
+
+        Args:
+            keywords: 追加するキーワード
+
+        Returns:
+            新しい条件
+        """
+        keywords = tuple(keywords)
+        if not keywords:
+            return self
+        return replace(
+            self,
+            id_pattern=self.id_pattern + keywords if self.id_pattern else (),
+            name_pattern=self.name_pattern + keywords if self.name_pattern else (),
+            text_pattern=self.text_pattern + keywords if self.text_pattern else (),
+        )
+
+
+LOGIN_QUERIES = (
+    LoginQuery("form", ("form",), id_pattern=("login", "auth")),
+    LoginQuery(
+        "email_input",
+        ("input",),
+        type_pattern=("email", "text"),
+        id_pattern=("email", "loginId", "username"),
+        name_pattern=("email", "loginId", "username"),
+    ),
+    LoginQuery(
+        "password_input",
+        ("input",),
+        type_pattern=("password",),
+        id_pattern=("password", "passwd"),
+        name_pattern=("password", "passwd"),
+    ),
+    LoginQuery(
+        "submit_button", ("button", "input"), type_pattern=("submit",), text_pattern=("login", "sign in", "log in")
+    ),
+)
+
+# href にこれらを含むリンクをダウンロードリンクとする
+DOWNLOAD_HREF_KEYWORDS = ("download", "zip", "csv", "export")
+
+# 次ページボタンのテキスト
+NEXT_PAGE_PATTERNS = ("next", "続く", "次", ">>")
+
+# キーワードのカテゴリ（--keywords の "カテゴリ:キーワード"・キーワードファイルのキー）
+KEYWORD_CATEGORIES = (*(query.key for query in LOGIN_QUERIES), "download", "next_page", "custom")
+
+# custom キーワードを照合する要素（id / name / type と、a・button はテキストも照合）
+KEYWORD_TAGS = ("a", "button", "input", "form", "select", "textarea")
+
+
+@dataclass(frozen=True)
+class DetectionKeywords:
+    """
+    検出に使うキーワード一式。
+
+    照合用の `KeywordMatcher` は初回使用時に1回だけ作成し、同じインスタンスを使う検出（複数ページ）で共有する。
+    """
+
+    login_queries: tuple[LoginQuery, ...] = LOGIN_QUERIES
+    download: tuple[str, ...] = DOWNLOAD_HREF_KEYWORDS  # リンクの href
+    next_page: tuple[str, ...] = NEXT_PAGE_PATTERNS  # a・button のテキスト
+    custom: tuple[str, ...] = ()  # keyword_matches として出力する任意のキーワード
+
+    @cached_property
+    def download_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.download)
+
+    @cached_property
+    def next_page_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.next_page)
+
+    @cached_property
+    def custom_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.custom)
+
+    def extended(self, extra: Mapping[str, Iterable[str]]) -> "DetectionKeywords":
+        """
+        カテゴリごとにキーワードを追加した一式。
+
+        Args:
+            extra: カテゴリ（KEYWORD_CATEGORIES）-> 追加するキーワード
+
+        Returns:
+            新しい一式
+
+        Raises:
+            ValueError: 未知のカテゴリ
+        """
+        unknown = sorted(set(extra) - set(KEYWORD_CATEGORIES))
+        if unknown:
+            raise ValueError(
+                f"Unknown keyword category: {', '.join(unknown)} (choose from {', '.join(KEYWORD_CATEGORIES)})"
+            )
+        return DetectionKeywords(
+            login_queries=tuple(query.extended(extra.get(query.key, ())) for query in self.login_queries),
+            download=self.download + tuple(extra.get("download", ())),
+            next_page=self.next_page + tuple(extra.get("next_page", ())),
+            custom=self.custom + tuple(extra.get("custom", ())),
+        )
+
+
+DEFAULT_KEYWORDS = DetectionKeywords()
+
+
+def parse_keywords(spec: str) -> dict[str, list[str]]:
+    """
+    --keywords の値（カンマ区切り）をカテゴリごとに分ける。
+
+    "カテゴリ:キーワード" はそのカテゴリに追加し、それ以外（カテゴリ名で始まらないもの）は custom とする。
+
+    Args:
+        spec: 例: "next_page:weiter,download:xlsx,会員登録"
+
+    Returns:
+        カテゴリ -> キーワード
+    """
+    extra: dict[str, list[str]] = defaultdict(list)
+    for item in spec.split(","):
+        item = item.strip()
+        category, sep, keyword = item.partition(":")
+        if sep and category in KEYWORD_CATEGORIES and keyword.strip():
+            extra[category].append(keyword.strip())
+        elif item:
+            extra["custom"].append(item)
+    return dict(extra)
+
+
+def load_keywords_file(path: str | Path) -> dict[str, list[str]]:
+    """
+    キーワードファイル（JSON）を読み込む。
+
+    形式: {"next_page": ["weiter", "suivant"], "submit_button": ["anmelden"], "custom": ["会員登録"]}
+    （キーワードのリストだけの場合は custom とする）
+
+    Args:
+        path: JSON ファイルパス
+
+    Returns:
+        カテゴリ -> キーワード
+
+    Raises:
+        ValueError: 形式が不正
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {"custom": data}
+    if not isinstance(data, dict) or not all(
+        isinstance(keywords, list) and all(isinstance(keyword, str) for keyword in keywords)
+        for keywords in data.values()
+    ):
+        raise ValueError(f"Invalid keywords file: {path} (expected {{category: [keyword, ...]}})")
+    return data
+
+
+@dataclass(eq=False, slots=True)
+class Element:
+    """パーサーに依存しない要素レコード（検出に必要なタグ名・属性と、インデックス上の範囲のみ保持）"""
+
+    name: str
+    attrs: dict[str, Any]  # class は BeautifulSoup と同じくリスト
+    position: int  # 文書順の番号
+    text_span: tuple[int, int] = (0, 0)  # 部分木の文字列の範囲（文字列番号）
+    row_span: tuple[int, int] = (0, 0)  # table のみ: 配下の tr の範囲
+    cell_span: tuple[int, int] = (0, 0)  # tr のみ: 配下の th / td の範囲
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """属性値（`Tag.get()` と同じ）"""
+        return self.attrs.get(key, default)
+
+
+class DomIndex:
+    """
+    解析済みツリーを1回だけ走査して作る要素インデックス。
+
+    各検出メソッドが `find_all()` でツリーを繰り返し走査する代わりに、このインデックスを参照する。
+    要素はパーサーに依存しない `Element` として保持し、リストはすべて文書順。
+
+    テキストは文書全体の文字列（`get_text(strip=True)` と同じく空白を除いた文字列の連結）を1つ作り、
+    要素ごとにその範囲（開始・終了位置）だけを保持する。要素のテキストは部分文字列の切り出し、
+    キーワード照合は `KeywordMatcher` の結合済み正規表現を小文字化した文書文字列の範囲（pos・endpos）に
+    適用して1回の検索で求めるため、入れ子の要素で部分木を何度も連結せず、キーワードごとの検索もしない。
+    """
+
+    def __init__(self) -> None:
+        """初期化（空のインデックス。`from_soup()` / `from_lxml()` で作成する）"""
+        self.by_tag: dict[str, list[Element]] = defaultdict(list)
+        self.by_attr: dict[str, dict[str, list[Element]]] = {attr: defaultdict(list) for attr in INDEXED_ATTRS}
+        self.traversals = 0
+        self._text = ""
+        self._lowered = ""
+        self._strings: list[str] = []
+        self._lowered_strings: list[str] = []
+        self._offsets: list[int] = [0]
+        self._lowered_offsets: list[int] = [0]
+        # 部分木内の tr / th・td は文書順の一覧の連続した範囲になるため、範囲だけを保持する
+        self._rows: list[Element] = []
+        self._cells: list[Element] = []
+        # 開いている要素と、開始時点の (文字列数, tr 数, th・td 数)
+        self._open: list[tuple[Element, int, int, int]] = []
+        self._count = 0
+
+    @classmethod
+    def from_soup(cls, soup: BeautifulSoup) -> "DomIndex":
+        """
+        BeautifulSoup のツリーからインデックスを作成。
+
+        Args:
+            soup: 解析済みのツリー
+
+        Returns:
+            インデックス
+        """
+        index = cls()
+        index.traversals += 1
+        open_tags: list[Tag] = []
+        for node in soup.descendants:
+            # 文書順の走査なので、直前までに開いた要素のうち node の親でないものは部分木が終わっている
+            while open_tags and open_tags[-1] is not node.parent:
+                open_tags.pop()
+                index._end()
+            if isinstance(node, Tag):
+                open_tags.append(node)
+                index._start(node.name, node.attrs)
+            elif isinstance(node, NavigableString) and type(node) in _TEXT_STRING_TYPES:
+                index._add_text(node)
+        index._finish()
+        return index
+
+    @classmethod
+    def from_lxml(cls, html: str) -> "DomIndex":
+        """
+        lxml で直接解析してインデックスを作成（BeautifulSoup のツリーを作らない）。
+
+        Args:
+            html: HTMLテキスト
+
+        Returns:
+            インデックス
+        """
+        try:
+            import lxml.html
+            from lxml import etree
+        except ImportError:
+            print("Error: lxml not installed. Run: pip install lxml")
+            sys.exit(1)
+
+        index = cls()
+        if not html.strip():
+            return index
+        # 文字列として渡すと encoding 宣言付きの文書を受け付けないため、UTF-8 のバイト列で渡す。
+        # huge_tree: 入れ子の深いページ（レイアウト用テーブル等）が libxml2 の深さ制限で打ち切られないようにする
+        parser = lxml.html.HTMLParser(encoding="utf-8", huge_tree=True)
+        root = lxml.html.document_fromstring(html.encode("utf-8"), parser=parser)
+        index.traversals += 1
+        raw_depth = 0  # script・style 等の内側では文字列を含めない
+        for event, node in etree.iterwalk(root, events=("start", "end", "comment", "pi")):
+            if event == "start":
+                attrs: dict[str, Any] = dict(node.attrib)
+                if "class" in attrs:
+                    attrs["class"] = attrs["class"].split()
+                index._start(node.tag, attrs)
+                if node.tag in RAW_TEXT_TAGS:
+                    raw_depth += 1
+                if node.text and not raw_depth:
+                    index._add_text(node.text)
+                continue
+            if event == "end":
+                if node.tag in RAW_TEXT_TAGS:
+                    raw_depth -= 1
+                index._end()
+            # コメント・処理命令は本文を含めず、後続の文字列（tail）のみ含める
+            if node.tail and not raw_depth:
+                index._add_text(node.tail)
+        index._finish()
+        return index
+
+    def _start(self, name: str, attrs: dict[str, Any]) -> None:
+        """要素の開始を登録（タグ・属性のインデックスに追加）（内部用）"""
+        elem = Element(name=name, attrs=attrs, position=self._count)
+        self._count += 1
+        self.by_tag[name].append(elem)
+        for attr in INDEXED_ATTRS:
+            value = attrs.get(attr)
+            if value is None:
+                continue
+            for item in value if isinstance(value, list) else [value]:
+                self.by_attr[attr][item.lower()].append(elem)
+
+        self._open.append((elem, len(self._strings), len(self._rows), len(self._cells)))
+        if name == "tr":
+            self._rows.append(elem)
+        elif name in ("th", "td"):
+            self._cells.append(elem)
+
+    def _add_text(self, text: str) -> None:
+        """文字列を追加（空白を除いて空なら無視）（内部用）"""
+        stripped = text.strip()
+        if stripped:
+            lowered = stripped.lower()
+            self._strings.append(stripped)
+            self._lowered_strings.append(lowered)
+            self._offsets.append(self._offsets[-1] + len(stripped))
+            # 小文字化で長さが変わる文字があるため、小文字側の位置は別に持つ
+            self._lowered_offsets.append(self._lowered_offsets[-1] + len(lowered))
+
+    def _end(self) -> None:
+        """最後に開いた要素の終了を登録（テキスト・行・セルの範囲を確定）（内部用）"""
+        elem, string_start, row_start, cell_start = self._open.pop()
+        elem.text_span = (string_start, len(self._strings))
+        if elem.name == "table":
+            elem.row_span = (row_start, len(self._rows))
+        elif elem.name == "tr":
+            elem.cell_span = (cell_start, len(self._cells))
+
+    def _finish(self) -> None:
+        """未終了の要素を閉じ、文書全体の文字列を作成（内部用）"""
+        while self._open:
+            self._end()
+        self._text = "".join(self._strings)
+        self._lowered = "".join(self._lowered_strings)
+        self._strings, self._lowered_strings = [], []
+
+    def row_count(self, table: Element) -> int:
+        """テーブル配下の tr の数（入れ子のテーブルを含む。`len(table.find_all("tr"))` と同じ）"""
+        start, end = table.row_span
+        return end - start
+
+    def first_row(self, table: Element) -> Element | None:
+        """テーブル配下の最初の tr（なければ None）"""
+        start, end = table.row_span
+        return self._rows[start] if end > start else None
+
+    def cells(self, row: Element, limit: int | None = None) -> list[Element]:
+        """
+        行配下の th / td（`row.find_all(["th", "td"])` と同じ）。
+
+        Args:
+            row: tr 要素
+            limit: 最大件数（省略時: 全件）
+
+        Returns:
+            セル要素のリスト
+        """
+        start, end = row.cell_span
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._cells[start:end]
+
+    def text(self, elem: Element, limit: int | None = None) -> str:
+        """
+        要素のテキスト（`get_text(strip=True)` と同じ値）。
+
+        Args:
+            elem: 要素
+            limit: 最大文字数（表示用に先頭だけ必要な場合。省略時: 全体）
+
+        Returns:
+            テキスト
+        """
+        start, end = self._offsets[elem.text_span[0]], self._offsets[elem.text_span[1]]
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._text[start:end]
+
+    def text_search(self, elem: Element, matcher: KeywordMatcher) -> str | None:
+        """
+        要素のテキスト（小文字化）に最初に現れるキーワード。
+
+        Args:
+            elem: 要素
+            matcher: キーワード
+
+        Returns:
+            一致したキーワード。一致しなければ None
+        """
+        start, end = self._lowered_offsets[elem.text_span[0]], self._lowered_offsets[elem.text_span[1]]
+        return matcher.search(self._lowered, start, end)
+
+    def tags(self, *names: str) -> list[Element]:
+        """
+        指定タグの要素（文書順）。
+
+        Args:
+            *names: タグ名
+
+        Returns:
+            要素のリスト（`soup.find_all([...])` と同じ順序）
+        """
+        if len(names) == 1:
+            return self.by_tag.get(names[0], [])
+        elements = [elem for name in dict.fromkeys(names) for elem in self.by_tag.get(name, [])]
+        return sorted(elements, key=lambda elem: elem.position)
+
+    def attr_equals(self, attr: str, values: list[str]) -> list[Element]:
+        """属性値（小文字化）が values のいずれかに一致する要素"""
+        index = self.by_attr[attr]
+        return [elem for value in values for elem in index.get(value.lower(), [])]
+
+    def attr_contains(self, attr: str, matcher: KeywordMatcher) -> list[Element]:
+        """属性値（小文字化）がキーワードのいずれかを含む要素（属性値の種類数だけ照合）"""
+        return [elem for value, elements in self.by_attr[attr].items() if matcher.search(value) for elem in elements]
+
 
 class SelectorDetector:
     """HTMLからセレクタを自動検出"""
 
-    def __init__(self, html: str) -> None:
+    def __init__(
+        self, html: str | BeautifulSoup, parser: str = "html.parser", keywords: DetectionKeywords = DEFAULT_KEYWORDS
+    ) -> None:
         """
-        初期化。
+        初期化（解析とインデックス作成）。
 
         Args:
-            html: HTMLテキスト
+            html: HTMLテキスト、または解析済みのツリー
+            parser: パーサー（"html.parser" / "lxml" / "lxml-native"。解析済みのツリーを渡した場合は無視）
+            keywords: 検出に使うキーワード（`DEFAULT_KEYWORDS.extended(...)` で追加）
+
+        Raises:
+            ValueError: 未対応のパーサー
         """
-        self.soup = BeautifulSoup(html, "html.parser")
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser: {parser!r} (choose from {', '.join(PARSERS)})")
+        self.soup: BeautifulSoup | None = None
+        if isinstance(html, BeautifulSoup):
+            self.soup = html
+        elif parser == "lxml-native":
+            self.index = DomIndex.from_lxml(html)
+        else:
+            try:
+                self.soup = BeautifulSoup(html, parser)
+            except FeatureNotFound:
+                print(f"Error: {parser} not installed. Run: pip install {parser}")
+                sys.exit(1)
+        if self.soup is not None:
+            self.index = DomIndex.from_soup(self.soup)
+        self.keywords = keywords
         self.selectors: dict[str, Any] = {}
 
     def detect_login_form(self) -> dict[str, str] | None:
@@ -50,34 +604,11 @@ class SelectorDetector:
         """
         login_form = {}
 
-        # フォーム要素検出
-        form = self._find_element_by_keywords(["form"], id_pattern=["login", "auth"])
-        if form:
-            login_form["form"] = self._get_css_selector(form)
-
-        # メール入力フィールド
-        email_input = self._find_element_by_keywords(
-            ["input"],
-            type_pattern=["email", "text"],
-            id_pattern=["email", "loginId", "username"],
-            name_pattern=["email", "loginId", "username"],
-        )
-        if email_input:
-            login_form["email_input"] = self._get_css_selector(email_input)
-
-        # パスワード入力フィールド
-        password_input = self._find_element_by_keywords(
-            ["input"], type_pattern=["password"], id_pattern=["password", "passwd"], name_pattern=["password", "passwd"]
-        )
-        if password_input:
-            login_form["password_input"] = self._get_css_selector(password_input)
-
-        # ログインボタン
-        submit_button = self._find_element_by_keywords(
-            ["button", "input"], type_pattern=["submit"], text_pattern=["login", "sign in", "log in"]
-        )
-        if submit_button:
-            login_form["submit_button"] = self._get_css_selector(submit_button)
+        # フォーム・メール入力・パスワード入力・ログインボタン
+        for query in self.keywords.login_queries:
+            elem = self._find_element_by_keywords(query)
+            if elem:
+                login_form[query.key] = self._get_css_selector(elem)
 
         return login_form if login_form else None
 
@@ -98,11 +629,12 @@ class SelectorDetector:
         download_links = []
 
         # href に "download" / "zip" / "csv" を含むリンク
-        for link in self.soup.find_all("a"):
+        matcher = self.keywords.download_matcher
+        for link in self.index.tags("a"):
             href = link.get("href", "")
-            text = link.get_text(strip=True)
+            text = self.index.text(link, limit=50)
 
-            if any(keyword in href.lower() for keyword in ["download", "zip", "csv", "export"]):
+            if matcher.search(href.lower()):
                 download_links.append(
                     {
                         "text": text[:50],  # 最初の50文字
@@ -113,12 +645,12 @@ class SelectorDetector:
 
         return download_links if download_links else None
 
-    def detect_buttons_by_text(self, text_patterns: list[str]) -> list[dict[str, str]] | None:
+    def detect_buttons_by_text(self, text_patterns: list[str] | KeywordMatcher) -> list[dict[str, str]] | None:
         """
         テキストパターンでボタンを検出。
 
         Args:
-            text_patterns: マッチするテキストパターン（例: ["Next", "続ける"]）
+            text_patterns: マッチするテキストパターン（例: ["Next", "続ける"]）、またはコンパイル済みの KeywordMatcher
 
         Returns:
             [{
@@ -128,11 +660,10 @@ class SelectorDetector:
         """
         buttons = []
 
-        for button in self.soup.find_all(["button", "a"]):
-            text = button.get_text(strip=True).lower()
-
-            if any(pattern.lower() in text for pattern in text_patterns):
-                buttons.append({"text": button.get_text(strip=True)[:50], "selector": self._get_css_selector(button)})
+        matcher = text_patterns if isinstance(text_patterns, KeywordMatcher) else KeywordMatcher(text_patterns)
+        for button in self.index.tags("button", "a"):
+            if self.index.text_search(button, matcher):
+                buttons.append({"text": self.index.text(button, limit=50), "selector": self._get_css_selector(button)})
 
         return buttons if buttons else None
 
@@ -150,7 +681,7 @@ class SelectorDetector:
         """
         inputs = []
 
-        for input_elem in self.soup.find_all("input"):
+        for input_elem in self.index.tags("input"):
             input_type = input_elem.get("type", "text")
             name = input_elem.get("name", "")
             elem_id = input_elem.get("id", "")
@@ -181,96 +712,79 @@ class SelectorDetector:
         """
         tables = []
 
-        for table in self.soup.find_all("table"):
-            rows = table.find_all("tr")
-            headers = [th.get_text(strip=True) for th in rows[0].find_all(["th", "td"])] if rows else []
+        for table in self.index.tags("table"):
+            first_row = self.index.first_row(table)
+            # 出力は最初の10列のみのため、10セルを超えて取得しない
+            headers = [self.index.text(th) for th in self.index.cells(first_row, limit=10)] if first_row else []
 
             tables.append(
                 {
                     "selector": self._get_css_selector(table),
-                    "rows_count": len(rows),
-                    "columns": headers[:10],  # 最初の10列のみ
+                    "rows_count": self.index.row_count(table),
+                    "columns": headers,
                 }
             )
 
         return tables if tables else None
 
-    def _find_element_by_keywords(
-        self,
-        tags: list[str],
-        id_pattern: list[str] | None = None,
-        name_pattern: list[str] | None = None,
-        type_pattern: list[str] | None = None,
-        text_pattern: list[str] | None = None,
-    ) -> Any:
-        """複数パターンで要素検出（内部用）"""
-        for tag in tags:
-            for elem in self.soup.find_all(tag):
-                elem_id = elem.get("id", "").lower()
-                elem_name = elem.get("name", "").lower()
-                elem_type = elem.get("type", "").lower()
-                elem_text = elem.get_text(strip=True).lower()
-
-                # ID マッチ
-                if id_pattern and any(p.lower() in elem_id for p in id_pattern):
-                    return elem
+    def detect_keyword_matches(self) -> list[dict[str, str]] | None:
+        """
+        custom キーワードを id / name / type（a・button はテキストも）に含む要素を検出。
 
-                # name マッチ
-                if name_pattern and any(p.lower() in elem_name for p in name_pattern):
-                    return elem
+        Returns:
+            [{
+                "keyword": "会員登録",
+                "tag": "a",
+                "text": "会員登録はこちら",
+                "selector": "a.signup"
+            }]
+        """
+        matcher = self.keywords.custom_matcher
+        if not matcher:
+            return None
+        matches = []
+
+        for elem in self.index.tags(*KEYWORD_TAGS):
+            keyword = attr_keyword(elem, matcher)
+            if keyword is None and elem.name in ("a", "button"):
+                keyword = self.index.text_search(elem, matcher)
+            if keyword is not None:
+                matches.append(
+                    {
+                        "keyword": keyword,
+                        "tag": elem.name,
+                        "text": self.index.text(elem, limit=50),
+                        "selector": self._get_css_selector(elem),
+                    }
+                )
 
-                # type マッチ
-                if type_pattern and any(p.lower() == elem_type for p in type_pattern):
+        return matches if matches else None
+
+    def _find_element_by_keywords(self, query: LoginQuery) -> Element | None:
+        """条件に一致する要素を検出（内部用）"""
+        # id / name / type の条件はインデックスから一度に求める（要素ごとの比較は不要）
+        matched: set[Element] = set()
+        if query.id_matcher:
+            matched.update(self.index.attr_contains("id", query.id_matcher))
+        if query.name_matcher:
+            matched.update(self.index.attr_contains("name", query.name_matcher))
+        if query.type_pattern:
+            matched.update(self.index.attr_equals("type", list(query.type_pattern)))
+        text_matcher = query.text_matcher
+
+        # 文書順で最初に条件を満たす要素（テキストは属性で決まらない要素のみ照合）
+        for tag in query.tags:
+            for elem in self.index.tags(tag):
+                if elem in matched:
                     return elem
-
-                # テキストマッチ
-                if text_pattern and any(p.lower() in elem_text for p in text_pattern):
+                if text_matcher and self.index.text_search(elem, text_matcher):
                     return elem
 
         return None
 
-    def _get_css_selector(self, elem: Any) -> str:
-        """
-        HTML要素から CSS セレクタを生成。
-
-        Args:
-            elem: BeautifulSoup要素
-
-        Returns:
-            CSS セレクタ文字列
-        """
-        # ID が存在する場合は ID を使用（最も特定的）
-        elem_id = elem.get("id")
-        if elem_id:
-            return f"#{elem_id}"
-
-        # class が存在する場合
-        classes = elem.get("class", [])
-        if classes:
-            return f".{'.'.join(classes[:2])}"  # 最初の2クラスまで
-
-        # name が存在する場合
-        name = elem.get("name")
-        if name:
-            elem_type = elem.get("type", "")
-            if elem_type:
-                return f"{elem.name}[name='{name}'][type='{elem_type}']"
-            return f"{elem.name}[name='{name}']"
-
-        # type 属性で特定
-        elem_type = elem.get("type")
-        if elem_type:
-            return f"{elem.name}[type='{elem_type}']"
-
-        # テキストで特定（最後の手段）
-        text = elem.get_text(strip=True)[:30]
-        if text:
-            # Playwright 推奨の text= セレクタを使用
-            safe_text = text.replace('"', '\\"')
-            return f'{elem.name} >> text="{safe_text}"'
-
-        # デフォルト
-        return elem.name
+    def _get_css_selector(self, elem: Element) -> str:
+        """HTML要素から CSS セレクタを生成（内部用）"""
+        return css_selector(elem, self.index.text(elem, limit=30))
 
     def detect_all(self) -> dict[str, Any]:
         """
@@ -282,7 +796,8 @@ class SelectorDetector:
                 "download_links": [...],
                 "input_fields": [...],
                 "tables": [...],
-                "next_page_buttons": [...]
+                "next_page_buttons": [...],
+                "keyword_matches": [...]  # custom キーワードがある場合のみ
             }
         """
         result = {}
@@ -303,37 +818,152 @@ class SelectorDetector:
         if tables:
             result["tables"] = tables
 
-        next_buttons = self.detect_buttons_by_text(["next", "続く", "次", ">>"])
+        next_buttons = self.detect_buttons_by_text(self.keywords.next_page_matcher)
         if next_buttons:
             result["next_page_buttons"] = next_buttons
 
+        keyword_matches = self.detect_keyword_matches()
+        if keyword_matches:
+            result["keyword_matches"] = keyword_matches
+
         return result
 
 
+def attr_keyword(elem: Element, matcher: KeywordMatcher) -> str | None:
+    """id / name / type（小文字化）に最初に現れるキーワード"""
+    for attr in ("id", "name", "type"):
+        value = elem.get(attr)
+        if value:
+            keyword = matcher.search(str(value).lower())
+            if keyword is not None:
+                return keyword
+    return None
+
+
+def css_selector(elem: Element, text: str) -> str:
+    """
+    HTML要素から CSS セレクタを生成。
+
+    Args:
+        elem: 要素
+        text: 要素のテキストの先頭30文字（id・class・name・type がない場合に使用）
+
+    Returns:
+        CSS セレクタ文字列
+    """
+    # ID が存在する場合は ID を使用（最も特定的）
+    elem_id = elem.get("id")
+    if elem_id:
+        return f"#{elem_id}"
+
+    # class が存在する場合
+    classes = elem.get("class", [])
+    if classes:
+        return f".{'.'.join(classes[:2])}"  # 最初の2クラスまで
+
+    # name が存在する場合
+    name = elem.get("name")
+    if name:
+        elem_type = elem.get("type", "")
+        if elem_type:
+            return f"{elem.name}[name='{name}'][type='{elem_type}']"
+        return f"{elem.name}[name='{name}']"
+
+    # type 属性で特定
+    elem_type = elem.get("type")
+    if elem_type:
+        return f"{elem.name}[type='{elem_type}']"
+
+    # テキストで特定（最後の手段）
+    text = text[:30]
+    if text:
+        # Playwright 推奨の text= セレクタを使用
+        safe_text = text.replace('"', '\\"')
+        return f'{elem.name} >> text="{safe_text}"'
+
+    # デフォルト
+    return elem.name
+
+
 def main() -> None:
     """コマンドラインインターフェース"""
     parser = argparse.ArgumentParser(description="HTMLからセレクタ候補を自動抽出")
-    parser.add_argument("html_file", help="HTMLファイルパス")
-    parser.add_argument("--output", "-o", default="selectors.json", help="出力ファイル（デフォルト: selectors.json）")
-    parser.add_argument("--keywords", help="検出対象キーワード（カンマ区切り）")
+    parser.add_argument("html_file", help="HTMLファイルパス（ディレクトリ・glob パターンの場合は一括検出）")
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="出力ファイル（デフォルト: selectors.json、一括検出時は selectors.jsonl）",
+    )
+    parser.add_argument(
+        "--keywords",
+        help="追加キーワード（カンマ区切り。カテゴリ:キーワード で既存の検出に追加、他は keyword_matches に出力）",
+    )
+    parser.add_argument("--keywords-file", help="追加キーワードの JSON ファイル（{カテゴリ: [キーワード, ...]}）")
+    parser.add_argument("--parser", choices=PARSERS, default="html.parser", help="パーサー（デフォルト: html.parser）")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="ファイル全体を読み込まずに逐次検出（巨大なファイル向け、--parser は無視）",
+    )
+
+    parser.add_argument("--workers", type=int, help="一括検出のワーカープロセス数（デフォルト: CPU コア数）")
+    parser.add_argument("--force", action="store_true", help="一括検出で前回の結果を使わず、全ファイルを検出し直す")
 
     args = parser.parse_args()
 
+    # 追加キーワード（ファイル → --keywords の順に追加）
+    extra: dict[str, list[str]] = defaultdict(list)
+    try:
+        for source in (
+            load_keywords_file(args.keywords_file) if args.keywords_file else {},
+            parse_keywords(args.keywords) if args.keywords else {},
+        ):
+            for category, words in source.items():
+                extra[category].extend(words)
+        keywords = DEFAULT_KEYWORDS.extended(extra)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # ディレクトリ・glob パターンは一括検出
+    from batch_detector import detect_batch, is_batch_target
+
+    if is_batch_target(args.html_file):
+        result = detect_batch(
+            args.html_file,
+            args.output or "selectors.jsonl",
+            parser=args.parser,
+            workers=args.workers,
+            stream=args.stream,
+            force=args.force,
+            keywords=extra,
+        )
+        print(
+            f"✅ {result.total} files: {result.detected} detected, {result.skipped} unchanged, "
+            f"{result.failed} failed ({result.elapsed_s:.1f}s) -> {result.output}"
+        )
+        sys.exit(1 if result.failed else 0)
+
     # HTML ファイル読み込み
     html_path = Path(args.html_file)
     if not html_path.exists():
         print(f"Error: File not found: {html_path}")
         sys.exit(1)
 
-    with html_path.open("r", encoding="utf-8") as f:
-        html_content = f.read()
-
     # セレクタ検出
-    detector = SelectorDetector(html_content)
-    selectors = detector.detect_all()
+    if args.stream:
+        from streaming_detector import detect_stream
+
+        selectors = detect_stream(html_path, keywords=keywords)
+    else:
+        with html_path.open("r", encoding="utf-8") as f:
+            html_content = f.read()
+
+        detector = SelectorDetector(html_content, parser=args.parser, keywords=keywords)
+        selectors = detector.detect_all()
 
     # 結果出力
-    output_path = Path(args.output)
+    output_path = Path(args.output or "selectors.json")
     with output_path.open("w", encoding="utf-8") as f:
         json.dump(selectors, f, ensure_ascii=False, indent=2)
 
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Streaming Detector - 巨大なHTMLファイルからセレクタ候補を逐次抽出
+
+`SelectorDetector` はファイル全体を読み込んでツリーを作るため、数百 MB のエクスポートページ
+（巨大なテーブル・無限スクロールの保存ページ等）ではメモリが不足する。
+ファイルをチャンク単位で `html.parser.HTMLParser` に入力し、開始タグ・終了タグ・文字列のイベントごとに
+各検出を進める。保持するのは開いている要素と、検出に必要な小さな状態
+（テキストの先頭数十文字・キーワード照合用の末尾・テーブルの行数等）だけで、ツリーは作らない。
+
+出力は `SelectorDetector(html).detect_all()`（html.parser）と同じ。
+ただしテーブルの列見出しは先頭 column_chars 文字まで（レイアウト用テーブルで文書全体を保持しないため）。
+
+使用方法:
+    python selector_detector.py huge.html --stream
+
+    from streaming_detector import detect_stream
+    selectors = detect_stream("huge.html")
+
+依存:
+    - beautifulsoup4（空要素タグの定義のみ使用）
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any
+
+from bs4.builder import HTMLTreeBuilder
+
+from selector_detector import (
+    DEFAULT_KEYWORDS,
+    KEYWORD_TAGS,
+    RAW_TEXT_TAGS,
+    DetectionKeywords,
+    Element,
+    KeywordMatcher,
+    LoginQuery,
+    attr_keyword,
+    css_selector,
+)
+
+# 終了タグを持たない要素（BeautifulSoup と同じ定義）
+_VOID_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS or ())
+
+# テキストの先頭を保持する要素と文字数（出力・セレクタ生成に使う分のみ）
+_PREFIX_CHARS = {"a": 50, "button": 50, "form": 30, "input": 30, "table": 30}
+
+# 次ページボタン・custom キーワードの照合パターン名
+_NEXT_PAGE = "next_page"
+_CUSTOM = "custom"
+
+
+@dataclass(eq=False, slots=True)
+class _OpenElement:
+    """開いている要素と、そのテキストから求める状態（内部用）"""
+
+    element: Element
+    prefix_limit: int = 0
+    prefix: str = ""  # テキストの先頭（prefix_limit 文字まで）
+    patterns: dict[str, KeywordMatcher] = field(default_factory=dict)  # テキストと照合するキーワード
+    matched: set[str] = field(default_factory=set)  # 条件を満たしたパターン名（属性による一致を含む）
+    keyword: str | None = None  # 一致した custom キーワード
+    pending: str | None = None  # custom キーワードの確定待ちのテキスト（小文字）
+    pending_size: int = 0  # 確定に必要な pending の文字数
+    window: str = ""  # 文字列の境界をまたぐ一致を見つけるための末尾（小文字）
+    window_size: int = 0
+    closed: bool = False
+
+    def needs_text(self) -> bool:
+        """まだテキストを受け取る必要があるか"""
+        return len(self.prefix) < self.prefix_limit or any(key not in self.matched for key in self.patterns)
+
+
+@dataclass(eq=False, slots=True)
+class _OpenTable:
+    """開いているテーブルの状態（内部用）"""
+
+    record: _OpenElement
+    row_start: int  # 開始時点の tr の総数
+    first_row: _OpenElement | None = None
+    headers: list[_OpenElement] = field(default_factory=list)  # 最初の行の th / td（最大10）
+
+
+class StreamingSelectorDetector(HTMLParser):
+    """HTMLParser のイベントから `SelectorDetector.detect_all()` と同じ結果を逐次求める検出器"""
+
+    def __init__(self, column_chars: int = 200, keywords: DetectionKeywords = DEFAULT_KEYWORDS) -> None:
+        """
+        初期化。
+
+        Args:
+            column_chars: テーブルの列見出しとして保持する最大文字数
+            keywords: 検出に使うキーワード（`SelectorDetector` と同じ）
+        """
+        super().__init__(convert_charrefs=True)
+        self.column_chars = column_chars
+        self.keywords = keywords
+        self._stack: list[_OpenElement] = []
+        self._open_counts: Counter[str] = Counter()
+        self._already_closed: Counter[str] = Counter()  # 終了タグを処理済みの空要素（後続の </input> 等を無視する）
+        self._collectors: list[_OpenElement] = []  # テキストを受け取る開いている要素
+        self._raw_depth = 0  # script・style 等の内側ではテキストを含めない
+        self._position = 0
+        self._rows_seen = 0
+
+        # 文字列の連結（BeautifulSoup と同じく、タグ・コメント等で区切られるまでを1つの文字列として strip する）
+        self._run_started = False
+        self._run_space = ""  # 文字列の末尾の空白（続きがあれば出力し、文字列が終われば捨てる）
+
+        self._tables: list[_OpenTable] = []
+        self._awaiting_row: list[_OpenTable] = []  # 最初の tr が未出現のテーブル
+        self._header_tables: list[_OpenTable] = []  # 最初の tr が開いていて、列見出しが10未満のテーブル
+
+        self._login: dict[tuple[str, str], tuple[int, str]] = {}  # (キー, タグ) -> (位置, セレクタ)
+        self._downloads: list[tuple[int, dict[str, str]]] = []
+        self._inputs: list[tuple[int, dict[str, str]]] = []
+        self._table_results: list[tuple[int, dict[str, Any]]] = []
+        self._next_buttons: list[tuple[int, dict[str, str]]] = []
+        self._keyword_matches: list[tuple[int, dict[str, str]]] = []
+
+    def close(self) -> None:
+        """入力の終わり（未終了の要素を閉じる）"""
+        super().close()
+        self._end_run()
+        while self._stack:
+            self._pop()
+
+    def result(self) -> dict[str, Any]:
+        """
+        検出結果（`close()` の後に呼ぶ）。
+
+        Returns:
+            `SelectorDetector.detect_all()` と同じ形式の辞書
+        """
+        result: dict[str, Any] = {}
+
+        login_form = {}
+        for query in self.keywords.login_queries:
+            for tag in query.tags:
+                best = self._login.get((query.key, tag))
+                if best:
+                    login_form[query.key] = best[1]
+                    break
+        if login_form:
+            result["login_form"] = login_form
+
+        # 終了時に記録したものは入れ子の要素が先になるため、開始位置（文書順）に並べ直す
+        for key, items in (
+            ("download_links", sorted(self._downloads, key=lambda item: item[0])),
+            ("input_fields", self._inputs),
+            ("tables", sorted(self._table_results, key=lambda item: item[0])),
+            ("next_page_buttons", sorted(self._next_buttons, key=lambda item: item[0])),
+            ("keyword_matches", sorted(self._keyword_matches, key=lambda item: item[0])),
+        ):
+            if items:
+                result[key] = [item for _, item in items]
+        return result
+
+    # --- HTMLParser のイベント ---
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._start(tag, attrs, handle_empty_element=True)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._start(tag, attrs, handle_empty_element=False)
+        self._end(tag, check_already_closed=False)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._end(tag, check_already_closed=True)
+
+    def handle_data(self, data: str) -> None:
+        if self._raw_depth:
+            return
+        if not self._run_started:
+            data = data.lstrip()
+            if not data:
+                return
+            self._run_started = True
+        body = data.rstrip()
+        if not body:
+            self._run_space += data
+            return
+        self._emit(self._run_space + body)
+        self._run_space = data[len(body) :]
+
+    def handle_comment(self, data: str) -> None:
+        self._end_run()
+
+    def handle_decl(self, decl: str) -> None:
+        self._end_run()
+
+    def handle_pi(self, data: str) -> None:
+        self._end_run()
+
+    def unknown_decl(self, data: str) -> None:
+        self._end_run()
+        # CDATA は script 等の内側でもテキストに含まれる（BeautifulSoup の CData と同じ）
+        if data.upper().startswith("CDATA["):
+            text = data[len("CDATA[") :].strip()
+            if text:
+                self._emit(text)
+
+    # --- 内部処理 ---
+
+    def _start(self, tag: str, attrs: list[tuple[str, str | None]], handle_empty_element: bool) -> None:
+        """開始タグ（内部用）"""
+        self._end_run()
+        attr_dict: dict[str, Any] = {key: "" if value is None else value for key, value in attrs}
+        if "class" in attr_dict:
+            attr_dict["class"] = attr_dict["class"].split()
+        record = _OpenElement(Element(name=tag, attrs=attr_dict, position=self._position))
+        self._position += 1
+        self._stack.append(record)
+        self._open_counts[tag] += 1
+        if tag in RAW_TEXT_TAGS:
+            self._raw_depth += 1
+
+        self._configure(record)
+        if tag == "table":
+            table = _OpenTable(record=record, row_start=self._rows_seen)
+            self._tables.append(table)
+            self._awaiting_row.append(table)
+        elif tag == "tr":
+            self._rows_seen += 1
+            for table in self._awaiting_row:
+                table.first_row = record
+                self._header_tables.append(table)
+            self._awaiting_row.clear()
+        elif tag in ("th", "td") and self._header_tables:
+            for table in self._header_tables:
+                table.headers.append(record)
+            record.prefix_limit = max(record.prefix_limit, self.column_chars)
+            self._header_tables = [table for table in self._header_tables if len(table.headers) < 10]
+        if record.needs_text():
+            self._collectors.append(record)
+
+        if handle_empty_element and tag in _VOID_TAGS:
+            # html.parser は空要素の終了イベントを送らないため、ここで閉じる（後続の </input> 等は無視）
+            self._end(tag, check_already_closed=False)
+            self._already_closed[tag] += 1
+
+    def _configure(self, record: _OpenElement) -> None:
+        """要素の属性から一致する条件を求め、必要なテキストの状態を設定（内部用）"""
+        elem = record.element
+        record.prefix_limit = _PREFIX_CHARS.get(elem.name, 0)
+        for query in self.keywords.login_queries:
+            if elem.name not in query.tags:
+                continue
+            if _attrs_match(elem, query):
+                record.matched.add(query.key)
+            elif query.text_matcher:
+                record.patterns[query.key] = query.text_matcher
+        if elem.name in ("button", "a") and self.keywords.next_page_matcher:
+            record.patterns[_NEXT_PAGE] = self.keywords.next_page_matcher
+        custom = self.keywords.custom_matcher
+        if custom and elem.name in KEYWORD_TAGS:
+            record.prefix_limit = max(record.prefix_limit, 50)
+            record.keyword = attr_keyword(elem, custom)
+            if record.keyword is not None:
+                record.matched.add(_CUSTOM)
+            elif elem.name in ("button", "a"):
+                record.patterns[_CUSTOM] = custom
+        if record.patterns:
+            record.window_size = max(matcher.max_length for matcher in record.patterns.values()) - 1
+
+    def _emit(self, text: str) -> None:
+        """空白を除いた文字列の一部を、テキストを受け取る開いている要素に渡す（内部用）"""
+        lowered: str | None = None
+        finished = False
+        for record in self._collectors:
+            if len(record.prefix) < record.prefix_limit:
+                record.prefix += text[: record.prefix_limit - len(record.prefix)]
+            if record.patterns:
+                lowered = lowered if lowered is not None else text.lower()
+                window = record.window + lowered
+                for key, matcher in record.patterns.items():
+                    if key in record.matched:
+                        continue
+                    if key == _CUSTOM:
+                        self._search_keyword(record, matcher, window, lowered)
+                    elif matcher.search(window) is not None:
+                        record.matched.add(key)
+                record.window = window[-record.window_size :] if record.window_size > 0 else ""
+            finished = finished or not record.needs_text()
+        if finished:
+            self._collectors = [record for record in self._collectors if record.needs_text()]
+
+    def _search_keyword(self, record: _OpenElement, matcher: KeywordMatcher, window: str, lowered: str) -> None:
+        """
+        custom キーワードをテキストと照合（内部用）。
+
+        `SelectorDetector` はテキスト全体で最も前から始まる（同じ位置なら最も長い）キーワードを返す。
+        最初に見つかった一致より前から・同じ位置から始まる長いキーワードが後続の文字列で完成しうるため、
+        その範囲（一致位置の前後キーワード長まで）のテキストが揃うか要素が閉じるまで確定しない。
+        """
+        if record.pending is None:
+            found = matcher.find(window)
+            if found is None:
+                return
+            start = max(0, found[0] - matcher.max_length + 1)
+            record.pending = window[start:]
+            record.pending_size = found[0] - start + matcher.max_length
+        else:
+            record.pending += lowered
+        if len(record.pending) >= record.pending_size:
+            self._resolve_keyword(record)
+
+    def _resolve_keyword(self, record: _OpenElement) -> None:
+        """確定待ちの custom キーワードを確定（内部用）"""
+        assert record.pending is not None
+        record.keyword = self.keywords.custom_matcher.search(record.pending)
+        record.matched.add(_CUSTOM)
+        record.pending = None
+
+    def _end_run(self) -> None:
+        """文字列の終わり（末尾の空白を捨てる）（内部用）"""
+        self._run_started = False
+        self._run_space = ""
+
+    def _end(self, tag: str, check_already_closed: bool) -> None:
+        """終了タグ（開いている同名の要素まで閉じる。なければ無視）（内部用）"""
+        if check_already_closed and self._already_closed[tag]:
+            self._already_closed[tag] -= 1
+            return
+        self._end_run()
+        if not self._open_counts[tag]:
+            return
+        while self._stack:
+            if self._pop().element.name == tag:
+                break
+
+    def _pop(self) -> _OpenElement:
+        """最後に開いた要素を閉じて検出を確定（内部用）"""
+        record = self._stack.pop()
+        record.closed = True
+        name = record.element.name
+        self._open_counts[name] -= 1
+        if name in RAW_TEXT_TAGS:
+            self._raw_depth -= 1
+        if record in self._collectors:
+            self._collectors.remove(record)
+        if record.pending is not None:
+            self._resolve_keyword(record)
+        if name == "tr":
+            self._header_tables = [table for table in self._header_tables if table.first_row is not record]
+        self._finish(record)
+        return record
+
+    def _finish(self, record: _OpenElement) -> None:
+        """閉じた要素を各検出に反映（内部用）"""
+        elem = record.element
+        name, position = elem.name, elem.position
+        selector: str | None = None
+
+        def get_selector() -> str:
+            nonlocal selector
+            if selector is None:
+                selector = css_selector(elem, record.prefix)
+            return selector
+
+        for query in self.keywords.login_queries:
+            if query.key in record.matched and name in query.tags:
+                best = self._login.get((query.key, name))
+                if best is None or position < best[0]:
+                    self._login[(query.key, name)] = (position, get_selector())
+
+        if name == "a":
+            href = elem.get("href", "")
+            if self.keywords.download_matcher.search(href.lower()):
+                self._downloads.append(
+                    (position, {"text": record.prefix[:50], "href": href, "selector": get_selector()})
+                )
+        elif name == "input":
+            self._inputs.append(
+                (
+                    position,
+                    {
+                        "type": elem.get("type", "text"),
+                        "name": elem.get("name", ""),
+                        "id": elem.get("id", ""),
+                        "placeholder": elem.get("placeholder", ""),
+                        "selector": get_selector(),
+                    },
+                )
+            )
+        elif name == "table":
+            table = self._tables.pop()
+            if table in self._awaiting_row:
+                self._awaiting_row.remove(table)
+            if table in self._header_tables:
+                self._header_tables.remove(table)
+            self._table_results.append(
+                (
+                    position,
+                    {
+                        "selector": get_selector(),
+                        "rows_count": self._rows_seen - table.row_start,
+                        "columns": [cell.prefix for cell in table.headers],
+                    },
+                )
+            )
+        if _NEXT_PAGE in record.matched:
+            self._next_buttons.append((position, {"text": record.prefix[:50], "selector": get_selector()}))
+        if record.keyword is not None:
+            self._keyword_matches.append(
+                (
+                    position,
+                    {"keyword": record.keyword, "tag": name, "text": record.prefix[:50], "selector": get_selector()},
+                )
+            )
+
+
+def _attrs_match(elem: Element, query: LoginQuery) -> bool:
+    """id / name の部分一致、type の完全一致（小文字で比較）（内部用）"""
+    return (
+        query.id_matcher.search(str(elem.get("id", "")).lower()) is not None
+        or query.name_matcher.search(str(elem.get("name", "")).lower()) is not None
+        or str(elem.get("type", "")).lower() in query.type_values
+    )
+
+
+def detect_stream(
+    path: str | Path, chunk_size: int = 1 << 20, column_chars: int = 200, keywords: DetectionKeywords = DEFAULT_KEYWORDS
+) -> dict[str, Any]:
+    """
+    HTMLファイルを逐次読み込んでセレクタ候補を検出。
+
+    Args:
+        path: HTMLファイルパス
+        chunk_size: 1回に読み込む文字数
+        column_chars: テーブルの列見出しとして保持する最大文字数
+        keywords: 検出に使うキーワード（`SelectorDetector` と同じ）
+
+    Returns:
+        `SelectorDetector.detect_all()` と同じ形式の辞書
+    """
+    detector = StreamingSelectorDetector(column_chars=column_chars, keywords=keywords)
+    with Path(path).open("r", encoding="utf-8") as f:
+        while chunk := f.read(chunk_size):
+            detector.feed(chunk)
+    detector.close()
+    return detector.result()
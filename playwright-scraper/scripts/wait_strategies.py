@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Wait Strategies - ページ遷移後の待機条件
+
+一律の `wait_for_load_state("networkidle")` は、ロングポーリングや計測ビーコンのあるサイトでは
+数秒余分に待つか、タイムアウトまで収束しない。呼び出しごとに最も安価で確実な条件を選べるよう、
+待機条件を差し替え可能なオブジェクトとして提供する。
+
+    | 戦略 | 完了条件 | 用途 |
+    |---|---|---|
+    | `LoadStateWait("domcontentloaded")` | DOM 構築完了 | サーバーレンダリングのページ |
+    | `LocatorWait(".result-list")` | 要素の表示 | SPA・非同期描画（推奨） |
+    | `ResponseWait("**/api/items*")` | 特定レスポンスの受信 | API 応答で描画されるページ |
+    | `NetworkIdleWait(quiet_cap_ms=3000)` | 通信の収束（上限付き） | 条件が特定できない場合 |
+
+使用方法:
+    scraper.login(url, ..., wait=LocatorWait(".welcome-message"))
+    scraper.goto(list_url, wait=ResponseWait(lambda r: "/api/items" in r.url and r.ok))
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, Protocol
+
+# Playwright は型注釈にのみ使用（basic_scraper の import を軽くするため、実行時は使用箇所で読み込む）
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, Response
+
+logger = logging.getLogger(__name__)
+
+
+class WaitStrategy(Protocol):
+    """待機条件のインターフェース"""
+
+    @property
+    def name(self) -> str:
+        """計測・ログ用の名前"""
+        ...
+
+    def run(self, page: Page, action: Callable[[], object] | None, timeout_ms: float) -> bool:
+        """
+        action（クリック・遷移等）を実行し、完了条件まで待機。
+
+        Args:
+            page: 対象ページ
+            action: 待機のきっかけとなる操作（None: 遷移は開始済み）
+            timeout_ms: タイムアウト（ミリ秒）
+
+        Returns:
+            完了条件を満たした場合 True、上限で打ち切った場合 False
+        """
+        ...
+
+
+@dataclass(frozen=True)
+class LoadStateWait:
+    """ロード状態（load / domcontentloaded / networkidle）を待機"""
+
+    state: Literal["load", "domcontentloaded", "networkidle"] = "domcontentloaded"
+
+    @property
+    def name(self) -> str:
+        return self.state
+
+    def run(self, page: Page, action: Callable[[], object] | None, timeout_ms: float) -> bool:
+        if action:
+            action()
+        page.wait_for_load_state(self.state, timeout=timeout_ms)
+        return True
+
+
+@dataclass(frozen=True)
+class LocatorWait:
+    """特定要素の状態（表示等）を待機"""
+
+    selector: str
+    state: Literal["attached", "detached", "hidden", "visible"] = "visible"
+
+    @property
+    def name(self) -> str:
+        return "locator"
+
+    def run(self, page: Page, action: Callable[[], object] | None, timeout_ms: float) -> bool:
+        if action:
+            action()
+        page.locator(self.selector).first.wait_for(state=self.state, timeout=timeout_ms)
+        return True
+
+
+@dataclass(frozen=True)
+class ResponseWait:
+    """
+    条件に合うレスポンスの受信を待機。
+
+    action なし（遷移開始済み）で呼ばれた場合は待つべきレスポンスが既に過ぎている可能性があるため、
+    domcontentloaded で代替する。
+    """
+
+    predicate: str | re.Pattern[str] | Callable[[Response], bool]
+
+    @property
+    def name(self) -> str:
+        return "response"
+
+    def run(self, page: Page, action: Callable[[], object] | None, timeout_ms: float) -> bool:
+        if action is None:
+            page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+            return True
+        with page.expect_response(self.predicate, timeout=timeout_ms):
+            action()
+        return True
+
+
+@dataclass(frozen=True)
+class NetworkIdleWait:
+    """
+    networkidle を待機（quiet_cap_ms で待機時間に上限）。
+
+    上限指定時は domcontentloaded まで待った後、networkidle を最大 quiet_cap_ms だけ待ち、
+    収束しなくてもエラーにせず処理を続ける。上限なしは従来の `wait_for_load_state("networkidle")` と同じ。
+    """
+
+    quiet_cap_ms: float | None = None
+
+    @property
+    def name(self) -> str:
+        return "networkidle" if self.quiet_cap_ms is None else "networkidle_capped"
+
+    def run(self, page: Page, action: Callable[[], object] | None, timeout_ms: float) -> bool:
+        if action:
+            action()
+        if self.quiet_cap_ms is None:
+            page.wait_for_load_state("networkidle", timeout=timeout_ms)
+            return True
+
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+        try:
+            page.wait_for_load_state("networkidle", timeout=min(self.quiet_cap_ms, timeout_ms))
+            return True
+        except PlaywrightTimeoutError:
+            logger.debug(f"networkidle not reached within {self.quiet_cap_ms} ms; continuing")
+            return False
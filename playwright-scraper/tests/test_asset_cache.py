@@ -0,0 +1,200 @@
+"""asset_cache.AssetCache のテスト（Route / Request は最小限の偽物で代用）"""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from asset_cache import AssetCache, freshness_lifetime
+
+URL = "https://cdn.example.com/app.js"
+NOW = 1_700_000_000.0
+
+
+class FakeContext:
+    def __init__(self, cookies: list[dict[str, str]]) -> None:
+        self._cookies = cookies
+
+    def cookies(self, url: str) -> list[dict[str, str]]:
+        return self._cookies
+
+
+class FakeRequest:
+    def __init__(self, url: str = URL, cookies: list[dict[str, str]] | None = None, **headers: str) -> None:
+        self.url = url
+        self.method = "GET"
+        self.resource_type = "script"
+        self.headers = headers
+        context = FakeContext(cookies or [])
+        self.frame = type("Frame", (), {"page": type("Page", (), {"context": context})()})()
+
+
+class FakeResponse:
+    def __init__(self, status: int, headers: dict[str, str], body: bytes = b"") -> None:
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    def body(self) -> bytes:
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, request: FakeRequest, *responses: FakeResponse) -> None:
+        self.request = request
+        self.responses = list(responses)
+        self.fetched: list[dict[str, str]] = []
+        self.fulfilled: dict[str, Any] | None = None
+
+    def fetch(self, headers: dict[str, str]) -> FakeResponse:
+        self.fetched.append(headers)
+        return self.responses.pop(0)
+
+    def fulfill(self, **kwargs: Any) -> None:
+        self.fulfilled = kwargs
+
+    def fallback(self) -> None:
+        self.fulfilled = {"fallback": True}
+
+
+def _served_body(route: FakeRoute) -> bytes:
+    assert route.fulfilled is not None
+    if "path" in route.fulfilled:
+        return Path(route.fulfilled["path"]).read_bytes()
+    return bytes(route.fulfilled["body"])
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Iterator[AssetCache]:
+    cache = AssetCache(tmp_path / "cache")
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"cache-control": "max-age=600"}, 600.0),
+        ({"cache-control": "no-cache, max-age=600"}, 0.0),
+        ({"cache-control": "no-store"}, None),
+        ({"cache-control": "private, max-age=600"}, None),
+        ({"cache-control": "max-age=600", "vary": "Cookie"}, None),
+        ({"cache-control": "max-age=600", "vary": "Accept-Encoding"}, 600.0),
+        ({"date": "Tue, 14 Nov 2023 22:13:20 GMT", "expires": "Tue, 14 Nov 2023 23:13:20 GMT"}, 3600.0),
+        ({"date": "Tue, 14 Nov 2023 22:13:20 GMT", "last-modified": "Tue, 14 Nov 2023 12:13:20 GMT"}, 3600.0),
+        ({}, 0.0),
+    ],
+)
+def test_freshness_lifetime(headers: dict[str, str], expected: float | None) -> None:
+    assert freshness_lifetime(headers, NOW) == expected
+
+
+def test_heuristic_lifetime_is_capped() -> None:
+    headers = {"date": "Tue, 14 Nov 2023 22:13:20 GMT", "last-modified": "Mon, 01 Jan 2001 00:00:00 GMT"}
+    assert freshness_lifetime(headers, NOW) == 24 * 60 * 60
+
+
+def test_fresh_entry_is_served_from_disk(cache: AssetCache) -> None:
+    cache.handle(FakeRoute(FakeRequest(), FakeResponse(200, {"cache-control": "max-age=600"}, b"v1")))
+
+    route = FakeRoute(FakeRequest())
+    cache.handle(route)
+
+    assert route.fetched == []
+    assert _served_body(route) == b"v1"
+    assert (cache.stats.misses, cache.stats.hits, cache.stats.stored) == (1, 1, 1)
+
+
+def test_stale_entry_is_revalidated_with_etag(cache: AssetCache) -> None:
+    cache.handle(FakeRoute(FakeRequest(), FakeResponse(200, {"etag": '"v1"', "cache-control": "no-cache"}, b"v1")))
+
+    route = FakeRoute(FakeRequest(), FakeResponse(304, {"cache-control": "no-cache"}))
+    cache.handle(route)
+
+    assert route.fetched[0]["if-none-match"] == '"v1"'
+    assert _served_body(route) == b"v1"
+    assert cache.stats.revalidated == 1
+
+
+def test_changed_resource_replaces_entry(cache: AssetCache) -> None:
+    cache.handle(FakeRoute(FakeRequest(), FakeResponse(200, {"etag": '"v1"', "cache-control": "no-cache"}, b"v1")))
+    cache.handle(FakeRoute(FakeRequest(), FakeResponse(200, {"etag": '"v2"', "cache-control": "no-cache"}, b"v2")))
+
+    route = FakeRoute(FakeRequest(), FakeResponse(304, {}))
+    cache.handle(route)
+
+    assert route.fetched[0]["if-none-match"] == '"v2"'
+    assert _served_body(route) == b"v2"
+
+
+def test_missing_object_is_fetched_without_validators(cache: AssetCache) -> None:
+    cache.handle(FakeRoute(FakeRequest(), FakeResponse(200, {"etag": '"v1"', "cache-control": "no-cache"}, b"v1")))
+    for path in cache.objects_dir.rglob("*"):
+        if path.is_file():
+            path.unlink()
+
+    route = FakeRoute(FakeRequest(), FakeResponse(200, {"etag": '"v1"', "cache-control": "no-cache"}, b"v1"))
+    cache.handle(route)
+
+    assert "if-none-match" not in route.fetched[0]
+    assert _served_body(route) == b"v1"
+
+
+def test_object_removed_during_revalidation_is_refetched(cache: AssetCache) -> None:
+    cache.handle(FakeRoute(FakeRequest(), FakeResponse(200, {"etag": '"v1"', "cache-control": "no-cache"}, b"v1")))
+    route = FakeRoute(
+        FakeRequest(), FakeResponse(304, {}), FakeResponse(200, {"etag": '"v1"', "cache-control": "no-cache"}, b"v1")
+    )
+    fetch = route.fetch
+
+    def fetch_and_evict(headers: dict[str, str]) -> FakeResponse:
+        response = fetch(headers)
+        cache.clear()  # 304 を受け取る前に他プロセスが削除した状況
+        return response
+
+    route.fetch = fetch_and_evict  # type: ignore[method-assign]
+    cache.handle(route)
+
+    assert len(route.fetched) == 2
+    assert "if-none-match" not in route.fetched[1]
+    assert _served_body(route) == b"v1"
+
+
+@pytest.mark.parametrize(
+    ("request_", "headers", "stored"),
+    [
+        (FakeRequest(), {"cache-control": "private, max-age=600"}, 0),
+        (FakeRequest(authorization="Bearer token"), {"cache-control": "max-age=600"}, 0),
+        (FakeRequest(cookies=[{"name": "sid"}]), {"cache-control": "max-age=600"}, 0),
+        (FakeRequest(cookies=[{"name": "sid"}]), {"cache-control": "public, max-age=600"}, 1),
+        (FakeRequest(), {}, 0),  # 期限も検証子もない
+    ],
+)
+def test_uncacheable_responses_are_not_stored(
+    cache: AssetCache, request_: FakeRequest, headers: dict[str, str], stored: int
+) -> None:
+    route = FakeRoute(request_, FakeResponse(200, headers, b"body"))
+    cache.handle(route)
+
+    assert _served_body(route) == b"body"
+    assert cache.stats.stored == stored
+
+
+def test_non_cacheable_requests_fall_back(cache: AssetCache) -> None:
+    request = FakeRequest()
+    request.resource_type = "document"
+    route = FakeRoute(request)
+    cache.handle(route)
+    assert route.fulfilled == {"fallback": True}
+
+
+def test_lru_eviction_keeps_total_under_limit(tmp_path: Path) -> None:
+    cache = AssetCache(tmp_path / "cache", max_bytes=10)
+    try:
+        for name in ("a", "b", "c"):
+            response = FakeResponse(200, {"cache-control": "max-age=600"}, b"12345")
+            cache.handle(FakeRoute(FakeRequest(f"https://cdn.example.com/{name}.js"), response))
+        assert cache.total_bytes() <= 10
+        assert cache.stats.evicted == 1
+    finally:
+        cache.close()
@@ -0,0 +1,86 @@
+"""batch_detector.detect_batch のテスト"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from batch_detector import detect_batch, hash_file, iter_html_files
+from change_tracker import hash_content
+
+PAGE = '<html><body><form><input type="email" name="email"><button>ログイン</button></form>{}</body></html>'
+
+
+def _read(output: Path) -> dict[str, dict[str, Any]]:
+    lines = output.read_text(encoding="utf-8").splitlines()
+    return {record["file"]: record for record in map(json.loads, lines)}
+
+
+@pytest.fixture
+def pages(tmp_path: Path) -> Path:
+    root = tmp_path / "snapshots"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.html").write_text(PAGE.format("a"), encoding="utf-8")
+    (root / "b.htm").write_text(PAGE.format("b"), encoding="utf-8")
+    (root / "sub" / "c.html").write_text(PAGE.format('<a href="/c.csv">CSV</a>'), encoding="utf-8")
+    (root / "notes.txt").write_text("not html", encoding="utf-8")
+    return root
+
+
+def test_iter_html_files_lists_directory_and_glob(pages: Path) -> None:
+    assert [path.name for path in iter_html_files(str(pages))] == ["a.html", "b.htm", "c.html"]
+    assert [path.name for path in iter_html_files(str(pages / "*.html"))] == ["a.html"]
+
+
+def test_hash_file_matches_hash_content(pages: Path) -> None:
+    path = pages / "a.html"
+    assert hash_file(path) == hash_content(path.read_bytes())
+
+
+def test_second_run_skips_unchanged_files(pages: Path, tmp_path: Path) -> None:
+    output = tmp_path / "selectors.jsonl"
+    first = detect_batch(str(pages), output, workers=2)
+    assert (first.detected, first.skipped, first.failed) == (3, 0, 0)
+    before = _read(output)
+
+    (pages / "b.htm").write_text(PAGE.format("changed"), encoding="utf-8")
+    second = detect_batch(str(pages), output, workers=2)
+
+    assert (second.detected, second.skipped, second.failed) == (1, 2, 0)
+    after = _read(output)
+    assert after[str(pages / "a.html")] == before[str(pages / "a.html")]
+    assert after[str(pages / "b.htm")]["sha256"] != before[str(pages / "b.htm")]["sha256"]
+    assert "download_links" in after[str(pages / "sub" / "c.html")]["selectors"]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"force": True}, {"stream": True}, {"parser": "lxml"}, {"keywords": {"custom": ["email"]}}],
+    ids=["force", "stream", "parser", "keywords"],
+)
+def test_changed_settings_detect_again(pages: Path, tmp_path: Path, options: dict[str, Any]) -> None:
+    if options.get("parser") == "lxml":
+        pytest.importorskip("lxml")
+    output = tmp_path / "selectors.jsonl"
+    detect_batch(str(pages), output, workers=1)
+
+    result = detect_batch(str(pages), output, workers=1, **options)
+
+    assert (result.detected, result.skipped) == (3, 0)
+
+
+def test_failed_file_is_recorded_and_retried(pages: Path, tmp_path: Path) -> None:
+    (pages / "a.html").write_bytes(b"\xff\xfe invalid utf-8")
+    output = tmp_path / "selectors.jsonl"
+
+    first = detect_batch(str(pages), output, workers=1)
+    assert (first.detected, first.failed) == (2, 1)
+    assert "error" in _read(output)[str(pages / "a.html")]
+
+    second = detect_batch(str(pages), output, workers=1)
+    assert (second.detected, second.skipped, second.failed) == (0, 2, 1)
+
+
+def test_unknown_keyword_category_is_rejected(pages: Path, tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        detect_batch(str(pages), tmp_path / "selectors.jsonl", keywords={"unknown": ["x"]})
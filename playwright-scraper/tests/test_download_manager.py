@@ -0,0 +1,88 @@
+"""download_manager.DownloadManager.store_file のテスト"""
+
+import hashlib
+from pathlib import Path
+
+import download_manager
+import pytest
+from download_manager import DownloadManager
+
+
+@pytest.fixture
+def manager(tmp_path: Path) -> DownloadManager:
+    return DownloadManager(tmp_path / "downloads")
+
+
+def _write(path: Path, data: bytes) -> Path:
+    path.write_bytes(data)
+    return path
+
+
+def test_store_file_moves_into_store_and_links(manager: DownloadManager) -> None:
+    source = _write(manager.incoming_dir / "download", b"report")
+
+    record = manager.store_file(source, "report.csv", "https://example.com/report.csv")
+
+    sha256 = hashlib.sha256(b"report").hexdigest()
+    object_path = manager.store_dir / sha256[:2] / sha256
+    assert record.sha256 == sha256
+    assert record.size == len(b"report")
+    assert not record.duplicate
+    assert not source.exists()
+    assert Path(record.path).samefile(object_path)
+    assert list(manager.incoming_dir.iterdir()) == []
+
+
+def test_store_file_skips_duplicate_content(manager: DownloadManager) -> None:
+    first = manager.store_file(_write(manager.incoming_dir / "a", b"same"), "data.zip")
+    second = manager.store_file(_write(manager.incoming_dir / "b", b"same"), "data.zip")
+
+    assert second.duplicate
+    assert second.path == first.path
+    assert list(manager.incoming_dir.iterdir()) == []
+
+
+def test_store_file_numbers_names_with_different_content(manager: DownloadManager) -> None:
+    first = manager.store_file(_write(manager.incoming_dir / "a", b"v1"), "data.zip")
+    second = manager.store_file(_write(manager.incoming_dir / "b", b"v2"), "data.zip")
+
+    assert Path(first.path).name == "data.zip"
+    assert Path(second.path).name == "data-1.zip"
+    assert Path(second.path).read_bytes() == b"v2"
+
+
+def test_store_file_hashes_while_copying_across_filesystems(
+    manager: DownloadManager, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail_hash(path: Path) -> tuple[str, int]:
+        raise AssertionError("copy path must not re-read the file")
+
+    # 別ファイルシステム扱いにしてコピー経路を通し、再読み込みしないことを確認
+    monkeypatch.setattr(download_manager, "_hash_file", fail_hash)
+    real_stat = Path.stat
+
+    def fake_stat(self: Path, **kwargs: bool):  # type: ignore[no-untyped-def]
+        result = real_stat(self, **kwargs)
+        if self == source:
+            return type(result)((*result[:2], result.st_dev + 1, *result[3:]))
+        return result
+
+    source = _write(tmp_path / "elsewhere", b"x" * 3_000_000)
+    monkeypatch.setattr(Path, "stat", fake_stat)
+
+    record = manager.store_file(source, "big.bin")
+
+    assert record.sha256 == hashlib.sha256(b"x" * 3_000_000).hexdigest()
+    assert record.size == 3_000_000
+    assert not source.exists()
+
+
+def test_move_to_reserved_does_not_overwrite_same_name(tmp_path: Path) -> None:
+    from basic_scraper import _move_to_reserved
+
+    (tmp_path / "report.csv").write_bytes(b"old")
+    target = _move_to_reserved(_write(tmp_path / "incoming", b"new"), tmp_path, "report.csv")
+
+    assert target.name == "report-1.csv"
+    assert target.read_bytes() == b"new"
+    assert (tmp_path / "report.csv").read_bytes() == b"old"
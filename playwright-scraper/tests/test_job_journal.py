@@ -0,0 +1,161 @@
+"""job_journal.JobJournal と run_sharded(journal=...) のテスト"""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from job_journal import JobJournal
+from parallel_runner import run_sharded
+
+
+class FakeScraper:
+    """ブラウザを起動しないスクレイパー（ワーカープロセスで使用）"""
+
+    def __init__(self, **kwargs: Any) -> None:
+        pass
+
+    def launch(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _record_and_double(scraper: Any, job: tuple[str, int]) -> int:
+    """実行したジョブをファイルに記録して値を2倍にする（ワーカープロセスで実行）"""
+    log_path, value = job
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(f"{value}\n")
+    return value * 2
+
+
+def _crash_once(scraper: Any, job: tuple[str, int]) -> int:
+    """初回だけワーカープロセスを異常終了させる（ワーカープロセスで実行）"""
+    marker, value = job
+    if value == 2 and not os.path.exists(marker):
+        Path(marker).touch()
+        os._exit(1)
+    return value * 2
+
+
+def _always_crash(scraper: Any, job: tuple[str, int]) -> int:
+    """値 2 のジョブで毎回ワーカープロセスを異常終了させる（ワーカープロセスで実行）"""
+    if job[1] == 2:
+        os._exit(1)
+    return job[1] * 2
+
+
+def _job_key(job: tuple[str, int]) -> str:
+    return str(job[1])
+
+
+@pytest.fixture
+def journal(tmp_path: Path) -> Iterator[JobJournal]:
+    journal = JobJournal(tmp_path / "journal.sqlite", job_id="test")
+    yield journal
+    journal.close()
+
+
+def test_pending_skips_done_units_in_order(journal: JobJournal) -> None:
+    journal.mark_done("b", result={"rows": 2})
+    journal.mark_failed("c", "timeout")
+    assert journal.pending(["a", "b", "c", "d"]) == ["a", "c", "d"]
+    assert journal.is_done("b")
+    assert not journal.is_done("c")
+    assert journal.result("b") == {"rows": 2}
+    assert journal.result("c") is None
+    assert journal.counts() == {"done": 1, "failed": 1}
+
+
+def test_failed_unit_can_be_retried_and_completed(journal: JobJournal) -> None:
+    journal.mark_failed("a", "timeout")
+    journal.mark_done("a", result="ok")
+    assert journal.pending(["a"]) == []
+    assert journal.counts() == {"done": 1}
+
+
+def test_jobs_are_isolated_and_reset(tmp_path: Path, journal: JobJournal) -> None:
+    other = JobJournal(tmp_path / "journal.sqlite", job_id="other")
+    try:
+        journal.mark_done("a")
+        journal.save_cursor("list", "https://example.com/?page=3", pages_done=2)
+        assert other.pending(["a"]) == ["a"]
+        assert other.cursor("list") is None
+
+        cursor = journal.cursor("list")
+        assert cursor is not None
+        assert (cursor.url, cursor.pages_done, cursor.finished) == ("https://example.com/?page=3", 2, False)
+
+        journal.reset()
+        assert journal.pending(["a"]) == ["a"]
+        assert journal.cursor("list") is None
+    finally:
+        other.close()
+
+
+def test_journal_survives_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "journal.sqlite"
+    first = JobJournal(path, job_id="test")
+    first.mark_done("a", result=[1, 2])
+    first.close()
+
+    reopened = JobJournal(path, job_id="test")
+    try:
+        assert reopened.done_units() == {"a"}
+        assert reopened.result("a") == [1, 2]
+    finally:
+        reopened.close()
+
+
+def test_run_sharded_resumes_without_rerunning_done_jobs(tmp_path: Path, journal: JobJournal) -> None:
+    log_path = str(tmp_path / "executed.log")
+    jobs = [(log_path, value) for value in range(1, 6)]
+    journal.mark_done("1", result=2)
+    journal.mark_done("3", result=6)
+
+    result = run_sharded(
+        jobs, _record_and_double, processes=2, journal=journal, job_key=_job_key, scraper_cls=FakeScraper
+    )
+
+    assert result.results == [2, 4, 6, 8, 10]
+    assert result.resumed == 2
+    assert result.errors == []
+    executed = sorted(int(line) for line in Path(log_path).read_text(encoding="utf-8").split())
+    assert executed == [2, 4, 5]
+    assert journal.done_units() == {"1", "2", "3", "4", "5"}
+
+
+def test_run_sharded_requeues_job_of_dead_worker(tmp_path: Path, journal: JobJournal) -> None:
+    marker = str(tmp_path / "crashed")
+    jobs = [(marker, value) for value in range(1, 5)]
+
+    result = run_sharded(
+        jobs, _crash_once, processes=2, journal=journal, job_key=_job_key, scraper_cls=FakeScraper, job_timeout_s=30
+    )
+
+    assert os.path.exists(marker)
+    assert result.results == [2, 4, 6, 8]
+    assert result.errors == []
+    assert journal.done_units() == {"1", "2", "3", "4"}
+
+
+def test_run_sharded_fails_job_after_crash_retries(tmp_path: Path, journal: JobJournal) -> None:
+    jobs = [("", value) for value in range(1, 4)]
+
+    result = run_sharded(
+        jobs,
+        _always_crash,
+        processes=2,
+        max_crash_retries=1,
+        journal=journal,
+        job_key=_job_key,
+        scraper_cls=FakeScraper,
+        job_timeout_s=30,
+    )
+
+    assert result.results == [2, None, 6]
+    assert [(error.index, error.error) for error in result.errors] == [(1, "worker process died")]
+    assert journal.counts() == {"done": 2, "failed": 1}
+    assert journal.pending(["1", "2", "3"]) == ["2"]
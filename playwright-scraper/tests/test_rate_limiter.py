@@ -0,0 +1,111 @@
+"""rate_limiter.HostScheduler のテスト"""
+
+import asyncio
+import time
+
+import pytest
+from rate_limiter import HostPolicy, HostScheduler, host_of
+
+
+def test_host_of_accepts_url_or_host() -> None:
+    assert host_of("https://example.com:8443/path?q=1") == "example.com"
+    assert host_of("example.com") == "example.com"
+
+
+def test_token_bucket_allows_burst_then_limits_rate() -> None:
+    scheduler = HostScheduler(default_policy=HostPolicy(rate_per_s=20, burst=3, max_concurrency=10))
+    started: list[float] = []
+
+    async def task() -> None:
+        async with scheduler.slot("https://example.com/a"):
+            started.append(time.monotonic())
+
+    async def main() -> float:
+        begin = time.monotonic()
+        for _ in range(7):
+            await task()
+        return begin
+
+    begin = asyncio.run(main())
+    offsets = [at - begin for at in started]
+    # バースト分（3件）は待たずに開始し、残り4件はトークン補充（20件/秒 = 50ms 間隔）を待つ
+    assert offsets[2] < 0.03
+    assert offsets[-1] == pytest.approx(4 / 20, abs=0.05)
+    assert scheduler.report()["example.com"]["requests"] == 7
+
+
+def test_concurrency_is_capped_per_host() -> None:
+    policy = HostPolicy(rate_per_s=1000, burst=100, initial_concurrency=2, max_concurrency=2)
+    scheduler = HostScheduler(default_policy=policy)
+    running = {"a.example.com": 0, "b.example.com": 0}
+    peak = dict(running)
+
+    async def task(host: str) -> None:
+        async with scheduler.slot(host):
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+            await asyncio.sleep(0.01)
+            running[host] -= 1
+
+    async def main() -> None:
+        await asyncio.gather(*(task(host) for host in running for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == {"a.example.com": 2, "b.example.com": 2}
+
+
+def test_aimd_increases_additively_and_halves_on_throttle() -> None:
+    policy = HostPolicy(initial_concurrency=2, max_concurrency=4, backoff_s=0.1)
+    scheduler = HostScheduler(default_policy=policy)
+    host = "example.com"
+
+    # 現在の同時実行数ぶん成功するごとに +1（上限 max_concurrency）
+    for _ in range(2):
+        scheduler.feedback(host, 200)
+    assert scheduler.concurrency(host) == 3
+    for _ in range(3):
+        scheduler.feedback(host, 200)
+    assert scheduler.concurrency(host) == 4
+    for _ in range(10):
+        scheduler.feedback(host, 200)
+    assert scheduler.concurrency(host) == 4
+
+    scheduler.feedback(host, 429)
+    assert scheduler.concurrency(host) == 2
+    scheduler.feedback(host, 503)
+    assert scheduler.concurrency(host) == 1
+    scheduler.feedback(host, 429)
+    assert scheduler.concurrency(host) == 1  # min_concurrency で止まる
+    assert scheduler.report()[host]["throttled"] == 3
+
+
+def test_errors_do_not_change_concurrency() -> None:
+    scheduler = HostScheduler(default_policy=HostPolicy(initial_concurrency=3))
+    scheduler.feedback("example.com", 500)
+    scheduler.feedback("example.com", 0)
+    scheduler.feedback("example.com", 404)
+    assert scheduler.concurrency("example.com") == 3
+    assert scheduler.report()["example.com"]["errors"] == 2
+
+
+def test_throttle_pauses_host_for_retry_after() -> None:
+    scheduler = HostScheduler(default_policy=HostPolicy(rate_per_s=1000, burst=10))
+
+    async def main() -> float:
+        scheduler.feedback("slow.example.com", 429, retry_after="1")
+        begin = time.monotonic()
+        async with scheduler.slot("fast.example.com"):
+            assert time.monotonic() - begin < 0.1  # 他のホストは止まらない
+        async with scheduler.slot("slow.example.com"):
+            return time.monotonic() - begin
+
+    assert asyncio.run(main()) == pytest.approx(1.0, abs=0.15)
+
+
+def test_per_host_policy_overrides_default() -> None:
+    scheduler = HostScheduler(
+        default_policy=HostPolicy(initial_concurrency=4),
+        policies={"api.example.com": HostPolicy(initial_concurrency=1, max_concurrency=1)},
+    )
+    assert scheduler.concurrency("https://www.example.com/") == 4
+    assert scheduler.concurrency("https://api.example.com/v1") == 1
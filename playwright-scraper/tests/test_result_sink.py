@@ -0,0 +1,143 @@
+"""result_sink.ResultSink のテスト"""
+
+import csv
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+from result_sink import ResultSink
+
+
+def _records(count: int) -> list[dict[str, Any]]:
+    return [{"id": i, "title": f"item {i}"} for i in range(count)]
+
+
+def test_jsonl_writes_all_records_in_batches(tmp_path: Path) -> None:
+    path = tmp_path / "items.jsonl"
+    with ResultSink(path, batch_size=3) as sink:
+        assert sink.write_many(_records(10)) == 10
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == _records(10)
+    assert sink.records_written == 10
+    assert sink.batches_written == 4  # 3 + 3 + 3 + 1（残りは close() で書き込む）
+
+
+def test_csv_uses_first_record_keys_and_appends_without_header(tmp_path: Path) -> None:
+    path = tmp_path / "items.csv"
+    with ResultSink(path, batch_size=2) as sink:
+        sink.write({"title": "a", "url": "https://example.com/a"})
+        sink.write({"title": "b", "url": "https://example.com/b", "extra": "ignored"})
+    with ResultSink(path, append=True) as sink:
+        sink.write({"url": "https://example.com/c", "title": "c"})
+
+    with path.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ["title", "url"],
+        ["a", "https://example.com/a"],
+        ["b", "https://example.com/b"],
+        ["c", "https://example.com/c"],
+    ]
+
+
+def test_flush_makes_buffered_records_visible(tmp_path: Path) -> None:
+    path = tmp_path / "items.jsonl"
+    with ResultSink(path, batch_size=100) as sink:
+        sink.write_many(_records(5))
+        assert path.read_text(encoding="utf-8") == ""
+        sink.flush()
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_write_blocks_while_pending_batches_are_full(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    sink = ResultSink(tmp_path / "items.jsonl", batch_size=1, max_pending_batches=1)
+    release = threading.Event()
+    original = sink._write_batch
+
+    def slow_write(batch: list[dict[str, Any]]) -> None:
+        release.wait(timeout=10)
+        original(batch)
+
+    monkeypatch.setattr(sink, "_write_batch", slow_write)
+    writer = threading.Thread(target=sink.write_many, args=(_records(5),))
+    writer.start()
+    # 書き込み中の1件 + キューの1件 + submit 待ちの1件で止まり、残りは write() で待機する
+    writer.join(timeout=0.5)
+    assert writer.is_alive()
+    assert sink.records_written == 0
+
+    release.set()
+    writer.join(timeout=10)
+    assert not writer.is_alive()
+    sink.close()
+    assert sink.records_written == 5
+
+
+def test_writer_error_is_raised_to_caller(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    sink = ResultSink(tmp_path / "items.jsonl", batch_size=1)
+
+    def broken_write(batch: list[dict[str, Any]]) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(sink, "_write_batch", broken_write)
+    sink.write({"id": 1})
+    with pytest.raises(RuntimeError, match="disk full"):
+        sink.flush()
+    with pytest.raises(RuntimeError, match="disk full"):
+        sink.write({"id": 2})
+    with pytest.raises(RuntimeError, match="disk full"):
+        sink.close()
+
+
+def test_write_after_close_is_rejected(tmp_path: Path) -> None:
+    sink = ResultSink(tmp_path / "items.jsonl")
+    sink.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        sink.write({"id": 1})
+
+
+def test_unknown_suffix_requires_format(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="format="):
+        ResultSink(tmp_path / "items.txt")
+
+
+def test_parquet_promotes_null_columns_and_casts_later_batches(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "items.parquet"
+    with ResultSink(path, batch_size=2) as sink:
+        sink.write_many(
+            [
+                {"id": 1, "price": 1.5, "note": None},
+                {"id": 2, "price": 2.5, "note": None},
+                {"id": 3, "price": 100, "note": "sale"},
+                {"id": 4, "price": 200, "note": 42},
+            ]
+        )
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("note").type) == "string"
+    assert table.column("price").to_pylist() == [1.5, 2.5, 100.0, 200.0]
+    assert table.column("note").to_pylist() == [None, None, "sale", "42"]
+
+
+def test_parquet_lossy_cast_points_to_schema(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    sink = ResultSink(tmp_path / "items.parquet", batch_size=1)
+    sink.write({"price": 100})
+    sink.write({"price": 1.5})
+    with pytest.raises(RuntimeError, match="schema="):
+        sink.close()
+
+
+def test_parquet_explicit_schema(tmp_path: Path) -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "items.parquet"
+    schema = pa.schema([("price", pa.float64())])
+    with ResultSink(path, batch_size=1, schema=schema) as sink:
+        sink.write_many([{"price": 100}, {"price": 1.5}, {"price": None}])
+
+    assert pq.read_table(path).column("price").to_pylist() == [100.0, 1.5, None]
@@ -0,0 +1,210 @@
+"""selector_detector.SelectorDetector のテスト（素朴な実装・パーサー間の一致・キーワード追加）"""
+
+import random
+from typing import Any
+
+import pytest
+from bs4 import BeautifulSoup
+from selector_detector import DEFAULT_KEYWORDS, KEYWORD_TAGS, PARSERS, DetectionKeywords, SelectorDetector
+from test_streaming_detector import DATA_PAGE, LOGIN_PAGE
+
+FRAGMENTS = [
+    '<a href="/x.csv">ダウンロード</a>',
+    '<a href="/files/report.zip" class="btn dl extra">Export</a>',
+    '<a href="?p=2">次へ</a>',
+    '<a id="more" href="?p=3">Next &raquo;</a>',
+    '<input type="text" name="q">',
+    '<input type="email" id="login-email" placeholder="mail">',
+    '<input type="password" name="pw">',
+    '<input name="user_passwd">',
+    "<button>ログイン</button>",
+    '<button type="submit" class="primary">Sign in</button>',
+    '<select name="year"><option>2024</option></select>',
+    '<textarea name="memo"></textarea>',
+    "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>",
+    '<table class="data"><tr><td>only</td></tr></table>',
+    "<br>",
+    "text ",
+    "次",
+    "へ",
+]
+CONTAINERS = [('<form id="auth">', "</form>"), ("<div>", "</div>"), ("<p>", "</p>"), ("<span>", "</span>")]
+
+
+def _random_document(rng: random.Random, depth: int = 0) -> str:
+    """入れ子が正しく閉じた（どのパーサーでも同じツリーになる）ランダムな HTML 片"""
+    parts = []
+    for _ in range(rng.randint(1, 8)):
+        if depth < 3 and rng.random() < 0.25:
+            start, end = rng.choice(CONTAINERS)
+            if start.startswith("<form") and "<form" in "".join(parts):
+                start, end = CONTAINERS[1]  # form の入れ子はパーサーごとに扱いが異なるため避ける
+            parts.append(start + _random_document(rng, depth + 1) + end)
+        else:
+            parts.append(rng.choice(FRAGMENTS))
+    return "".join(parts)
+
+
+def _random_documents(count: int) -> list[str]:
+    rng = random.Random(0)
+    return [f"<html><body>{_random_document(rng)}</body></html>" for _ in range(count)]
+
+
+def _parser(name: str) -> str:
+    if name != "html.parser":
+        pytest.importorskip("lxml")
+    return name
+
+
+def _baseline_detect_all(html: str, keywords: DetectionKeywords = DEFAULT_KEYWORDS) -> dict[str, Any]:
+    """インデックスを使わず要素ごとに find_all() / get_text() で求める素朴な実装（比較用）"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    def text(elem: Any) -> str:
+        return elem.get_text(strip=True)
+
+    def contains(value: str, patterns: tuple[str, ...]) -> str | None:
+        # 最初に現れる（同じ位置なら長い）キーワード
+        found = [p for p in patterns if p and p.lower() in value.lower()]
+        return min(found, key=lambda p: (value.lower().find(p.lower()), -len(p))) if found else None
+
+    def selector(elem: Any) -> str:
+        if elem.get("id"):
+            return f"#{elem['id']}"
+        if elem.get("class"):
+            return f".{'.'.join(elem['class'][:2])}"
+        name, elem_type = elem.get("name"), elem.get("type")
+        if name:
+            return f"{elem.name}[name='{name}'][type='{elem_type}']" if elem_type else f"{elem.name}[name='{name}']"
+        if elem_type:
+            return f"{elem.name}[type='{elem_type}']"
+        label = text(elem)[:30].replace('"', '\\"')
+        return f'{elem.name} >> text="{label}"' if label else elem.name
+
+    result: dict[str, Any] = {}
+
+    login = {}
+    for query in keywords.login_queries:
+        for elem in (elem for tag in query.tags for elem in soup.find_all(tag)):
+            if (
+                contains(elem.get("id", ""), query.id_pattern)
+                or contains(elem.get("name", ""), query.name_pattern)
+                or elem.get("type", "").lower() in query.type_pattern
+                or contains(text(elem), query.text_pattern)
+            ):
+                login[query.key] = selector(elem)
+                break
+    if login:
+        result["login_form"] = login
+
+    downloads = [
+        {"text": text(a)[:50], "href": a.get("href", ""), "selector": selector(a)}
+        for a in soup.find_all("a")
+        if contains(a.get("href", ""), keywords.download)
+    ]
+    if downloads:
+        result["download_links"] = downloads
+
+    inputs = [
+        {
+            "type": elem.get("type", "text"),
+            "name": elem.get("name", ""),
+            "id": elem.get("id", ""),
+            "placeholder": elem.get("placeholder", ""),
+            "selector": selector(elem),
+        }
+        for elem in soup.find_all("input")
+    ]
+    if inputs:
+        result["input_fields"] = inputs
+
+    tables = []
+    for table in soup.find_all("table"):
+        rows = table.find_all("tr")
+        headers = [text(cell) for cell in rows[0].find_all(["th", "td"])] if rows else []
+        tables.append({"selector": selector(table), "rows_count": len(rows), "columns": headers[:10]})
+    if tables:
+        result["tables"] = tables
+
+    buttons = [
+        {"text": text(elem)[:50], "selector": selector(elem)}
+        for elem in soup.find_all(["button", "a"])
+        if contains(text(elem), keywords.next_page)
+    ]
+    if buttons:
+        result["next_page_buttons"] = buttons
+
+    matches = []
+    for elem in soup.find_all(list(KEYWORD_TAGS)):
+        attrs = [elem.get(attr, "") for attr in ("id", "name", "type")]
+        if elem.name in ("a", "button"):
+            attrs.append(text(elem))
+        keyword = next(filter(None, (contains(value, keywords.custom) for value in attrs)), None)
+        if keyword:
+            matches.append({"keyword": keyword, "tag": elem.name, "text": text(elem)[:50], "selector": selector(elem)})
+    if matches:
+        result["keyword_matches"] = matches
+
+    return result
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("html", [LOGIN_PAGE, DATA_PAGE], ids=["login", "data"])
+def test_parsers_agree_on_fixtures(parser: str, html: str) -> None:
+    expected = SelectorDetector(html, parser="html.parser").detect_all()
+    assert expected
+    assert SelectorDetector(html, parser=_parser(parser)).detect_all() == expected
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_parsers_agree_on_random_documents(parser: str) -> None:
+    parser = _parser(parser)
+    for html in _random_documents(100):
+        expected = SelectorDetector(html, parser="html.parser").detect_all()
+        assert SelectorDetector(html, parser=parser).detect_all() == expected, html
+
+
+def test_matches_baseline_on_fixtures() -> None:
+    for html in (LOGIN_PAGE, DATA_PAGE):
+        assert SelectorDetector(html).detect_all() == _baseline_detect_all(html)
+
+
+def test_matches_baseline_on_random_documents() -> None:
+    keywords = DEFAULT_KEYWORDS.extended({"custom": ["memo", "pass", "passwd", "ダウンロード", "次"]})
+    for html in _random_documents(200):
+        assert SelectorDetector(html).detect_all() == _baseline_detect_all(html), html
+        assert SelectorDetector(html, keywords=keywords).detect_all() == _baseline_detect_all(html, keywords), html
+
+
+def test_extended_keywords_add_custom_matches() -> None:
+    keywords = DEFAULT_KEYWORDS.extended({"custom": ["memo", "エクスポート"]})
+
+    result = SelectorDetector(DATA_PAGE, keywords=keywords).detect_all()
+
+    assert [(m["keyword"], m["tag"]) for m in result["keyword_matches"]] == [
+        ("エクスポート", "button"),
+        ("memo", "textarea"),
+    ]
+    assert "keyword_matches" not in SelectorDetector(DATA_PAGE).detect_all()
+
+
+def test_extended_keywords_extend_login_and_download_queries() -> None:
+    html = '<form><input name="mail_addr"></form><a href="/get?f=report.xlsx">Excel</a>'
+    assert SelectorDetector(html).detect_all().keys() == {"input_fields"}
+
+    keywords = DEFAULT_KEYWORDS.extended({"email_input": ["mail_addr"], "download": [".xlsx"]})
+    result = SelectorDetector(html, keywords=keywords).detect_all()
+
+    assert result["login_form"] == {"email_input": "input[name='mail_addr']"}
+    assert [link["href"] for link in result["download_links"]] == ["/get?f=report.xlsx"]
+
+
+def test_extended_keywords_do_not_modify_original() -> None:
+    DEFAULT_KEYWORDS.extended({"custom": ["memo"], "next_page": ["more"]})
+    assert DEFAULT_KEYWORDS.custom == ()
+    assert "more" not in DEFAULT_KEYWORDS.next_page
+
+
+def test_extended_keywords_reject_unknown_category() -> None:
+    with pytest.raises(ValueError, match="Unknown keyword category: nope"):
+        DEFAULT_KEYWORDS.extended({"nope": ["x"]})
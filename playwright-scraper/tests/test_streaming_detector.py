@@ -0,0 +1,95 @@
+"""streaming_detector.detect_stream と SelectorDetector.detect_all() の一致を確認するテスト"""
+
+import random
+from pathlib import Path
+
+import pytest
+from selector_detector import DEFAULT_KEYWORDS, SelectorDetector
+from streaming_detector import detect_stream
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>ログイン</title><script>var s = "<form>";</script><style>a{}</style></head>
+<body>
+  <form id="login" action="/login" method="post">
+    <label>メールアドレス <input type="email" name="email" id="email"></label>
+    <label>パスワード <input type="password" name="password"></label>
+    <input type="checkbox" name="remember"><br>
+    <button type="submit" class="btn primary">ログイン</button>
+  </form>
+  <!-- <a href="/hidden.csv">コメント内</a> -->
+  <p>説明<img src="a.png">文章</p>
+</body></html>
+"""
+
+DATA_PAGE = """<html><body>
+  <nav><a href="?page=1">前へ</a> <a class="next" href="?page=3" rel="next">次へ</a></nav>
+  <a href="/export/report.csv">CSVダウンロード</a>
+  <a href="/files/data.xlsx" download>Excel</a>
+  <button data-action="download">エクスポート</button>
+  <select name="year"><option>2024</option><option>2025</option></select>
+  <textarea name="memo"></textarea>
+  <table class="data">
+    <thead><tr><th>日付</th><th>件数</th><th>金額</th></tr></thead>
+    <tbody>
+      <tr><td>2024-01-01</td><td>3</td><td>1,000</td></tr>
+      <tr><td>2024-01-02</td><td>5</td><td>2,500</td></tr>
+    </tbody>
+  </table>
+  <table><tr><td>レイアウト</td></tr></table>
+  <ul class="pagination"><li><a href="?page=2">2</a></li><li><a href="?page=3">Next &raquo;</a></li></ul>
+</body></html>
+"""
+
+
+def _write(tmp_path: Path, html: str) -> Path:
+    path = tmp_path / "page.html"
+    path.write_text(html, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("html", [LOGIN_PAGE, DATA_PAGE], ids=["login", "data"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_stream_matches_tree_detector(tmp_path: Path, html: str, chunk_size: int) -> None:
+    expected = SelectorDetector(html, parser="html.parser").detect_all()
+    assert expected  # フィクスチャが何かしら検出されること
+    assert detect_stream(_write(tmp_path, html), chunk_size=chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 20])
+def test_stream_matches_tree_detector_with_custom_keywords(tmp_path: Path, chunk_size: int) -> None:
+    keywords = DEFAULT_KEYWORDS.extended(
+        {"download": ["/files/"], "custom": ["memo", "year", "エクスポート", "ダウンロード", "CSVダウンロード"]}
+    )
+    expected = SelectorDetector(DATA_PAGE, parser="html.parser", keywords=keywords).detect_all()
+    assert "keyword_matches" in expected
+    assert detect_stream(_write(tmp_path, DATA_PAGE), chunk_size=chunk_size, keywords=keywords) == expected
+
+
+def test_stream_matches_tree_detector_on_random_documents(tmp_path: Path) -> None:
+    rng = random.Random(0)
+    fragments = [
+        '<a href="/x.csv">ダウンロード</a>',
+        '<a href="?p=2">次へ</a>',
+        '<input type="text" name="q">',
+        '<input type="password" name="pw">',
+        "<button>ログイン</button>",
+        "<form>",
+        "</form>",
+        "<div>",
+        "</div>",
+        "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>",
+        "<br>",
+        "text ",
+        "次",
+        "へ",
+    ]
+    for _ in range(50):
+        html = "<html><body>" + "".join(rng.choice(fragments) for _ in range(rng.randint(5, 40))) + "</body></html>"
+        expected = SelectorDetector(html, parser="html.parser").detect_all()
+        assert detect_stream(_write(tmp_path, html), chunk_size=rng.randint(1, 16)) == expected, html
+
+
+def test_long_table_headers_are_truncated(tmp_path: Path) -> None:
+    html = f"<table><tr><th>{'x' * 500}</th></tr><tr><td>1</td></tr></table>"
+    result = detect_stream(_write(tmp_path, html), column_chars=20)
+    assert result["tables"][0]["columns"] == ["x" * 20]